@@ -0,0 +1,100 @@
+import logging
+import datetime
+from collections import Counter
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def _column_counts(methods: Sequence[str], years: Sequence[float], habitable: Sequence[bool]):
+    """Per-method and per-year counts and the habitable count of a set of planets"""
+    methods = np.asarray(methods)
+    years = np.asarray(years, dtype=np.float64)
+    method_names, method_counts = np.unique(np.where(methods == "", "Unknown", methods), return_counts=True)
+    known_years = years[~np.isnan(years)].astype(np.int64)
+    year_values, year_counts = np.unique(known_years, return_counts=True)
+    return (
+        Counter(dict(zip(method_names.tolist(), method_counts.tolist()))),
+        Counter(dict(zip(year_values.tolist(), year_counts.tolist()))),
+        int(np.count_nonzero(habitable))
+    )
+
+
+class DiscoveryStats:
+    """
+    Materialized dashboard statistics of a planet catalog.
+
+    Built with one pass over the catalog columns when it is loaded, then
+    kept current by ``updated`` with only the rows a sync changed, so reading
+    the statistics never scans the catalog. Instances are immutable.
+    """
+
+    def __init__(self, total: int, habitable_count: int, discovery_methods: Counter,
+                 discoveries_by_year: Counter, version: str = ""):
+        self.total = total
+        self.habitable_count = habitable_count
+        self.discovery_methods = discovery_methods
+        self.discoveries_by_year = discoveries_by_year
+        self.version = version
+        self._payload: Optional[Dict[str, Any]] = None
+        self._payload_year: Optional[int] = None
+
+    @classmethod
+    def from_columns(cls, methods: Sequence[str], years: Sequence[float], habitable: Sequence[bool],
+                     version: str = "") -> "DiscoveryStats":
+        """
+        Aggregate whole columns.
+
+        Args:
+            methods: Discovery method per planet ("" when unknown)
+            years: Discovery year per planet (NaN when unknown)
+            habitable: Whether each planet counts as potentially habitable
+            version: Version of the catalog the columns come from
+        """
+        method_counts, year_counts, habitable_count = _column_counts(methods, years, habitable)
+        logger.debug(f"Aggregated discovery statistics of {len(methods)} planets")
+        return cls(len(methods), habitable_count, method_counts, year_counts, version)
+
+    def updated(self, removed: Dict[str, Sequence], added: Dict[str, Sequence], version: str) -> "DiscoveryStats":
+        """
+        Statistics after replacing some planets' values.
+
+        Args:
+            removed: Old ``methods``, ``years`` and ``habitable`` columns of updated planets
+            added: New columns of updated and added planets
+            version: Version of the merged catalog
+        """
+        old_methods, old_years, old_habitable = _column_counts(removed["methods"], removed["years"], removed["habitable"])
+        new_methods, new_years, new_habitable = _column_counts(added["methods"], added["years"], added["habitable"])
+
+        # Counter arithmetic drops counts that reach zero
+        return DiscoveryStats(
+            total=self.total - len(removed["methods"]) + len(added["methods"]),
+            habitable_count=self.habitable_count - old_habitable + new_habitable,
+            discovery_methods=self.discovery_methods - old_methods + new_methods,
+            discoveries_by_year=self.discoveries_by_year - old_years + new_years,
+            version=version
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Statistics served by the dashboard stats endpoint.
+
+        Built once per calendar year, since the recent discoveries count
+        (this year and last) moves with the date.
+        """
+        current_year = datetime.datetime.now().year
+        if self._payload is None or self._payload_year != current_year:
+            self._payload = {
+                "total_exoplanets": self.total,
+                "habitable_count": self.habitable_count,
+                "recent_discoveries": self.discoveries_by_year[current_year] + self.discoveries_by_year[current_year - 1],
+                "discovery_methods": dict(self.discovery_methods.most_common()),
+                "discoveries_by_year": {str(year): count for year, count in sorted(self.discoveries_by_year.items())},
+                "catalog_version": self.version
+            }
+            self._payload_year = current_year
+        return self._payload
@@ -0,0 +1,302 @@
+import os
+import abc
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(namespace: str, payload: Any) -> str:
+    """
+    Build a cache key that is stable across processes and restarts.
+
+    Unlike ``hash()``, which is salted per process, the key is a SHA-256 digest
+    of the JSON-encoded payload.
+    """
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{namespace}:{hashlib.sha256(encoded.encode('utf-8')).hexdigest()}"
+
+
+class CacheBackend(abc.ABC):
+    """
+    Storage interface behind ``ResponseCache``.
+
+    Entries are ``(stored_at, value)`` pairs where ``stored_at`` is a wall-clock
+    timestamp, so ages agree between processes sharing a backend. Values must
+    be JSON-serializable. ``expire_after`` is a hint for stores with native
+    expiry (e.g. a Redis-like server's ``SET key value EX seconds``); stores
+    without it may keep entries longer, since ``ResponseCache`` checks ages
+    itself. Each backend enforces its own size cap and counts its evictions.
+    """
+
+    evictions = 0
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Return the ``(stored_at, value)`` entry for ``key``, or None"""
+
+    @abc.abstractmethod
+    def set(self, key: str, stored_at: float, value: Any, expire_after: float) -> None:
+        """Store an entry, evicting others beyond the size cap"""
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Drop the entry for ``key``, if any"""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop every entry"""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries"""
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Per-process LRU store holding at most ``max_entries`` values.
+
+    Expired entries are dropped whenever a value is stored, so large values
+    (such as archive query results) do not outlive their expiry in memory.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._expires: Dict[str, float] = {}
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, stored_at: float, value: Any, expire_after: float) -> None:
+        now = time.time()
+        for expired in [other for other, expires in self._expires.items() if expires <= now]:
+            self.delete(expired)
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        self._expires[key] = stored_at + expire_after
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            del self._expires[evicted]
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._expires.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._expires.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    File-backed LRU store shared by every worker process on a host.
+
+    Uses SQLite in WAL mode so readers in one gunicorn worker do not block
+    writers in another. A connection is opened lazily per process, since
+    SQLite connections must not be carried across ``fork``.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, accessed_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT stored_at, value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return row[0], json.loads(row[1])
+
+    def set(self, key: str, stored_at: float, value: Any, expire_after: float) -> None:
+        encoded = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, stored_at, accessed_at, value) VALUES (?, ?, ?, ?)",
+                (key, stored_at, time.time(), encoded)
+            )
+            overflow = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM entries")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def create_cache_backend(kind: str, max_entries: int, path: Optional[str] = None) -> CacheBackend:
+    """
+    Build a cache backend by name.
+
+    Args:
+        kind: "memory" for a per-process store or "sqlite" for a file shared by all workers
+        max_entries: Size cap enforced by the backend
+        path: Database file for the "sqlite" backend
+    """
+    if kind == "memory":
+        return MemoryBackend(max_entries=max_entries)
+    if kind == "sqlite":
+        return SQLiteBackend(path or os.path.join(".cache", "responses.sqlite3"), max_entries=max_entries)
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+class ResponseCache:
+    """
+    Bounded cache for upstream API responses over a pluggable ``CacheBackend``.
+
+    - The backend caps the number of entries and evicts the least recently
+      used one first.
+    - Entries are fresh for ``ttl`` seconds. For a further ``stale_ttl`` seconds
+      the stale value is still returned while a single background fetch
+      refreshes it (stale-while-revalidate).
+    - Concurrent misses on the same key within a process share one in-flight
+      fetch.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600, stale_ttl: float = 0,
+                 backend: Optional[CacheBackend] = None):
+        self.backend = backend if backend is not None else MemoryBackend(max_entries=max_entries)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def _lookup(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Return the cached value and its age, dropping entries past their stale window"""
+        entry = self.backend.get(key)
+        if entry is None:
+            return None, None
+        stored_at, value = entry
+        age = time.time() - stored_at
+        if age >= self.ttl + self.stale_ttl:
+            self.backend.delete(key)
+            return None, None
+        return value, age
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value, or None"""
+        value, age = self._lookup(key)
+        if age is None or age >= self.ttl:
+            return None
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting least recently used entries beyond the size cap"""
+        self.backend.set(key, time.time(), value, self.ttl + self.stale_ttl)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry"""
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self.backend.clear()
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for ``key``, calling ``fetch`` on a miss.
+
+        Errors raised by ``fetch`` propagate to every waiter and are not cached.
+        """
+        value, age = self._lookup(key)
+        if age is not None:
+            if age < self.ttl:
+                self.hits += 1
+                return value
+            self.stale_hits += 1
+            if key not in self._inflight:
+                self._start_fetch(key, fetch).add_done_callback(self._log_refresh_error)
+            return value
+
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            self._start_fetch(key, fetch)
+        return await asyncio.shield(self._inflight[key])
+
+    def _start_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        async def run() -> Any:
+            try:
+                value = await fetch()
+                self.set(key, value)
+                return value
+            finally:
+                del self._inflight[key]
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        return task
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background cache refresh failed: {str(task.exception())}")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size"""
+        return {
+            "size": len(self.backend),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.backend.evictions
+        }
@@ -0,0 +1,215 @@
+import os
+import json
+import hashlib
+import logging
+import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Archive fields kept in the local snapshot, one array per column
+# (disc_pubdate is the discovery publication month, "YYYY-MM")
+STRING_COLUMNS = ["pl_name", "pl_discmethod", "disc_pubdate"]
+NUMERIC_COLUMNS = ["pl_rade", "pl_orbper", "pl_eqt", "pl_insol", "pl_disc", "st_dist"]
+CATALOG_COLUMNS = STRING_COLUMNS + NUMERIC_COLUMNS
+
+# Numeric columns that the archive reports as integers
+INTEGER_COLUMNS = {"pl_disc"}
+
+# Archive table the snapshot is ingested from: one row per planet with its default parameter set,
+# where ps has one row per reference and hundreds of columns
+CATALOG_TABLE = "pscomppars"
+
+# Archive names of snapshot columns that are named differently in the archive tables
+ARCHIVE_COLUMN_NAMES = {
+    "pl_discmethod": "discoverymethod",
+    "pl_disc": "disc_year",
+    "st_dist": "sy_dist"
+}
+
+
+def projection_query(columns: Iterable[str], table: str = CATALOG_TABLE, where: Optional[str] = None) -> str:
+    """
+    TAP query selecting only ``columns`` from an archive table.
+
+    Columns are aliased back to the snapshot's names, so rows can be passed
+    straight to ``ExoplanetCatalog.from_records``.
+    """
+    select = ", ".join(
+        f"{ARCHIVE_COLUMN_NAMES[column]} as {column}" if column in ARCHIVE_COLUMN_NAMES else column
+        for column in columns
+    )
+    query = f"select {select} from {table}"
+    return f"{query} where {where}" if where else query
+
+
+# TAP query used to ingest the archive into the snapshot
+CATALOG_QUERY = projection_query(CATALOG_COLUMNS)
+
+
+class ExoplanetCatalog:
+    """
+    Columnar, in-process snapshot of the NASA Exoplanet Archive planet parameters.
+
+    Numeric columns are float64 arrays with NaN for missing values and string
+    columns are fixed-width unicode arrays with "" for missing values, so the
+    whole snapshot can be saved and loaded without pickling.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], ingested_at: Optional[datetime.datetime] = None):
+        self.columns = columns
+        self.ingested_at = ingested_at or datetime.datetime.now()
+        self._name_index = {name: i for i, name in enumerate(columns["pl_name"].tolist())}
+        self.version = self._compute_version()
+        self.names_version = hashlib.sha256("\n".join(columns["pl_name"].tolist()).encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]],
+                     ingested_at: Optional[datetime.datetime] = None) -> "ExoplanetCatalog":
+        """
+        Build a catalog from archive rows (the TAP ``format=json`` response).
+
+        Only the first row seen for each planet is kept, so a ``ps`` table
+        dump with one row per reference also loads.
+        """
+        seen = set()
+        rows = []
+        for record in records:
+            name = record.get("pl_name")
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            rows.append(record)
+
+        columns = {}
+        for column in STRING_COLUMNS:
+            columns[column] = np.array([row.get(column) or "" for row in rows], dtype=str)
+        for column in NUMERIC_COLUMNS:
+            columns[column] = np.array(
+                [np.nan if row.get(column) is None else row[column] for row in rows],
+                dtype=np.float64
+            )
+
+        logger.debug(f"Built catalog snapshot with {len(rows)} planets")
+        return cls(columns, ingested_at)
+
+    def merge(self, records: Iterable[Dict[str, Any]]) -> Tuple["ExoplanetCatalog", np.ndarray]:
+        """
+        Upsert archive rows by planet name into a new catalog.
+
+        Known planets keep their row index and new planets are appended, so row
+        indices of the old catalog stay valid. Rows whose values did not change
+        are left alone.
+
+        Returns:
+            The merged catalog, and the indices of rows that were updated or added
+        """
+        delta = ExoplanetCatalog.from_records(records)
+        existing = np.array([self._name_index.get(name, -1) for name in delta.columns["pl_name"].tolist()], dtype=np.intp)
+        known = existing >= 0
+
+        columns = {}
+        differs = np.zeros(int(known.sum()), dtype=bool)
+        for column in CATALOG_COLUMNS:
+            old_values = self.columns[column][existing[known]]
+            new_values = delta.columns[column][known]
+            if column in STRING_COLUMNS:
+                differs |= old_values != new_values
+            else:
+                differs |= (old_values != new_values) & ~(np.isnan(old_values) & np.isnan(new_values))
+            columns[column] = np.concatenate([self.columns[column], delta.columns[column][~known]])
+
+        updated = existing[known][differs]
+        for column in CATALOG_COLUMNS:
+            columns[column][updated] = delta.columns[column][known][differs]
+
+        added = np.arange(len(self), len(self) + int((~known).sum()), dtype=np.intp)
+        logger.debug(f"Merged {len(delta)} archive rows: {len(updated)} updated, {len(added)} added")
+        return ExoplanetCatalog(columns, self.ingested_at), np.concatenate([updated, added])
+
+    @classmethod
+    def load(cls, path: str) -> "ExoplanetCatalog":
+        """Load a snapshot previously written with ``save``"""
+        with np.load(path, allow_pickle=False) as data:
+            size = len(data["pl_name"])
+            columns = {}
+            for column in CATALOG_COLUMNS:
+                if column in data:
+                    columns[column] = data[column]
+                elif column in STRING_COLUMNS:
+                    columns[column] = np.full(size, "", dtype=str)
+                else:
+                    columns[column] = np.full(size, np.nan)
+            ingested_at = datetime.datetime.fromisoformat(str(data["__ingested_at__"]))
+
+        logger.debug(f"Loaded catalog snapshot from {path} ({size} planets)")
+        return cls(columns, ingested_at)
+
+    def save(self, path: str) -> None:
+        """Write the snapshot to ``path`` atomically so concurrent readers never see a partial file"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, __ingested_at__=np.array(self.ingested_at.isoformat()), **self.columns)
+        os.replace(tmp_path, path)
+
+    def _compute_version(self) -> str:
+        """Content hash of the snapshot, stable across processes and refreshes of identical data"""
+        digest = hashlib.sha256()
+        for column in CATALOG_COLUMNS:
+            digest.update(column.encode("utf-8"))
+            digest.update(np.ascontiguousarray(self.columns[column]).tobytes())
+        return digest.hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self.columns["pl_name"])
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the array backing an archive column"""
+        return self.columns[name]
+
+    def is_stale(self, max_age: float) -> bool:
+        """Whether the snapshot is older than ``max_age`` seconds"""
+        return self.ingested_at < datetime.datetime.now() - datetime.timedelta(seconds=max_age)
+
+    def index_of(self, name: str) -> Optional[int]:
+        """Row index for an exact planet name, or None if it is not in the catalog"""
+        return self._name_index.get(name)
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """
+        Return one row as an archive-style dict.
+
+        Missing values come back as None, matching what the TAP JSON response
+        would contain.
+        """
+        record = {}
+        for column in STRING_COLUMNS:
+            value = str(self.columns[column][index])
+            record[column] = value if value else None
+        for column in NUMERIC_COLUMNS:
+            value = float(self.columns[column][index])
+            if np.isnan(value):
+                record[column] = None
+            elif column in INTEGER_COLUMNS:
+                record[column] = int(value)
+            else:
+                record[column] = value
+        return record
+
+    def records(self, indices: Iterable[int]) -> List[Dict[str, Any]]:
+        """Return several rows as archive-style dicts"""
+        return [self.record(int(i)) for i in indices]
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """
+    Read archive rows from a JSON file in the TAP ``format=json`` layout.
+
+    Used to stand in for the archive during tests and offline development.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
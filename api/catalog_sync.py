@@ -0,0 +1,127 @@
+import os
+import re
+import json
+import logging
+import datetime
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from api.catalog import CATALOG_COLUMNS, ExoplanetCatalog, projection_query
+from api.habitability import HabitabilityIndex
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Archive columns recording when a row was last changed or first released
+SYNC_COLUMNS = ["rowupdate", "releasedate"]
+
+# TAP query for a full ingest; also returns the change dates that seed the watermark
+FULL_SYNC_QUERY = projection_query(CATALOG_COLUMNS + SYNC_COLUMNS)
+
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def delta_query(since: str) -> str:
+    """
+    TAP query for the rows changed or released on or after ``since`` (YYYY-MM-DD).
+
+    The bound is inclusive because the archive dates have day resolution;
+    rows fetched twice merge to the same values.
+
+    Raises:
+        ValueError: If ``since`` is not a date
+    """
+    if not _DATE_PATTERN.match(since):
+        raise ValueError(f"Invalid sync watermark: {since!r}")
+    return projection_query(
+        CATALOG_COLUMNS + SYNC_COLUMNS,
+        where=" or ".join(f"{column} >= '{since}'" for column in SYNC_COLUMNS)
+    )
+
+
+def latest_change(records: Iterable[Dict[str, Any]]) -> Optional[str]:
+    """Most recent row update or release date (YYYY-MM-DD) among archive rows"""
+    dates = [
+        str(record[column])[:10] for record in records for column in SYNC_COLUMNS
+        if record.get(column) and _DATE_PATTERN.match(str(record[column])[:10])
+    ]
+    return max(dates, default=None)
+
+
+@dataclass
+class SyncState:
+    """
+    Progress of the incremental catalog sync, persisted next to the snapshot.
+
+    ``watermark`` is the latest archive change date merged into the snapshot;
+    the next sync asks only for rows changed since then.
+    """
+    watermark: Optional[str] = None
+    synced_at: Optional[datetime.datetime] = None
+
+    @classmethod
+    def load(cls, path: str) -> "SyncState":
+        """Read the state file, or start from scratch if it is missing or unreadable"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            watermark = data.get("watermark")
+            if watermark is not None and not _DATE_PATTERN.match(watermark):
+                raise ValueError(f"Invalid sync watermark: {watermark!r}")
+            synced_at = data.get("synced_at")
+            return cls(watermark, datetime.datetime.fromisoformat(synced_at) if synced_at else None)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            if os.path.exists(path):
+                logger.warning(f"Ignoring unreadable catalog sync state {path}: {str(e)}")
+            return cls()
+
+    def save(self, path: str) -> None:
+        """Write the state atomically"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "watermark": self.watermark,
+                "synced_at": self.synced_at.isoformat() if self.synced_at else None
+            }, f)
+        os.replace(tmp_path, path)
+
+    def is_due(self, interval: float) -> bool:
+        """Whether the last sync is more than ``interval`` seconds ago"""
+        return self.synced_at is None or self.synced_at < datetime.datetime.now() - datetime.timedelta(seconds=interval)
+
+    def advance(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Record a completed sync that fetched ``records``"""
+        self.synced_at = datetime.datetime.now()
+        latest = latest_change(records)
+        if latest is None and self.watermark is None:
+            # Rows without change dates: everything up to today has been seen
+            latest = self.synced_at.date().isoformat()
+        if latest is not None and (self.watermark is None or latest > self.watermark):
+            self.watermark = latest
+
+
+def apply_delta(catalog: ExoplanetCatalog, index: Optional[HabitabilityIndex],
+                records: Iterable[Dict[str, Any]]) -> Tuple[ExoplanetCatalog, HabitabilityIndex, np.ndarray]:
+    """
+    Merge changed archive rows into the catalog and re-score only those rows.
+
+    Args:
+        catalog: Current catalog
+        index: Habitability index of ``catalog``, if one was built
+        records: Archive rows changed since the last sync
+
+    Returns:
+        The merged catalog, its habitability index and the updated or added rows
+    """
+    merged, changed = catalog.merge(records)
+    if not len(changed):
+        return catalog, index if index is not None else HabitabilityIndex(catalog), changed
+
+    if index is not None and index.version == catalog.version:
+        merged_index = index.updated(merged, changed)
+    else:
+        merged_index = HabitabilityIndex(merged)
+    return merged, merged_index, changed
@@ -0,0 +1,79 @@
+import logging
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Characteristics compared between planets
+COMPARED_FIELDS = ("earth_radius", "eq_temperature", "distance", "habitability_score")
+
+# Largest number of planets accepted by the bulk lookup and comparison endpoints
+MAX_BULK_NAMES = 50
+
+
+def parse_names(names: Optional[str]) -> List[str]:
+    """
+    Split a comma-separated ``names`` query parameter.
+
+    Blank entries are dropped and repeated names are kept once, first occurrence wins.
+
+    Raises:
+        ValueError: If no names are given or more than ``MAX_BULK_NAMES``
+    """
+    parsed = list(dict.fromkeys(name.strip() for name in (names or "").split(",") if name.strip()))
+    if not parsed:
+        raise ValueError("'names' must list at least one planet name")
+    if len(parsed) > MAX_BULK_NAMES:
+        raise ValueError(f"'names' must list at most {MAX_BULK_NAMES} planet names")
+    return parsed
+
+
+def dedupe_resolved(names: Sequence[str], resolved: Sequence[Optional[Hashable]]) -> Tuple[List[str], List[Any]]:
+    """
+    Drop names that resolve to a planet already listed, first occurrence wins.
+
+    ``parse_names`` only removes exact repeats; spellings such as "kepler-186 f"
+    and "Kepler-186f" resolve to the same planet and are caught here.
+
+    Args:
+        names: Parsed names
+        resolved: Planet (row or record) each name resolves to, None when unknown
+
+    Returns:
+        The kept names and their resolved planets; unknown names are all kept, to be reported
+    """
+    seen = set()
+    kept_names, kept = [], []
+    for name, planet in zip(names, resolved):
+        if planet is not None:
+            if planet in seen:
+                continue
+            seen.add(planet)
+        kept_names.append(name)
+        kept.append(planet)
+    return kept_names, kept
+
+
+def comparison_deltas(names: Sequence[str], values: Dict[str, Sequence[Optional[float]]]) -> List[Dict[str, Any]]:
+    """
+    Differences of each planet from the first (the reference planet).
+
+    Args:
+        names: Planet names, reference first
+        values: Column of raw values per field of ``COMPARED_FIELDS``; None when unknown
+
+    Returns:
+        One dict per planet after the reference, with its name and the
+        signed difference per field, rounded to 6 decimals (None when either value is unknown)
+    """
+    deltas = {}
+    for field in COMPARED_FIELDS:
+        column = np.array([np.nan if value is None else value for value in values[field]], dtype=np.float64)
+        deltas[field] = [None if np.isnan(delta) else round(float(delta), 6) for delta in column[1:] - column[0]]
+
+    return [
+        {"name": name, **{field: deltas[field][i] for field in COMPARED_FIELDS}}
+        for i, name in enumerate(names[1:])
+    ]
@@ -0,0 +1,157 @@
+import re
+import logging
+import datetime
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Window of the timeline endpoints when none is given: since January 1 of the previous year
+DEFAULT_DISCOVERY_WINDOW = "last-year"
+
+# Longest "last N days" window accepted
+MAX_WINDOW_DAYS = 36500
+
+# Longest period a discovery date can stand for (a leap year, when only the year is known)
+_MAX_PERIOD = np.timedelta64(366, "D")
+
+_DATE_PATTERN = re.compile(r"^(\d{4})(?:-(\d{2})(?:-(\d{2}))?)?$")
+_DAYS_PATTERN = re.compile(r"^(\d+)d$")
+
+Window = Tuple[Optional[datetime.date], Optional[datetime.date]]
+
+
+def discovery_period(date: Optional[str], year: Optional[float] = None) -> Optional[Tuple[datetime.date, datetime.date, str]]:
+    """
+    First and last day and precision of a discovery date.
+
+    Args:
+        date: Archive date, "YYYY-MM-DD" or "YYYY-MM" (``disc_pubdate``), or "YYYY"
+        year: Discovery year, used when ``date`` is missing or malformed
+
+    Returns:
+        ``(first, last, precision)`` with precision "day", "month" or "year", or None if neither is known
+    """
+    match = _DATE_PATTERN.match(date.strip()) if date else None
+    try:
+        if match and match.group(3):
+            day = datetime.date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            return day, day, "day"
+        if match and match.group(2):
+            first = datetime.date(int(match.group(1)), int(match.group(2)), 1)
+            following = (first + datetime.timedelta(days=31)).replace(day=1)
+            return first, following - datetime.timedelta(days=1), "month"
+        if match:
+            year = float(match.group(1))
+    except ValueError:
+        pass  # e.g. month 00, which the archive uses for unknown months
+    if year is None or np.isnan(year):
+        return None
+    return datetime.date(int(year), 1, 1), datetime.date(int(year), 12, 31), "year"
+
+
+def resolve_window(window: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+                   today: Optional[datetime.date] = None) -> Window:
+    """
+    Inclusive date bounds of a discovery window; None leaves a side open.
+
+    ``since``/``until`` (YYYY-MM-DD) take precedence over ``window``, which is
+    "last-year" (since January 1 of the previous year), "<N>d" for the last N
+    days, or "all".
+
+    Raises:
+        ValueError: If a bound or the window is malformed, or the bounds are reversed
+    """
+    today = today or datetime.date.today()
+    if since or until:
+        try:
+            bounds = tuple(datetime.date.fromisoformat(bound) if bound else None for bound in (since, until))
+        except ValueError:
+            raise ValueError("'since' and 'until' must be dates (YYYY-MM-DD)")
+        if bounds[0] and bounds[1] and bounds[0] > bounds[1]:
+            raise ValueError("'since' must not be after 'until'")
+        return bounds
+
+    window = window or DEFAULT_DISCOVERY_WINDOW
+    if window == "all":
+        return None, None
+    if window == "last-year":
+        return datetime.date(today.year - 1, 1, 1), None
+    match = _DAYS_PATTERN.match(window)
+    if match and 0 < int(match.group(1)) <= MAX_WINDOW_DAYS:
+        return today - datetime.timedelta(days=int(match.group(1))), None
+    raise ValueError(f"Invalid window {window!r}: use 'last-year', 'all' or '<N>d' with N up to {MAX_WINDOW_DAYS}")
+
+
+class DiscoveryIndex:
+    """
+    Planets sorted by discovery date, answering date windows by binary search.
+
+    Each planet's date is a period: the publication day or month where the
+    archive has it, else the discovery year. A planet is in a window when its
+    period overlaps the window, so planets only known by year still show up
+    in "last 30 days" during their year. Date strings are formatted once when
+    the index is built.
+    """
+
+    def __init__(self, firsts: np.ndarray, lasts: np.ndarray, precisions: np.ndarray, rows: np.ndarray,
+                 version: str = ""):
+        order = np.argsort(firsts, kind="stable")
+        self.rows = rows[order]
+        self.firsts = firsts[order]
+        self.lasts = lasts[order]
+        self.precisions = precisions[order]
+        self.dates = np.datetime_as_string(self.firsts, unit="D")
+        self.version = version
+
+    @classmethod
+    def from_dates(cls, dates: Sequence[Optional[str]], years: Optional[Sequence[float]] = None,
+                   version: str = "") -> "DiscoveryIndex":
+        """
+        Index planets by date.
+
+        Args:
+            dates: Discovery or publication date per planet ("" or None when unknown)
+            years: Discovery year per planet (NaN when unknown), for planets without a date
+            version: Version of the dataset the dates come from
+        """
+        periods = [
+            discovery_period(date, None if years is None else float(years[row]))
+            for row, date in enumerate(dates)
+        ]
+        rows = np.array([row for row, period in enumerate(periods) if period is not None], dtype=np.intp)
+        known = [period for period in periods if period is not None]
+        index = cls(
+            np.array([period[0] for period in known], dtype="datetime64[D]"),
+            np.array([period[1] for period in known], dtype="datetime64[D]"),
+            np.array([period[2] for period in known], dtype=str),
+            rows,
+            version
+        )
+        logger.debug(f"Built discovery index over {len(rows)} of {len(periods)} planets")
+        return index
+
+    @classmethod
+    def from_catalog(cls, catalog) -> "DiscoveryIndex":
+        """Index a catalog by ``disc_pubdate``, falling back to the discovery year"""
+        return cls.from_dates(catalog.column("disc_pubdate").tolist(), catalog.column("pl_disc"), catalog.version)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def window(self, since: Optional[datetime.date] = None, until: Optional[datetime.date] = None) -> np.ndarray:
+        """
+        Positions in the index of planets discovered within ``[since, until]``, newest first.
+
+        Use them with ``rows``, ``dates`` and ``precisions``.
+        """
+        high = len(self.firsts) if until is None else int(np.searchsorted(self.firsts, np.datetime64(until, "D"), side="right"))
+        if since is None:
+            return np.arange(high)[::-1]
+        # Periods starting up to a year before ``since`` may still reach into the window
+        since = np.datetime64(since, "D")
+        low = int(np.searchsorted(self.firsts, since - _MAX_PERIOD, side="left"))
+        positions = np.arange(low, high)
+        return positions[self.lasts[low:high] >= since][::-1]
@@ -0,0 +1,135 @@
+import os
+import json
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber; a subscriber that falls further behind is evicted
+EVENT_BUFFER_SIZE = 16
+EVENT_KEEPALIVE_INTERVAL = 15  # seconds between comments that keep idle connections open
+EVENT_RETRY_MS = 5000  # reconnection delay suggested to EventSource clients
+MAX_EVENT_SUBSCRIBERS = int(os.getenv("MAX_EVENT_SUBSCRIBERS", "1000"))
+
+_KEEPALIVE = b": keepalive\n\n"
+
+
+def format_event(event: str, data: Any, event_id: Optional[str] = None, retry_ms: Optional[int] = None) -> bytes:
+    """Encode one Server-Sent Events message with a JSON payload"""
+    lines = []
+    if retry_ms is not None:
+        lines.append(f"retry: {retry_ms}")
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class TooManySubscribers(Exception):
+    """Raised when the broadcaster already serves its maximum number of subscribers"""
+
+
+class Subscription:
+    """One client's bounded queue of encoded events"""
+
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.evicted = False
+
+
+class EventBroadcaster:
+    """
+    Fans events from a single producer out to many Server-Sent Events subscribers.
+
+    Each event is encoded once and the same bytes are queued for every
+    subscriber. Queues are bounded: a subscriber whose queue is full when an
+    event is published is evicted and its stream ends, so one slow client
+    never holds memory or delays the producer. Evicted EventSource clients
+    reconnect on their own and start again from the current state.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE, max_subscribers: int = MAX_EVENT_SUBSCRIBERS,
+                 keepalive_interval: float = EVENT_KEEPALIVE_INTERVAL):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.keepalive_interval = keepalive_interval
+        self._subscribers: Set[Subscription] = set()
+        self.published = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        """
+        Register a new subscriber.
+
+        Raises:
+            TooManySubscribers: If ``max_subscribers`` are already connected
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            raise TooManySubscribers(f"Event stream limit of {self.max_subscribers} subscribers reached")
+        subscription = Subscription(self.buffer_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def _evict(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        subscription.evicted = True
+        self.evicted += 1
+        # Drop its backlog and wake it up so the stream ends now
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def publish(self, event: str, data: Any, event_id: Optional[str] = None) -> int:
+        """Queue an event for every subscriber; returns the number of subscribers it reached"""
+        message = format_event(event, data, event_id)
+        self.published += 1
+        delivered = 0
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(message)
+                delivered += 1
+            except asyncio.QueueFull:
+                logger.warning("Evicting slow event stream subscriber")
+                self._evict(subscription)
+        return delivered
+
+    async def stream(self, subscription: Subscription, initial: Iterable[bytes] = ()) -> AsyncIterator[bytes]:
+        """
+        Encoded messages for one subscriber: ``initial`` first, then published events.
+
+        Sends keepalive comments while idle and unsubscribes when the client
+        disconnects or is evicted.
+        """
+        try:
+            yield f"retry: {EVENT_RETRY_MS}\n\n".encode("utf-8")
+            for message in initial:
+                yield message
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), self.keepalive_interval)
+                except asyncio.TimeoutError:
+                    yield _KEEPALIVE
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, int]:
+        """Subscriber and event counters"""
+        return {"subscribers": len(self._subscribers), "published": self.published, "evicted": self.evicted}
+
+
+event_broadcaster = EventBroadcaster()
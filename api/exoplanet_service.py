@@ -1,53 +1,75 @@
 import os
-import json
+import asyncio
 import logging
-import requests
 import datetime
+import httpx
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Query, Path
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Header, HTTPException, Query, Path, Request
+from fastapi.routing import APIRoute
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+import numpy as np
 
-from models.exoplanet import ExoplanetDetail, HabitableExoplanet, TimelineExoplanet
+from models.exoplanet import (
+    ExoplanetComparison,
+    ExoplanetDetail,
+    HabitableExoplanet,
+    HabitableExoplanetPage,
+    HabitabilityPrediction,
+    HabitabilityPredictionRequest,
+    HabitabilityPredictionResponse,
+    TimelineExoplanet
+)
+from api.aggregates import DiscoveryStats
+from api.cache import ResponseCache, create_cache_backend, make_cache_key
+from api.comparison import MAX_BULK_NAMES, comparison_deltas, dedupe_resolved, parse_names
+from api.events import EVENT_RETRY_MS, TooManySubscribers, event_broadcaster, format_event
+from api.export import (
+    CATALOG_EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    LISTING_EXPORT_COLUMNS,
+    catalog_export_batches,
+    export_records,
+    parquet_available,
+    serialize_export
+)
+from api.figure_specs import discovery_figure_spec, habitability_figure_spec
+from api.catalog import ExoplanetCatalog, load_records
+from api.catalog_sync import FULL_SYNC_QUERY, SyncState, apply_delta, delta_query
+from api.discovery_index import DEFAULT_DISCOVERY_WINDOW, DiscoveryIndex, resolve_window
+from api.habitability import (
+    HABITABLE_MIN_SCORE,
+    HABITABLE_RADIUS,
+    HABITABLE_TEMPERATURE,
+    HabitabilityIndex,
+    habitable_mask,
+    score_band_mask,
+    score_planet
+)
+from api.habitability_model import predict_habitability_proba
+from api.http_cache import CachedResponse, ConditionalRequests, cache_policy, etag_matches
+from api.http_client import close_http_client, get_http_client
+from api.image_renderer import comparison_image_key, image_cache, render_comparison_png
+from api.search import LISTING_SORTS, NameIndex, decode_cursor, encode_cursor
+from api.response_encoding import dumps
+from api.render_pool import RenderPoolSaturated, RenderTimeout, close_render_pool, get_render_pool
 from api.visualization import (
     generate_exoplanet_comparison_plot,
     generate_habitability_scatter_plot,
     generate_discovery_timeline_plot
-
-from sklearn.ensemble import RandomForestClassifier
-import numpy as np
-
-# Initialize a simple Random Forest model
-rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
-
-# Training data based on known habitable zone characteristics
-# Features: [radius, temperature, distance]
-X_train = np.array([
-    [1.0, 288, 0],  # Earth-like
-    [1.2, 262, 500],  # Kepler-186f
-    [1.3, 278, 4.2],  # Proxima b
-    [1.1, 268, 101.5],  # TOI-700 d
-    [2.6, 265, 124],  # K2-18b
-    [0.92, 251, 39],  # TRAPPIST-1e
-    [3.0, 350, 200],  # Too hot
-    [0.3, 150, 1000],  # Too cold
-    [5.0, 280, 50],   # Too large
-])
-
-# Labels: 1 for potentially habitable, 0 for unlikely
-y_train = np.array([1, 1, 1, 1, 0, 1, 0, 0, 0])
-
-# Train the model
-rf_model.fit(X_train, y_train)
+)
 
 def predict_habitability_ml(radius: float, temperature: float, distance: float) -> str:
     """
     Predict habitability using the ML model
     """
-    features = np.array([[radius, temperature, distance]])
-    prediction = rf_model.predict_proba(features)[0]
-    
-    confidence = prediction[1]  # Probability of being habitable
-    
+    confidence = predict_habitability_proba([[radius, temperature, distance]])[0]  # Probability of being habitable
+    return habitability_label(confidence)
+
+def habitability_label(confidence: float) -> str:
+    """
+    Map the model's habitability probability to a label bucket
+    """
     if confidence > 0.8:
         return "High potential for habitability"
     elif confidence > 0.5:
@@ -55,82 +77,488 @@ def predict_habitability_ml(radius: float, temperature: float, distance: float)
     else:
         return "Unlikely to be habitable"
 
-)
-
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# ETags served per request and catalog version
+conditional_requests = ConditionalRequests()
+
+class FastJSONResponse(JSONResponse):
+    """JSON response serialized with the fast encoder (orjson when installed)"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+# Response headers recomputed for every answer rather than stored with the body
+_PER_ANSWER_HEADERS = {"content-length", "content-encoding", "etag", "cache-control", "vary"}
+
+def cached_response(answer: CachedResponse) -> Response:
+    """Starlette response for an answer of ``conditional_requests``"""
+    return Response(content=answer.body, status_code=answer.status, headers=answer.headers)
+
+class ConditionalRoute(APIRoute):
+    """
+    Route that sets ``Cache-Control`` and strong ETags, answers conditional GET
+    requests and compresses responses.
+    
+    A request already answered on the current catalog version gets a 304 if
+    its ``If-None-Match`` holds the ETag, otherwise the stored body in the
+    negotiated coding, without running the endpoint. Otherwise the ETag is
+    hashed from the catalog version and the serialized body, and still turns
+    into a 304 when the client has it.
+    """
+    
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        
+        async def conditional_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+            
+            policy = cache_policy(request.url.path)
+            if_none_match = request.headers.get("if-none-match")
+            accept_encoding = request.headers.get("accept-encoding")
+            if policy.etag:
+                version = current_catalog_version()
+                key = conditional_requests.request_key(version, request.url.path, request.url.query) if version else None
+                answer = conditional_requests.cached(key, policy, if_none_match, accept_encoding)
+                if answer is not None:
+                    return cached_response(answer)
+            
+            response = await handler(request)
+            if response.status_code != 200:
+                return response
+            response.headers.setdefault("Cache-Control", policy.cache_control)
+            # Streamed bodies are not hashed; routes that set their own ETag keep it. Neither is a
+            # body built while a refresh swapped the catalog, as it may come from either version
+            if policy.etag and _catalog is not None and "etag" not in response.headers \
+                    and not isinstance(response, StreamingResponse) and version in (None, _catalog.version):
+                version = _catalog.version
+                key = conditional_requests.request_key(version, request.url.path, request.url.query)
+                headers = {
+                    name.title(): value for name, value in response.headers.items()
+                    if name not in _PER_ANSWER_HEADERS
+                }
+                answer = conditional_requests.store(
+                    key, version, response.body, headers, policy, if_none_match, accept_encoding
+                )
+                return cached_response(answer)
+            return response
+        
+        return conditional_handler
+
 # Create API router
-router = APIRouter(tags=["exoplanets"])
+router = APIRouter(tags=["exoplanets"], route_class=ConditionalRoute, default_response_class=FastJSONResponse)
 
 # NASA API endpoints
-NASA_EXOPLANET_ARCHIVE_API = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
-TESS_API_ENDPOINT = "https://exoplanetarchive.ipac.caltech.edu/cgi-bin/nstedAPI/nph-nstedAPI"
+NASA_EXOPLANET_ARCHIVE_API = os.getenv(
+    "NASA_EXOPLANET_ARCHIVE_API", "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
+)
+TESS_API_ENDPOINT = os.getenv(
+    "TESS_API_ENDPOINT", "https://exoplanetarchive.ipac.caltech.edu/cgi-bin/nstedAPI/nph-nstedAPI"
+)
 NASA_API_KEY = os.getenv("NASA_API_KEY", "DEMO_KEY")
 
-# Cache to store API responses and avoid repeated calls
-cache = {}
-CACHE_EXPIRY = 3600  # seconds (1 hour)
+# Local catalog snapshot of the archive's planet parameters. Rows changed in the archive are
+# merged in every sync interval; a full re-ingest once a week drops planets removed upstream
+CATALOG_SYNC_INTERVAL = int(os.getenv("EXOPLANET_CATALOG_SYNC_INTERVAL", "3600"))  # seconds
+CATALOG_REFRESH_INTERVAL = int(os.getenv("EXOPLANET_CATALOG_REFRESH_INTERVAL", str(7 * 86400)))  # seconds
+CATALOG_SNAPSHOT_PATH = os.getenv("EXOPLANET_CATALOG_SNAPSHOT", os.path.join(".cache", "ps_catalog.npz"))
+CATALOG_SYNC_STATE_PATH = os.getenv("EXOPLANET_CATALOG_SYNC_STATE", os.path.join(".cache", "ps_catalog_sync.json"))
+CATALOG_FIXTURE_PATH = os.getenv("EXOPLANET_CATALOG_FIXTURE")  # JSON file standing in for the archive
 
-async def fetch_from_nasa_exoplanet_archive(query: str) -> Dict[str, Any]:
-    """Fetch data from NASA Exoplanet Archive"""
-    cache_key = f"nasa_archive_{hash(query)}"
-    
-    # Check if we have a cached response
-    if cache_key in cache and cache[cache_key]["timestamp"] > datetime.datetime.now() - datetime.timedelta(seconds=CACHE_EXPIRY):
-        logger.debug("Using cached NASA Exoplanet Archive response")
-        return cache[cache_key]["data"]
-    
-    logger.debug(f"Fetching data from NASA Exoplanet Archive: {query}")
-    params = {
-        "query": query,
-        "format": "json"
-    }
+# Cache to store archive and TESS responses and avoid repeated calls. With the "sqlite" backend,
+# workers syncing the catalog at about the same time share one archive query. Entries expire
+# within half a sync interval, so the next sync always sees the archive's latest changes
+CACHE_EXPIRY = min(int(os.getenv("RESPONSE_CACHE_TTL", "300")), CATALOG_SYNC_INTERVAL // 2)  # seconds
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")  # "sqlite" shares one store across workers
+CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", os.path.join(".cache", "responses.sqlite3"))
+cache = ResponseCache(
+    ttl=CACHE_EXPIRY,
+    backend=create_cache_backend(CACHE_BACKEND, max_entries=CACHE_MAX_ENTRIES, path=CACHE_PATH)
+)
+
+# Generated figures and pages; keys include the catalog version, so a refresh invalidates them.
+# With the "sqlite" backend a figure built by one worker is served by all of them
+FIGURE_CACHE_MAX_ENTRIES = int(os.getenv("FIGURE_CACHE_MAX_ENTRIES", "64"))
+FIGURE_CACHE_PATH = os.getenv("FIGURE_CACHE_PATH", os.path.join(".cache", "figures.sqlite3"))
+figure_cache = ResponseCache(
+    ttl=86400,
+    backend=create_cache_backend(CACHE_BACKEND, max_entries=FIGURE_CACHE_MAX_ENTRIES, path=FIGURE_CACHE_PATH)
+)
+
+_catalog: Optional[ExoplanetCatalog] = None
+_catalog_lock = asyncio.Lock()
+_sync_state: Optional[SyncState] = None
+_sync_task: Optional[asyncio.Task] = None
+_refresh_task: Optional[asyncio.Task] = None
+_habitability_index: Optional[HabitabilityIndex] = None
+_name_index: Optional[NameIndex] = None
+_discovery_stats: Optional[DiscoveryStats] = None
+_discovery_index: Optional[DiscoveryIndex] = None
+
+# Page size limit of the habitable exoplanets listing
+MAX_LISTING_LIMIT = 500
+
+# Number of names returned by the suggestion endpoint
+MAX_SUGGESTIONS = 10
+
+# Planets listed in one new-discoveries event
+MAX_DISCOVERY_EVENT_PLANETS = 100
+
+async def render(fn, *args) -> Any:
+    """
+    Run a figure rendering function in the render pool.
     
+    Raises:
+        HTTPException: 503 with Retry-After when the pool is saturated or a worker
+            died (the pool restarts), 504 when the job times out
+    """
+    pool = get_render_pool()
     try:
-        response = requests.get(NASA_EXOPLANET_ARCHIVE_API, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Cache the response
-        cache[cache_key] = {
-            "timestamp": datetime.datetime.now(),
-            "data": data
+        return await pool.submit(fn, *args)
+    except RenderPoolSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Rendering is busy, please retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except BrokenProcessPool:
+        raise HTTPException(
+            status_code=503,
+            detail="Rendering is restarting, please retry later",
+            headers={"Retry-After": str(pool.retry_after)}
+        )
+    except RenderTimeout:
+        raise HTTPException(status_code=504, detail="Rendering timed out")
+
+async def stream_from_nasa_exoplanet_archive(query: str) -> List[Dict[str, Any]]:
+    """
+    Fetch a large result from NASA Exoplanet Archive, decoding rows while the response downloads.
+    
+    Results are kept in the response cache for ``CACHE_EXPIRY`` seconds, and
+    concurrent requests for the same query share one download.
+    """
+    async def fetch() -> List[Dict[str, Any]]:
+        logger.debug(f"Streaming data from NASA Exoplanet Archive: {query}")
+        params = {
+            "query": query,
+            "format": "json"
         }
         
-        return data
-    except requests.RequestException as e:
-        logger.error(f"Error fetching data from NASA Exoplanet Archive: {str(e)}")
-        raise HTTPException(status_code=503, detail=f"NASA Exoplanet Archive unavailable: {str(e)}")
+        try:
+            return [row async for row in get_http_client().iter_json_array(NASA_EXOPLANET_ARCHIVE_API, params=params)]
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Error streaming data from NASA Exoplanet Archive: {str(e)}")
+            raise HTTPException(status_code=503, detail=f"NASA Exoplanet Archive unavailable: {str(e)}")
+    
+    return await cache.get_or_fetch(make_cache_key("nasa_archive", query), fetch)
 
 async def fetch_from_tess_api(params: Dict[str, Any]) -> Dict[str, Any]:
     """Fetch data from TESS API"""
-    cache_key = f"tess_api_{hash(json.dumps(params, sort_keys=True))}"
+    async def fetch() -> Dict[str, Any]:
+        logger.debug(f"Fetching data from TESS API with params: {params}")
+        request_params = {**params, "table": "exoplanets", "format": "json"}
+        
+        try:
+            return await get_http_client().get_json(TESS_API_ENDPOINT, params=request_params)
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching data from TESS API: {str(e)}")
+            raise HTTPException(status_code=503, detail=f"TESS API unavailable: {str(e)}")
     
-    # Check if we have a cached response
-    if cache_key in cache and cache[cache_key]["timestamp"] > datetime.datetime.now() - datetime.timedelta(seconds=CACHE_EXPIRY):
-        logger.debug("Using cached TESS API response")
-        return cache[cache_key]["data"]
+    return await cache.get_or_fetch(make_cache_key("tess_api", params), fetch)
+
+def get_sync_state() -> SyncState:
+    """Return the catalog sync progress, reading it from disk on first use"""
+    global _sync_state
+    if _sync_state is None:
+        _sync_state = SyncState.load(CATALOG_SYNC_STATE_PATH)
+    return _sync_state
+
+async def ingest_catalog() -> ExoplanetCatalog:
+    """Ingest the whole planet table from the archive, saving the snapshot and resetting the sync watermark"""
+    global _sync_state
+    logger.info("Ingesting exoplanet catalog from NASA Exoplanet Archive")
+    records = await stream_from_nasa_exoplanet_archive(FULL_SYNC_QUERY)
     
-    logger.debug(f"Fetching data from TESS API with params: {params}")
-    params["table"] = "exoplanets"
-    params["format"] = "json"
+    catalog = ExoplanetCatalog.from_records(records)
+    catalog.save(CATALOG_SNAPSHOT_PATH)
+    
+    # Save the watermark after the snapshot, so a crash in between only repeats a delta
+    state = SyncState()
+    state.advance(records)
+    state.save(CATALOG_SYNC_STATE_PATH)
+    _sync_state = state
+    return catalog
+
+async def load_catalog() -> ExoplanetCatalog:
+    """
+    Load a fresh catalog snapshot.
+
+    Sources are tried in order: the fixture file (if configured), an on-disk
+    snapshot that is less than a week old and has a sync watermark, and
+    finally a full ingest of the planet table from the archive. A stale
+    snapshot is still served if the archive is unavailable.
+    """
+    if CATALOG_FIXTURE_PATH:
+        logger.info(f"Loading exoplanet catalog from fixture: {CATALOG_FIXTURE_PATH}")
+        return ExoplanetCatalog.from_records(load_records(CATALOG_FIXTURE_PATH))
+    
+    snapshot = None
+    if os.path.exists(CATALOG_SNAPSHOT_PATH):
+        snapshot = ExoplanetCatalog.load(CATALOG_SNAPSHOT_PATH)
+        if not snapshot.is_stale(CATALOG_REFRESH_INTERVAL) and get_sync_state().watermark is not None:
+            return snapshot
     
     try:
-        response = requests.get(TESS_API_ENDPOINT, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Cache the response
-        cache[cache_key] = {
-            "timestamp": datetime.datetime.now(),
-            "data": data
-        }
-        
-        return data
-    except requests.RequestException as e:
-        logger.error(f"Error fetching data from TESS API: {str(e)}")
-        raise HTTPException(status_code=503, detail=f"TESS API unavailable: {str(e)}")
+        return await ingest_catalog()
+    except HTTPException:
+        if snapshot is None:
+            raise
+        logger.warning("NASA Exoplanet Archive unavailable, serving stale catalog snapshot")
+        return snapshot
+
+async def sync_catalog() -> np.ndarray:
+    """
+    Merge the archive rows changed since the last sync into the catalog.
+    
+    Only changed rows are re-scored and the snapshot and watermark are saved
+    afterwards. If the archive is unavailable the sync is retried after the
+    next interval. The caller must hold the catalog lock.
+    
+    Returns:
+        Catalog rows of planets added by the sync
+    """
+    global _catalog, _habitability_index, _discovery_stats
+    state = get_sync_state()
+    if state.watermark is None:
+        # Serving a stale snapshot from before syncing; only a full ingest can catch up
+        return np.empty(0, dtype=np.intp)
+    
+    try:
+        records = await stream_from_nasa_exoplanet_archive(delta_query(state.watermark))
+    except HTTPException:
+        logger.warning("NASA Exoplanet Archive unavailable, postponing catalog sync")
+        state.synced_at = datetime.datetime.now()
+        return np.empty(0, dtype=np.intp)
+    
+    previous_size = len(_catalog)
+    catalog, index, changed = apply_delta(_catalog, _habitability_index, records)
+    if len(changed):
+        catalog.save(CATALOG_SNAPSHOT_PATH)
+        if _discovery_stats is not None and _discovery_stats.version == _catalog.version \
+                and _habitability_index is not None and _habitability_index.version == _catalog.version:
+            # Swap the old values of updated planets for the new values of updated and added ones
+            _discovery_stats = _discovery_stats.updated(
+                removed=discovery_columns(_habitability_index, changed[changed < len(_catalog)]),
+                added=discovery_columns(index, changed),
+                version=index.version
+            )
+        _catalog, _habitability_index = catalog, index
+    
+    state.advance(records)
+    state.save(CATALOG_SYNC_STATE_PATH)
+    logger.info(f"Synced exoplanet catalog since {state.watermark}: {len(changed)} planets updated or added")
+    return changed[changed >= previous_size]
+
+def catalog_refresh_due() -> bool:
+    """Whether the catalog needs a full re-ingest or a sync"""
+    if CATALOG_FIXTURE_PATH:
+        return False
+    return _catalog.is_stale(CATALOG_REFRESH_INTERVAL) or get_sync_state().is_due(CATALOG_SYNC_INTERVAL)
+
+def current_catalog_version() -> Optional[str]:
+    """Version of the catalog a request would be served from, or None before the first load"""
+    return None if _catalog is None else _catalog.version
+
+async def refresh_catalog(force_sync: bool = False) -> None:
+    """
+    Load, re-ingest or sync the catalog as needed, and push the changes to event stream subscribers.
+    
+    The caller must hold the catalog lock.
+    """
+    global _catalog
+    previous = _catalog
+    added = np.empty(0, dtype=np.intp)
+    if _catalog is None or (_catalog.is_stale(CATALOG_REFRESH_INTERVAL) and not CATALOG_FIXTURE_PATH):
+        _catalog = await load_catalog()
+    if not CATALOG_FIXTURE_PATH and (force_sync or get_sync_state().is_due(CATALOG_SYNC_INTERVAL)):
+        added = await sync_catalog()
+    
+    if previous is not None and _catalog.version != previous.version:
+        publish_catalog_change(added)
+
+async def refresh_catalog_in_background() -> None:
+    """Re-ingest or sync the catalog if still due, logging failures instead of raising them"""
+    try:
+        async with _catalog_lock:
+            if catalog_refresh_due():
+                await refresh_catalog()
+    except Exception as e:
+        logger.error(f"Background catalog refresh failed: {str(e)}")
+
+def schedule_catalog_refresh() -> None:
+    """Start a background catalog refresh unless one is already running"""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.get_running_loop().create_task(refresh_catalog_in_background())
+
+async def get_catalog() -> ExoplanetCatalog:
+    """
+    Return the local catalog snapshot.
+    
+    Only the first call waits, for the snapshot to load. Afterwards the
+    current snapshot is always served: a due re-ingest or sync is scheduled
+    in the background and swaps the catalog when it completes.
+    """
+    global _catalog
+    if _catalog is None:
+        async with _catalog_lock:
+            # Another request may have loaded the catalog while we waited
+            if _catalog is None:
+                _catalog = await load_catalog()
+    
+    if catalog_refresh_due():
+        schedule_catalog_refresh()
+    return _catalog
+
+async def run_catalog_sync() -> None:
+    """Sync the catalog every sync interval, so requests do not wait for it"""
+    while True:
+        await asyncio.sleep(CATALOG_SYNC_INTERVAL)
+        try:
+            async with _catalog_lock:
+                await refresh_catalog(force_sync=True)
+        except Exception as e:
+            logger.error(f"Scheduled catalog sync failed: {str(e)}")
+
+def start_catalog_sync() -> None:
+    """Start the scheduled catalog sync; runs as the router's startup hook"""
+    global _sync_task
+    if _sync_task is None and not CATALOG_FIXTURE_PATH:
+        _sync_task = asyncio.get_running_loop().create_task(run_catalog_sync())
+
+async def stop_catalog_sync() -> None:
+    """Stop the scheduled catalog sync and any background refresh; runs as the router's shutdown hook"""
+    global _sync_task, _refresh_task
+    for task in (_sync_task, _refresh_task):
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    _sync_task = _refresh_task = None
+
+router.add_event_handler("startup", start_catalog_sync)
+router.add_event_handler("shutdown", stop_catalog_sync)
+router.add_event_handler("shutdown", close_http_client)
+router.add_event_handler("shutdown", close_render_pool)
+
+def current_habitability_index(catalog: ExoplanetCatalog) -> HabitabilityIndex:
+    """Habitability index of ``catalog``, rebuilt after a full load"""
+    global _habitability_index
+    if _habitability_index is None or _habitability_index.version != catalog.version:
+        _habitability_index = HabitabilityIndex(catalog)
+    return _habitability_index
+
+async def get_habitability_index() -> HabitabilityIndex:
+    """Return the habitability index for the current catalog, rebuilding it after a refresh"""
+    return current_habitability_index(await get_catalog())
+
+async def get_name_index() -> NameIndex:
+    """Return the planet name index for the current catalog, rebuilding it after a refresh"""
+    global _name_index
+    index = await get_habitability_index()
+    # Syncs that only update known planets keep the names, and so the index
+    if _name_index is None or _name_index.version != index.catalog.names_version:
+        _name_index = NameIndex(index.catalog.column("pl_name"), version=index.catalog.names_version)
+    return _name_index
+
+def discovery_columns(index: HabitabilityIndex, rows: np.ndarray) -> Dict[str, np.ndarray]:
+    """Columns aggregated by the dashboard statistics, for some rows of the index's catalog"""
+    catalog = index.catalog
+    return {
+        "methods": catalog.column("pl_discmethod")[rows],
+        "years": catalog.column("pl_disc")[rows],
+        "habitable": habitable_mask(index.scores[rows], catalog.column("pl_rade")[rows], catalog.column("pl_eqt")[rows])
+    }
+
+def current_discovery_stats(index: HabitabilityIndex) -> DiscoveryStats:
+    """Dashboard statistics of the index's catalog, aggregated after a full load"""
+    global _discovery_stats
+    if _discovery_stats is None or _discovery_stats.version != index.version:
+        _discovery_stats = DiscoveryStats.from_columns(
+            **discovery_columns(index, np.arange(len(index))), version=index.version
+        )
+    return _discovery_stats
+
+async def get_discovery_stats() -> DiscoveryStats:
+    """Return the dashboard statistics of the current catalog"""
+    return current_discovery_stats(await get_habitability_index())
+
+def current_discovery_index(catalog: ExoplanetCatalog) -> DiscoveryIndex:
+    """Discovery date index of ``catalog``, rebuilt after a refresh"""
+    global _discovery_index
+    if _discovery_index is None or _discovery_index.version != catalog.version:
+        _discovery_index = DiscoveryIndex.from_catalog(catalog)
+    return _discovery_index
+
+def publish_catalog_change(added: np.ndarray) -> None:
+    """
+    Push the new dashboard statistics, and the planets a sync added, to event stream subscribers.
+    
+    Called once per catalog change however many clients are connected; each
+    event is encoded once for all of them.
+    """
+    if not len(event_broadcaster):
+        return
+    index = current_habitability_index(_catalog)
+    event_broadcaster.publish("stats", current_discovery_stats(index).as_dict(), event_id=index.version)
+    if len(added):
+        catalog = index.catalog
+        event_broadcaster.publish("discoveries", [
+            {
+                "name": str(catalog.column("pl_name")[row]),
+                "discovery_method": str(catalog.column("pl_discmethod")[row]) or None,
+                "discovery_year": None if np.isnan(catalog.column("pl_disc")[row]) else int(catalog.column("pl_disc")[row])
+            }
+            for row in added[:MAX_DISCOVERY_EVENT_PLANETS]
+        ], event_id=index.version)
+
+def build_habitable_exoplanet(index: HabitabilityIndex, row: int) -> HabitableExoplanet:
+    """Create the response model for one catalog row of the habitability index"""
+    planet = index.catalog.record(row)
+    
+    # Calculate distance in light years
+    distance = planet.get("st_dist", None)
+    if distance:
+        distance = distance * 3.26  # Convert parsecs to light years
+    
+    return HabitableExoplanet(
+        name=planet.get("pl_name", "Unknown"),
+        habitability_score=float(index.scores[row]),
+        distance=distance,
+        earth_radius=planet.get("pl_rade", None),
+        eq_temperature=planet.get("pl_eqt", None),
+        discovery_method=planet.get("pl_discmethod", None)
+    )
+
+async def get_or_build_figure(name: str, build, **params) -> Any:
+    """
+    Return a generated figure or page for the current catalog, building it once per catalog version.
+    
+    Args:
+        name: Figure name, used as the cache namespace
+        build: Coroutine function producing the figure from a catalog snapshot. It is
+            given the snapshot whose version keys the figure, so a refresh completing
+            meanwhile cannot cache a newer catalog's figure under the older version
+        params: Other inputs the figure depends on (e.g. the current year)
+    """
+    catalog = await get_catalog()
+    key = make_cache_key(f"figure:{name}", {"catalog": catalog.version, **params})
+    return await figure_cache.get_or_fetch(key, lambda: build(catalog))
 
 def calculate_habitability_score(planet_data: Dict[str, Any]) -> float:
     """
@@ -143,72 +571,12 @@ def calculate_habitability_score(planet_data: Dict[str, Any]) -> float:
     - Equilibrium temperature (closer to Earth's average is better)
     
     Returns a score between 0 and 1, where 1 is most Earth-like/habitable.
+    Thin wrapper around the vectorized ``score_habitability``.
     """
-    score = 0.5  # Default score
-    
-    # Size/mass factor (Earth-like mass/radius is best)
-    earth_radii = planet_data.get("pl_rade", None)
-    if earth_radii:
-        # Closer to Earth's radius increases score
-        if 0.8 <= earth_radii <= 1.5:
-            score += 0.15
-        elif 0.5 <= earth_radii <= 2.0:
-            score += 0.05
-        else:
-            score -= 0.1
-    
-    # Temperature factor
-    eq_temp = planet_data.get("pl_eqt", None)
-    if eq_temp:
-        # Earth's equilibrium temp is around 255K
-        temp_diff = abs(eq_temp - 255)
-        if temp_diff < 30:
-            score += 0.15
-        elif temp_diff < 50:
-            score += 0.05
-        elif temp_diff > 100:
-            score -= 0.1
-    
-    # Orbit factor (Earth-like orbit is best)
-    orbit_period = planet_data.get("pl_orbper", None)
-    if orbit_period:
-        # Closer to Earth's orbital period (365 days)
-        period_ratio = abs(orbit_period - 365) / 365
-        if period_ratio < 0.2:
-            score += 0.1
-        elif period_ratio < 0.5:
-            score += 0.05
-    
-    # Insolation factor (Earth = 1)
-    insol = planet_data.get("pl_insol", None)
-    if insol:
-        insol_diff = abs(insol - 1)
-        if insol_diff < 0.2:
-            score += 0.1
-        elif insol_diff < 0.5:
-            score += 0.05
-        elif insol_diff > 2:
-            score -= 0.05
-    
-    # Limit to range 0-1
-    return max(0, min(1, score))
+    return score_planet(planet_data)
 
-@router.get("/exoplanet/{name}", response_model=ExoplanetDetail)
-async def get_exoplanet(name: str = Path(..., description="Name of the exoplanet")):
-    """
-    Get detailed information about a specific exoplanet.
-    """
-    logger.info(f"Getting information for exoplanet: {name}")
-    
-    # Query NASA Exoplanet Archive for planet details
-    query = f"select * from ps where pl_name='{name}'"
-    planet_data = await fetch_from_nasa_exoplanet_archive(query)
-    
-    if not planet_data or len(planet_data) == 0:
-        raise HTTPException(status_code=404, detail=f"Exoplanet '{name}' not found")
-    
-    planet_info = planet_data[0]
-    
+def build_exoplanet_detail(planet_info: Dict[str, Any]) -> ExoplanetDetail:
+    """Create the detail response model for one archive-style catalog record"""
     # Extract relevant data for our model
     earth_radius = planet_info.get("pl_rade", None)
     orbital_period = planet_info.get("pl_orbper", None)
@@ -227,8 +595,8 @@ async def get_exoplanet(name: str = Path(..., description="Name of the exoplanet
     }
     
     # Create the response model
-    exoplanet = ExoplanetDetail(
-        name=name,
+    return ExoplanetDetail(
+        name=planet_info["pl_name"],
         size_comparison=size_comparison,
         discovery_method=discovery_method,
         orbital_period=f"{orbital_period} days" if orbital_period else "Unknown",
@@ -237,8 +605,107 @@ async def get_exoplanet(name: str = Path(..., description="Name of the exoplanet
         eq_temperature=eq_temperature,
         discovery_year=discovery_year
     )
+
+async def resolve_exoplanets(names: List[str]) -> List[Dict[str, Any]]:
+    """
+    Catalog records for several planet names, in request order, resolved in one pass over the name index.
+    
+    Names resolving to a planet already listed are dropped, so each planet is returned once.
+    
+    Raises:
+        HTTPException: 404 listing every unknown name with its closest matches
+    """
+    name_index = await get_name_index()
+    catalog = await get_catalog()
+    
+    names, rows = dedupe_resolved(names, [name_index.resolve(name) for name in names])
+    missing = [name for name, row in zip(names, rows) if row is None]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": f"Exoplanets not found: {', '.join(missing)}",
+                "suggestions": {
+                    name: [str(catalog.column("pl_name")[row]) for row in name_index.suggest(name, limit=5)]
+                    for name in missing
+                }
+            }
+        )
+    
+    return catalog.records(rows)
+
+def names_query(names: str) -> List[str]:
+    """Parse the comma-separated ``names`` parameter, as a 400 if it is empty or too long"""
+    try:
+        return parse_names(names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/exoplanet/{name}", response_model=ExoplanetDetail)
+async def get_exoplanet(name: str = Path(..., description="Name of the exoplanet")):
+    """
+    Get detailed information about a specific exoplanet.
+    """
+    logger.info(f"Getting information for exoplanet: {name}")
+    
+    # Resolve the name in the local catalog snapshot, tolerating case, spacing, hyphens and aliases
+    names = await get_name_index()
+    index = names.resolve(name)
+    catalog = await get_catalog()
+    
+    if index is None:
+        suggestions = [str(catalog.column("pl_name")[row]) for row in names.suggest(name, limit=5)]
+        raise HTTPException(
+            status_code=404,
+            detail={"error": f"Exoplanet '{name}' not found", "suggestions": suggestions}
+        )
+    
+    return build_exoplanet_detail(catalog.record(index))
+
+@router.get("/exoplanets", response_model=List[ExoplanetDetail])
+async def get_exoplanets(
+    names: str = Query(..., description=f"Comma-separated planet names, at most {MAX_BULK_NAMES}")
+):
+    """
+    Get detailed information about several exoplanets in one request, in the order given.
+    """
+    planet_names = names_query(names)
+    logger.info(f"Getting information for {len(planet_names)} exoplanets")
+    
+    return [build_exoplanet_detail(planet_info) for planet_info in await resolve_exoplanets(planet_names)]
+
+@router.get("/exoplanets/compare", response_model=ExoplanetComparison)
+async def compare_exoplanets(
+    names: str = Query(..., description=f"Comma-separated planet names, at most {MAX_BULK_NAMES}; the first is the reference")
+):
+    """
+    Compare exoplanets with the first one given.
+    
+    Returns the detail records and, for every other planet, its differences
+    from the reference in radius, temperature, distance and habitability score.
+    """
+    planet_names = names_query(names)
+    if len(planet_names) < 2:
+        raise HTTPException(status_code=400, detail="'names' must list at least two planets")
+    logger.info(f"Comparing exoplanets: {', '.join(planet_names)}")
+    
+    planet_infos = await resolve_exoplanets(planet_names)
+    if len(planet_infos) < 2:
+        # Different spellings of one planet
+        raise HTTPException(status_code=400, detail="'names' must list at least two planets")
+    planets = [build_exoplanet_detail(planet_info) for planet_info in planet_infos]
+    deltas = comparison_deltas(
+        [planet.name for planet in planets],
+        {
+            # Raw radius; size_comparison substitutes Earth's radius when it is unknown
+            "earth_radius": [planet_info.get("pl_rade") for planet_info in planet_infos],
+            "eq_temperature": [planet.eq_temperature for planet in planets],
+            "distance": [planet.distance for planet in planets],
+            "habitability_score": [planet.habitability_score for planet in planets]
+        }
+    )
     
-    return exoplanet
+    return ExoplanetComparison(reference=planets[0].name, planets=planets, deltas=deltas)
 
 @router.get("/exoplanet/{name}/visualization")
 async def get_exoplanet_visualization(name: str = Path(..., description="Name of the exoplanet")):
@@ -248,117 +715,451 @@ async def get_exoplanet_visualization(name: str = Path(..., description="Name of
     exoplanet = await get_exoplanet(name)
     
     # Generate visualization
-    visualization_data = generate_exoplanet_comparison_plot(exoplanet)
+    visualization_data = await render(generate_exoplanet_comparison_plot, exoplanet)
     
     return HTMLResponse(content=visualization_data)
 
+@router.get("/exoplanet/{name}/comparison.png")
+async def get_exoplanet_comparison_image(
+    name: str = Path(..., description="Name of the exoplanet"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get the PNG bar chart comparing an exoplanet to Earth.
+    
+    The image is content-addressed by the planet's values, so the ETag is
+    known before rendering and unchanged images are answered with 304.
+    """
+    exoplanet = await get_exoplanet(name)
+    
+    key = comparison_image_key(exoplanet)
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    png = image_cache.get(key)
+    if png is None:
+        png = await render(render_comparison_png, exoplanet)
+        image_cache.set(key, png)
+    return Response(content=png, media_type="image/png", headers=headers)
+
+async def filter_rows(
+    rows: np.ndarray,
+    q: Optional[str] = None,
+    method: Optional[str] = None,
+    score_band: Optional[str] = None,
+    sort: str = "score"
+) -> np.ndarray:
+    """
+    Apply the listing filters to catalog rows given in habitability rank order, and sort them.
+    """
+    index = await get_habitability_index()
+    
+    if q:
+        names = await get_name_index()
+        rows = rows[np.isin(rows, names.search(q))]
+    if method:
+        rows = rows[index.catalog.column("pl_discmethod")[rows] == method]
+    if score_band:
+        rows = rows[score_band_mask(index.scores[rows], score_band)]
+    
+    descending = sort.startswith("-")
+    key = sort.lstrip("-")
+    if key == "score":
+        return rows[::-1] if descending else rows
+    if key == "name":
+        names = await get_name_index()
+        rows = rows[np.argsort(names.name_rank[rows], kind="stable")]
+        return rows[::-1] if descending else rows
+    # Distance: negate rather than reverse so unknown distances stay last, ties keep rank order
+    distances = index.catalog.column("st_dist")[rows]
+    return rows[np.argsort(-distances if descending else distances, kind="stable")]
+
+async def query_habitable_rows(
+    q: Optional[str] = None,
+    method: Optional[str] = None,
+    score_band: Optional[str] = None,
+    sort: str = "score"
+) -> np.ndarray:
+    """
+    Catalog rows of the potentially habitable exoplanets matching the filters, in ``sort`` order.
+    """
+    # Select exoplanets that might be habitable from the precomputed index
+    # This is a simplified filter focusing on planets with Earth-like sizes and temperatures
+    # Only include planets with decent habitability, sorted by score (descending)
+    index = await get_habitability_index()
+    rows = index.query(min_score=HABITABLE_MIN_SCORE, radius=HABITABLE_RADIUS, temperature=HABITABLE_TEMPERATURE)
+    
+    return await filter_rows(rows, q=q, method=method, score_band=score_band, sort=sort)
+
+def list_habitable_exoplanets(catalog: ExoplanetCatalog) -> List[HabitableExoplanet]:
+    """All potentially habitable exoplanets of a catalog snapshot, highest habitability score first"""
+    index = current_habitability_index(catalog)
+    rows = index.query(min_score=HABITABLE_MIN_SCORE, radius=HABITABLE_RADIUS, temperature=HABITABLE_TEMPERATURE)
+    return [build_habitable_exoplanet(index, row) for row in rows]
+
+@router.get("/exoplanets/suggest", response_model=List[str])
+async def suggest_exoplanets(
+    q: str = Query(..., max_length=100, description="Partial or misspelled planet name"),
+    limit: int = Query(MAX_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS, description="Maximum number of suggestions")
+):
+    """
+    Autocomplete planet names: exact and alias matches, then prefix matches, then similar names.
+    """
+    names = await get_name_index()
+    catalog = await get_catalog()
+    return [str(catalog.column("pl_name")[row]) for row in names.suggest(q, limit=limit)]
+
 @router.get("/exoplanets/habitable", response_model=List[HabitableExoplanet])
-async def get_habitable_exoplanets():
+async def get_habitable_exoplanets(
+    q: Optional[str] = Query(None, max_length=100, description="Case-insensitive substring of the planet name"),
+    method: Optional[str] = Query(None, description="Discovery method"),
+    score_band: Optional[str] = Query(None, pattern="^(high|medium|low)$", description="Habitability score band"),
+    sort: str = Query("score", pattern=f"^({'|'.join(LISTING_SORTS)})$", description="Sort order; prefix with - to reverse"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LISTING_LIMIT, description="Page size; all matches when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page")
+):
     """
     Get a list of potentially habitable exoplanets with habitability scores.
+    
+    Supports name search, discovery method and score band filters, sorting and
+    cursor pagination. The total number of matches is returned in the
+    X-Total-Count header and the cursor of the next page, if any, in X-Next-Cursor.
     """
-    logger.info("Getting potentially habitable exoplanets")
+    logger.info(f"Getting potentially habitable exoplanets (q={q}, method={method}, band={score_band})")
+    
+    index = await get_habitability_index()
+    offset = 0
+    if cursor:
+        try:
+            offset = decode_cursor(cursor, index.version)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    rows = await query_habitable_rows(q=q, method=method, score_band=score_band, sort=sort)
+    page = rows[offset:] if limit is None else rows[offset:offset + limit]
     
-    # Query for exoplanets that might be habitable
-    # This is a simplified query focusing on planets with Earth-like sizes and temperatures
-    query = """
-    select pl_name, pl_rade, pl_orbper, pl_eqt, pl_discmethod, pl_disc, st_dist 
-    from ps 
-    where pl_rade between 0.5 and 2.0 
-    and pl_eqt between 200 and 320
-    order by pl_eqt
+    headers = {"X-Total-Count": str(len(rows))}
+    if offset + len(page) < len(rows):
+        headers["X-Next-Cursor"] = encode_cursor(offset + len(page), index.version)
+    
+    # Built column-wise and serialized directly; the listing can be the whole catalog
+    return FastJSONResponse(export_records(index.catalog, index.scores, page, LISTING_EXPORT_COLUMNS), headers=headers)
+
+@router.get("/exoplanets/export")
+async def export_exoplanets(
+    export_format: str = Query("ndjson", alias="format", pattern=f"^({'|'.join(EXPORT_FORMATS)})$", description="Output format"),
+    q: Optional[str] = Query(None, max_length=100, description="Case-insensitive substring of the planet name"),
+    method: Optional[str] = Query(None, description="Discovery method"),
+    score_band: Optional[str] = Query(None, pattern="^(high|medium|low)$", description="Habitability score band"),
+    sort: str = Query("score", pattern=f"^({'|'.join(LISTING_SORTS)})$", description="Sort order; prefix with - to reverse"),
+    habitable_only: bool = Query(False, description="Only the potentially habitable exoplanets of the listing")
+):
     """
-    planets_data = await fetch_from_nasa_exoplanet_archive(query)
+    Stream the scored catalog as NDJSON, CSV or Parquet.
     
-    if not planets_data:
-        return []
+    Takes the filters of the habitable exoplanets listing. Rows are read,
+    scored and serialized in batches while the response is sent, so memory
+    stays constant however many rows are exported. The number of exported
+    rows is returned in the X-Total-Count header.
+    """
+    if export_format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
     
-    habitable_exoplanets = []
+    index = await get_habitability_index()
+    if habitable_only:
+        rows = await query_habitable_rows(q=q, method=method, score_band=score_band, sort=sort)
+    else:
+        rows = await filter_rows(index.by_score, q=q, method=method, score_band=score_band, sort=sort)
+    logger.info(f"Exporting {len(rows)} exoplanets as {export_format}")
     
-    for planet in planets_data:
-        # Calculate distance in light years
-        distance = planet.get("st_dist", None)
-        if distance:
-            distance = distance * 3.26  # Convert parsecs to light years
-        
-        # Calculate habitability score
-        habitability_score = calculate_habitability_score(planet)
-        
-        if habitability_score >= 0.5:  # Only include planets with decent habitability
-            exoplanet = HabitableExoplanet(
-                name=planet.get("pl_name", "Unknown"),
-                habitability_score=habitability_score,
-                distance=distance,
-                earth_radius=planet.get("pl_rade", None),
-                eq_temperature=planet.get("pl_eqt", None)
-            )
-            habitable_exoplanets.append(exoplanet)
+    # The index holds its own catalog and scores, so a refresh during the stream does not mix versions
+    body = serialize_export(
+        export_format,
+        catalog_export_batches(index.catalog, index.scores, rows),
+        CATALOG_EXPORT_COLUMNS
+    )
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="exoplanets.{export_format}"',
+            "X-Total-Count": str(len(rows))
+        }
+    )
+
+@router.get("/exoplanets/ranked", response_model=HabitableExoplanetPage)
+async def get_ranked_exoplanets(
+    band: Optional[str] = Query(None, pattern="^(high|medium|low)$", description="Habitability score band"),
+    min_score: Optional[float] = Query(None, ge=0.0, le=1.0, description="Minimum habitability score"),
+    min_radius: Optional[float] = Query(None, description="Minimum radius (Earth radii)"),
+    max_radius: Optional[float] = Query(None, description="Maximum radius (Earth radii)"),
+    min_temperature: Optional[float] = Query(None, description="Minimum equilibrium temperature (K)"),
+    max_temperature: Optional[float] = Query(None, description="Maximum equilibrium temperature (K)"),
+    min_distance: Optional[float] = Query(None, description="Minimum distance (light years)"),
+    max_distance: Optional[float] = Query(None, description="Maximum distance (light years)"),
+    offset: int = Query(0, ge=0, description="Number of ranked results to skip"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results to return")
+):
+    """
+    Get exoplanets ranked by habitability score, with score-band and range filters.
+    """
+    logger.info(f"Getting ranked exoplanets (band={band}, offset={offset}, limit={limit})")
     
-    # Sort by habitability score (descending)
-    habitable_exoplanets.sort(key=lambda x: x.habitability_score, reverse=True)
+    index = await get_habitability_index()
+    rows = index.query(
+        band=band,
+        min_score=min_score,
+        radius=(min_radius, max_radius),
+        temperature=(min_temperature, max_temperature),
+        distance=(min_distance, max_distance)
+    )
     
-    return habitable_exoplanets
+    return FastJSONResponse({
+        "total": len(rows),
+        "offset": offset,
+        "limit": limit,
+        "items": export_records(index.catalog, index.scores, rows[offset:offset + limit], LISTING_EXPORT_COLUMNS)
+    })
+
+@router.post("/exoplanets/predict", response_model=HabitabilityPredictionResponse)
+async def predict_habitability_batch(request: HabitabilityPredictionRequest):
+    """
+    Predict habitability with the ML model for many planets in one call.
+    
+    Accepts either explicit (radius, temperature, distance) rows or a filter
+    over the catalog; catalog planets missing any feature are skipped.
+    """
+    if (request.planets is None) == (request.filter is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of 'planets' or 'filter'")
+    
+    if request.planets is not None:
+        names = [planet.name for planet in request.planets]
+        features = np.array(
+            [[planet.radius, planet.temperature, planet.distance] for planet in request.planets],
+            dtype=np.float64
+        ).reshape(-1, 3)
+    else:
+        catalog_filter = request.filter
+        index = await get_habitability_index()
+        rows = index.query(
+            band=catalog_filter.band,
+            min_score=catalog_filter.min_score,
+            radius=(catalog_filter.min_radius, catalog_filter.max_radius),
+            temperature=(catalog_filter.min_temperature, catalog_filter.max_temperature),
+            distance=(catalog_filter.min_distance, catalog_filter.max_distance)
+        )
+        catalog = index.catalog
+        features = np.column_stack([
+            catalog.column("pl_rade")[rows],
+            catalog.column("pl_eqt")[rows],
+            catalog.column("st_dist")[rows] * 3.26  # Convert parsecs to light years
+        ])
+        complete = ~np.isnan(features).any(axis=1)
+        rows, features = rows[complete], features[complete]
+        names = catalog.column("pl_name")[rows].tolist()
+    
+    logger.info(f"Predicting habitability for {len(features)} planets")
+    probabilities = predict_habitability_proba(features)
+    
+    predictions = [
+        HabitabilityPrediction(
+            name=name,
+            radius=radius,
+            temperature=temperature,
+            distance=distance,
+            probability=probability,
+            ml_habitability_prediction=habitability_label(probability)
+        )
+        for name, (radius, temperature, distance), probability
+        in zip(names, features.tolist(), probabilities.tolist())
+    ]
+    
+    return HabitabilityPredictionResponse(count=len(predictions), predictions=predictions)
 
 @router.get("/exoplanets/habitable/visualization")
 async def get_habitable_exoplanets_visualization():
     """
     Get visualization of habitable exoplanets (scatter plot).
     """
-    habitable_planets = await get_habitable_exoplanets()
+    async def build(catalog: ExoplanetCatalog) -> str:
+        habitable_planets = list_habitable_exoplanets(catalog)
+        
+        # Generate visualization
+        return await render(generate_habitability_scatter_plot, habitable_planets)
     
-    # Generate visualization
-    visualization_data = generate_habitability_scatter_plot(habitable_planets)
+    visualization_data = await get_or_build_figure("habitable.html", build)
     
     return HTMLResponse(content=visualization_data)
 
-@router.get("/exoplanets/discovered/last-year", response_model=List[TimelineExoplanet])
-async def get_recent_discoveries():
+@router.get("/exoplanets/habitable/figure.json")
+async def get_habitable_exoplanets_figure():
     """
-    Get exoplanets discovered in the last year.
+    Get the habitable exoplanets figures as Plotly JSON for rendering in the browser.
     """
-    logger.info("Getting exoplanets discovered in the last year")
+    async def build(catalog: ExoplanetCatalog) -> Dict[str, Any]:
+        habitable_planets = list_habitable_exoplanets(catalog)
+        
+        return habitability_figure_spec(
+            names=[planet.name for planet in habitable_planets],
+            scores=[planet.habitability_score for planet in habitable_planets],
+            distances=[planet.distance for planet in habitable_planets],
+            radii=[planet.earth_radius for planet in habitable_planets],
+            temperatures=[planet.eq_temperature for planet in habitable_planets]
+        )
     
-    # Get current year
-    current_year = datetime.datetime.now().year
+    return FastJSONResponse(await get_or_build_figure("habitable.json", build))
+
+def discovery_window(window: Optional[str], since: Optional[str], until: Optional[str]):
+    """Resolve the timeline window parameters, as a 400 error if they are invalid"""
+    try:
+        return resolve_window(window, since, until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def query_discoveries(since: Optional[datetime.date], until: Optional[datetime.date],
+                            catalog: Optional[ExoplanetCatalog] = None) -> List[Dict[str, Any]]:
+    """
+    Timeline entries of the planets discovered within ``[since, until]``, newest first.
     
-    # Query for recent discoveries
-    query = f"""
-    select pl_name, pl_disc, pl_discmethod
-    from ps 
-    where pl_disc >= {current_year - 1}
-    order by pl_disc desc
+    Found by binary search in the discovery index and built column-wise, with
+    the publication date where the archive has it (see ``discovery_date_precision``).
+    Uses ``catalog`` if given, else the current catalog.
     """
-    planets_data = await fetch_from_nasa_exoplanet_archive(query)
+    if catalog is None:
+        catalog = await get_catalog()
+    discoveries = current_discovery_index(catalog)
+    positions = discoveries.window(since, until)
+    rows = discoveries.rows[positions]
     
-    if not planets_data:
-        return []
+    names = catalog.column("pl_name")[rows].tolist()
+    methods = catalog.column("pl_discmethod")[rows].tolist()
+    return [
+        {
+            "name": name,
+            "discovery_date": date,
+            "discovery_method": method or "Unknown",
+            "discovery_date_precision": precision
+        }
+        for name, date, method, precision in zip(
+            names, discoveries.dates[positions].tolist(), methods, discoveries.precisions[positions].tolist()
+        )
+    ]
+
+@router.get("/exoplanets/discovered", response_model=List[TimelineExoplanet])
+@router.get("/exoplanets/discovered/last-year", response_model=List[TimelineExoplanet])
+async def get_recent_discoveries(
+    window: str = Query(DEFAULT_DISCOVERY_WINDOW, description="'last-year', 'all' or '<N>d' for the last N days"),
+    since: Optional[str] = Query(None, description="First discovery date (YYYY-MM-DD); overrides window"),
+    until: Optional[str] = Query(None, description="Last discovery date (YYYY-MM-DD); overrides window")
+):
+    """
+    Get exoplanets discovered within a time window, newest first.
+    
+    Defaults to the last year (since January 1 of the previous year).
+    """
+    since_date, until_date = discovery_window(window, since, until)
+    logger.info(f"Getting exoplanets discovered between {since_date} and {until_date}")
+    
+    return FastJSONResponse(await query_discoveries(since_date, until_date))
+
+@router.get("/exoplanets/discovered/visualization")
+@router.get("/exoplanets/discovered/last-year/visualization")
+async def get_recent_discoveries_visualization(
+    window: str = Query(DEFAULT_DISCOVERY_WINDOW, description="'last-year', 'all' or '<N>d' for the last N days"),
+    since: Optional[str] = Query(None, description="First discovery date (YYYY-MM-DD); overrides window"),
+    until: Optional[str] = Query(None, description="Last discovery date (YYYY-MM-DD); overrides window")
+):
+    """
+    Get visualization of exoplanet discoveries within a time window (timeline).
+    """
+    since_date, until_date = discovery_window(window, since, until)
     
-    # Create discovery date based on available information
-    recent_discoveries = []
-    for planet in planets_data:
-        discovery_year = planet.get("pl_disc", None)
+    async def build(catalog: ExoplanetCatalog) -> str:
+        recent_discoveries = [
+            TimelineExoplanet(**discovery) for discovery in await query_discoveries(since_date, until_date, catalog)
+        ]
         
-        # Create a discovery date (this is approximated since we only have year)
-        # In a real system, we'd look for more precise dates
-        discovery_date = f"{discovery_year}-01-01"
+        # Generate visualization
+        return await render(generate_discovery_timeline_plot, recent_discoveries)
+    
+    # Relative windows move with the calendar, so the resolved dates are part of the key
+    visualization_data = await get_or_build_figure(
+        "discoveries.html", build, since=str(since_date), until=str(until_date)
+    )
+    
+    return HTMLResponse(content=visualization_data)
+
+@router.get("/exoplanets/discovered/figure.json")
+@router.get("/exoplanets/discovered/last-year/figure.json")
+async def get_recent_discoveries_figure(
+    window: str = Query(DEFAULT_DISCOVERY_WINDOW, description="'last-year', 'all' or '<N>d' for the last N days"),
+    since: Optional[str] = Query(None, description="First discovery date (YYYY-MM-DD); overrides window"),
+    until: Optional[str] = Query(None, description="Last discovery date (YYYY-MM-DD); overrides window")
+):
+    """
+    Get the discovery timeline figures of a time window as Plotly JSON for rendering in the browser.
+    """
+    since_date, until_date = discovery_window(window, since, until)
+    
+    async def build(catalog: ExoplanetCatalog) -> Dict[str, Any]:
+        recent_discoveries = await query_discoveries(since_date, until_date, catalog)
         
-        exoplanet = TimelineExoplanet(
-            name=planet.get("pl_name", "Unknown"),
-            discovery_date=discovery_date,
-            discovery_method=planet.get("pl_discmethod", "Unknown")
+        return discovery_figure_spec(
+            names=[planet["name"] for planet in recent_discoveries],
+            dates=[planet["discovery_date"] for planet in recent_discoveries],
+            methods=[planet["discovery_method"] for planet in recent_discoveries]
         )
-        recent_discoveries.append(exoplanet)
     
-    return recent_discoveries
+    return FastJSONResponse(
+        await get_or_build_figure("discoveries.json", build, since=str(since_date), until=str(until_date))
+    )
 
-@router.get("/exoplanets/discovered/last-year/visualization")
-async def get_recent_discoveries_visualization():
+@router.get("/dashboard/stats")
+async def get_dashboard_stats():
+    """
+    Get statistics for the dashboard: totals, habitable count, and counts per discovery method and year.
+    
+    Served from aggregates maintained with the catalog, so polling this endpoint never scans it.
     """
-    Get visualization of recent exoplanet discoveries (timeline).
+    stats = await get_discovery_stats()
+    return stats.as_dict()
+
+@router.get("/events")
+async def stream_events():
     """
-    recent_discoveries = await get_recent_discoveries()
+    Server-Sent Events stream of dashboard updates.
     
-    # Generate visualization
-    visualization_data = generate_discovery_timeline_plot(recent_discoveries)
+    Sends the current statistics on connect, then a ``stats`` event each time
+    the catalog changes and a ``discoveries`` event listing planets a sync
+    added. Nothing is sent while the catalog is unchanged apart from keepalive
+    comments, so open dashboards do not need to poll.
+    """
+    stats = await get_discovery_stats()
+    try:
+        subscription = event_broadcaster.subscribe()
+    except TooManySubscribers as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(EVENT_RETRY_MS // 1000)})
     
-    return HTMLResponse(content=visualization_data)
+    initial = [format_event("stats", stats.as_dict(), event_id=stats.version)]
+    return StreamingResponse(
+        event_broadcaster.stream(subscription, initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/metrics/render")
+async def get_render_metrics():
+    """
+    Get render pool metrics: job counts, render time and queue wait histograms,
+    plus hit counts of the generated figure cache and the upstream response
+    cache, event stream counters and conditional request counters.
+    """
+    return {
+        **get_render_pool().stats(),
+        "figure_cache": figure_cache.stats(),
+        "response_cache": cache.stats(),
+        "events": event_broadcaster.stats(),
+        "conditional_requests": conditional_requests.stats()
+    }
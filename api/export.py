@@ -0,0 +1,184 @@
+import io
+import csv
+import logging
+import importlib.util
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from api.response_encoding import dumps
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Exported fields and their types, in output order
+EXPORT_COLUMN_TYPES = {
+    "name": "string",
+    "habitability_score": "float",
+    "distance": "float",  # in light years
+    "earth_radius": "float",
+    "eq_temperature": "float",
+    "orbital_period": "float",  # in days
+    "insolation": "float",
+    "discovery_method": "string",
+    "discovery_year": "int"
+}
+CATALOG_EXPORT_COLUMNS = tuple(EXPORT_COLUMN_TYPES)
+
+# Fields of the habitable exoplanets listing, for exports of the listing itself
+LISTING_EXPORT_COLUMNS = ("name", "habitability_score", "distance", "earth_radius", "eq_temperature", "discovery_method")
+
+# Media types of the supported export formats
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+# Rows read, scored and serialized at a time; one Parquet row group per batch
+EXPORT_BATCH_ROWS = 2000
+
+Batch = List[Dict[str, Any]]
+
+
+def _column_values(values: np.ndarray, kind: str) -> List[Any]:
+    """Plain Python values of a column slice, with None for missing values"""
+    if kind == "string":
+        return [value or None for value in values.tolist()]
+    missing = np.isnan(values)
+    # Missing values are cast from 0, as casting NaN to an integer is undefined
+    converted = np.where(missing, 0, values).astype(np.int64).tolist() if kind == "int" else values.tolist()
+    return [None if absent else value for absent, value in zip(missing.tolist(), converted)]
+
+
+def export_records(catalog, scores: np.ndarray, rows: np.ndarray,
+                   columns: Sequence[str] = CATALOG_EXPORT_COLUMNS) -> Batch:
+    """
+    Export records of scored catalog rows, built column by column.
+
+    Avoids building a model or archive dict per row, so it also serves the
+    listing routes, with ``LISTING_EXPORT_COLUMNS``.
+    """
+    extractors = {
+        "name": lambda: _column_values(catalog.column("pl_name")[rows], "string"),
+        "habitability_score": lambda: _column_values(scores[rows], "float"),
+        "distance": lambda: _column_values(catalog.column("st_dist")[rows] * 3.26, "float"),  # Convert parsecs to light years
+        "earth_radius": lambda: _column_values(catalog.column("pl_rade")[rows], "float"),
+        "eq_temperature": lambda: _column_values(catalog.column("pl_eqt")[rows], "float"),
+        "orbital_period": lambda: _column_values(catalog.column("pl_orbper")[rows], "float"),
+        "insolation": lambda: _column_values(catalog.column("pl_insol")[rows], "float"),
+        "discovery_method": lambda: _column_values(catalog.column("pl_discmethod")[rows], "string"),
+        "discovery_year": lambda: _column_values(catalog.column("pl_disc")[rows], "int")
+    }
+    values = [extractors[column]() for column in columns]
+    return [dict(zip(columns, record)) for record in zip(*values)]
+
+
+def catalog_export_batches(catalog, scores: np.ndarray, rows: np.ndarray,
+                           batch_size: int = EXPORT_BATCH_ROWS) -> Iterator[Batch]:
+    """
+    Scored catalog rows as batches of export records, in ``rows`` order.
+
+    Only one batch is materialized at a time, so memory does not grow with
+    the number of exported rows.
+    """
+    for start in range(0, len(rows), batch_size):
+        yield export_records(catalog, scores, rows[start:start + batch_size])
+
+
+def record_batches(records: Iterable[Dict[str, Any]], batch_size: int = EXPORT_BATCH_ROWS) -> Iterator[Batch]:
+    """Group already materialized records into export batches"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def serialize_ndjson(batches: Iterable[Batch], columns: Sequence[str]) -> Iterator[bytes]:
+    """One JSON object per line"""
+    for batch in batches:
+        lines = [dumps({column: record.get(column) for column in columns}) for record in batch]
+        yield b"\n".join(lines) + b"\n"
+
+
+def serialize_csv(batches: Iterable[Batch], columns: Sequence[str]) -> Iterator[bytes]:
+    """CSV with a header row; missing values are empty fields"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(columns), extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to a generator instead of storing them"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def parquet_available() -> bool:
+    """Whether pyarrow, needed for Parquet exports, is installed"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def serialize_parquet(batches: Iterable[Batch], columns: Sequence[str]) -> Iterator[bytes]:
+    """Parquet file with one row group per batch, streamed as each row group is written"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {"string": pa.string(), "float": pa.float64(), "int": pa.int64()}
+    schema = pa.schema([(column, arrow_types[EXPORT_COLUMN_TYPES[column]]) for column in columns])
+
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    yield sink.drain()  # Footer
+
+
+SERIALIZERS = {
+    "ndjson": serialize_ndjson,
+    "csv": serialize_csv,
+    "parquet": serialize_parquet
+}
+
+
+def serialize_export(export_format: str, batches: Iterable[Batch], columns: Sequence[str]) -> Iterator[bytes]:
+    """
+    Serialize export batches in one of ``EXPORT_FORMATS``.
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if export_format not in SERIALIZERS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    logger.debug(f"Streaming {export_format} export")
+    return SERIALIZERS[export_format](batches, columns)
@@ -0,0 +1,166 @@
+import base64
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Largest marker diameter in pixels, as plotly.express sizes bubbles
+SCATTER_SIZE_MAX = 20
+BUBBLE_SIZE_MAX = 25
+
+
+def encode_typed_array(values, dtype: str = "f8") -> Dict[str, str]:
+    """
+    Encode a numeric array in Plotly's typed-array format.
+
+    Plotly.js accepts ``{"dtype": ..., "bdata": <base64 little-endian bytes>}``
+    anywhere a data array is expected; ``decodeTypedArrays`` in
+    ``static/js/plotly_config.js`` handles Plotly.js builds that predate it.
+    """
+    array = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    return {"dtype": dtype, "bdata": base64.b64encode(array.tobytes()).decode("ascii")}
+
+
+def _with_default(values: Sequence[Optional[float]], default: float) -> np.ndarray:
+    """Column as floats, with missing (None/NaN) and zero values replaced by ``default``"""
+    array = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    return np.where(np.isnan(array) | (array == 0), default, array)
+
+
+def _bubble_marker(sizes: np.ndarray, colors: np.ndarray, size_max: int, colorbar_title: str) -> Dict[str, Any]:
+    """Area-scaled marker sized and colored like a plotly.express bubble chart"""
+    largest = float(sizes.max()) if len(sizes) else 1.0
+    return {
+        "size": encode_typed_array(sizes),
+        "sizemode": "area",
+        "sizeref": 2.0 * largest / (size_max ** 2) if largest > 0 else 1.0,
+        "sizemin": 0,
+        "color": encode_typed_array(colors),
+        "colorscale": "Viridis",
+        "showscale": True,
+        "colorbar": {"title": {"text": colorbar_title}}
+    }
+
+
+def habitability_figure_spec(
+    names: List[str],
+    scores: Sequence[float],
+    distances: Sequence[Optional[float]],
+    radii: Sequence[Optional[float]],
+    temperatures: Sequence[Optional[float]]
+) -> Dict[str, Any]:
+    """
+    Figures for the habitable exoplanets page as compact Plotly JSON.
+
+    Same charts as ``generate_habitability_scatter_plot`` (score vs distance,
+    size vs temperature), built without plotly.express and without a theme;
+    the browser applies the dark theme from ``plotly_config.js``.
+
+    Returns:
+        ``{"figures": {"scatter": {...}, "bubble": {...}}}`` with ``data`` and ``layout`` per figure
+    """
+    logger.debug(f"Building habitability figure spec for {len(names)} exoplanets")
+
+    scores = np.asarray(scores, dtype=np.float64)
+    distances = _with_default(distances, 1000)  # Default large distance if unknown
+    radii_scatter = _with_default(radii, 0.5) * 10  # Scale point size; unknown planets get size 5
+    radii_bubble = _with_default(radii, 1)
+    temperatures = _with_default(temperatures, 300)
+
+    scatter = {
+        "data": [{
+            "type": "scatter",
+            "mode": "markers",
+            "x": encode_typed_array(distances),
+            "y": encode_typed_array(scores),
+            "hovertext": names,
+            "marker": _bubble_marker(radii_scatter, scores, SCATTER_SIZE_MAX, "Habitability Score"),
+            "hovertemplate": "<b>%{hovertext}</b><br>Distance: %{x} ly<br>Habitability: %{y:.2f}<extra></extra>"
+        }],
+        "layout": {
+            "title": {"text": "Habitability Score vs. Distance from Earth"},
+            "xaxis": {"title": {"text": "Distance from Earth (Light Years)"}},
+            "yaxis": {"title": {"text": "Habitability Score (0-1)"}},
+            "hovermode": "closest"
+        }
+    }
+
+    bubble = {
+        "data": [{
+            "type": "scatter",
+            "mode": "markers",
+            "x": encode_typed_array(temperatures),
+            "y": encode_typed_array(radii_bubble),
+            "hovertext": names,
+            "marker": _bubble_marker(scores, scores, BUBBLE_SIZE_MAX, "Habitability Score"),
+            "hovertemplate": "<b>%{hovertext}</b><br>Temperature: %{x} K<br>Radius: %{y} Earth<extra></extra>"
+        }],
+        "layout": {
+            "title": {"text": "Exoplanet Size vs. Temperature"},
+            "xaxis": {"title": {"text": "Equilibrium Temperature (K)"}},
+            "yaxis": {"title": {"text": "Planet Size (Earth Radii)"}},
+            "hovermode": "closest"
+        }
+    }
+
+    return {"figures": {"scatter": scatter, "bubble": bubble}}
+
+
+def discovery_figure_spec(names: List[str], dates: List[str], methods: List[str]) -> Dict[str, Any]:
+    """
+    Figures for the discovery timeline page as compact Plotly JSON.
+
+    A timeline of discovery dates with one trace per discovery method, and a
+    bar chart counting discoveries by method.
+
+    Returns:
+        ``{"figures": {"timeline": {...}, "methods": {...}}}`` with ``data`` and ``layout`` per figure
+    """
+    logger.debug(f"Building discovery figure spec for {len(names)} exoplanets")
+
+    # Discovery methods in first-seen order
+    method_counts: Dict[str, int] = {}
+    for method in methods:
+        method_counts[method] = method_counts.get(method, 0) + 1
+
+    timeline_traces = []
+    for method in method_counts:
+        rows = [i for i, row_method in enumerate(methods) if row_method == method]
+        timeline_traces.append({
+            "type": "scatter",
+            "mode": "markers",
+            "name": method,
+            "x": [dates[i] for i in rows],
+            "y": [names[i] for i in rows],
+            "marker": {"size": 14, "symbol": "circle"},
+            "hovertemplate": "<b>%{y}</b><br>Discovered: %{x}<extra>" + method + "</extra>"
+        })
+
+    timeline = {
+        "data": timeline_traces,
+        "layout": {
+            "title": {"text": "Recent Exoplanet Discoveries Timeline"},
+            "xaxis": {"title": {"text": "Discovery Date"}, "type": "date"},
+            "yaxis": {"title": {"text": "Exoplanet"}, "autorange": "reversed"},
+            "height": max(500, len(names) * 25),  # Adjust height based on number of planets
+            "hovermode": "closest"
+        }
+    }
+
+    methods_bar = {
+        "data": [{
+            "type": "bar",
+            "x": list(method_counts),
+            "y": encode_typed_array(list(method_counts.values()), "i4")
+        }],
+        "layout": {
+            "title": {"text": "Exoplanet Discovery Methods"},
+            "xaxis": {"title": {"text": "Discovery Method"}},
+            "yaxis": {"title": {"text": "Number of Exoplanets"}}
+        }
+    }
+
+    return {"figures": {"timeline": timeline, "methods": methods_bar}}
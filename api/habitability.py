@@ -0,0 +1,281 @@
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Archive columns the habitability score is computed from, in argument order
+SCORE_COLUMNS = ["pl_rade", "pl_eqt", "pl_orbper", "pl_insol"]
+
+
+def _present(values: np.ndarray) -> np.ndarray:
+    """
+    Mask of values that count as available: everything but zero.
+
+    NaN counts as available, as a NaN value is truthy in the scalar code; it
+    then fails every comparison of its factor.
+    """
+    return values != 0
+
+
+def missing_as_absent(values: np.ndarray) -> np.ndarray:
+    """
+    Catalog column with its missing values (stored as NaN) as zeros.
+
+    The catalog has no other NaNs, since archive JSON cannot hold them, and
+    zero is what makes the scorer skip a value, like a None in the dict.
+    """
+    return np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0)
+
+
+def score_habitability(pl_rade, pl_eqt, pl_orbper, pl_insol) -> np.ndarray:
+    """
+    Vectorized habitability score for whole catalog columns.
+
+    Applies the same rules as ``calculate_habitability_score`` element-wise,
+    adding the contributions in the same order so results match the scalar
+    path bit for bit. Zeros contribute nothing, like a missing key or falsy
+    value in the per-planet dict; NaN is a value that fails every comparison
+    (so a NaN radius costs 0.1), as in the scalar code. Pass catalog columns,
+    where NaN marks a missing value, through ``missing_as_absent`` first.
+
+    Args:
+        pl_rade: Planet radius in Earth radii
+        pl_eqt: Equilibrium temperature in K
+        pl_orbper: Orbital period in days
+        pl_insol: Insolation flux relative to Earth
+
+    Returns:
+        Array of scores between 0 and 1, broadcast to the inputs' shape
+    """
+    radius, eq_temp, orbit_period, insol = np.broadcast_arrays(
+        *(np.asarray(column, dtype=np.float64) for column in (pl_rade, pl_eqt, pl_orbper, pl_insol))
+    )
+    score = np.full(radius.shape, 0.5)
+
+    with np.errstate(invalid="ignore"):
+        # Size/mass factor (Earth-like mass/radius is best)
+        radius_term = np.select(
+            [(radius >= 0.8) & (radius <= 1.5), (radius >= 0.5) & (radius <= 2.0)],
+            [0.15, 0.05],
+            -0.1
+        )
+        score += np.where(_present(radius), radius_term, 0.0)
+
+        # Temperature factor (Earth's equilibrium temp is around 255K)
+        temp_diff = np.abs(eq_temp - 255)
+        temp_term = np.select([temp_diff < 30, temp_diff < 50, temp_diff > 100], [0.15, 0.05, -0.1], 0.0)
+        score += np.where(_present(eq_temp), temp_term, 0.0)
+
+        # Orbit factor (closer to Earth's orbital period of 365 days)
+        period_ratio = np.abs(orbit_period - 365) / 365
+        orbit_term = np.select([period_ratio < 0.2, period_ratio < 0.5], [0.1, 0.05], 0.0)
+        score += np.where(_present(orbit_period), orbit_term, 0.0)
+
+        # Insolation factor (Earth = 1)
+        insol_diff = np.abs(insol - 1)
+        insol_term = np.select([insol_diff < 0.2, insol_diff < 0.5, insol_diff > 2], [0.1, 0.05, -0.05], 0.0)
+        score += np.where(_present(insol), insol_term, 0.0)
+
+    # Limit to range 0-1
+    return np.clip(score, 0, 1)
+
+
+def _as_float(value: Optional[Any]) -> float:
+    # None is falsy in the scalar code, like zero
+    return 0.0 if value is None else float(value)
+
+
+def score_planet(planet_data: Dict[str, Any]) -> float:
+    """Score a single archive row (dict) with the vectorized scorer"""
+    columns = [np.array([_as_float(planet_data.get(column))]) for column in SCORE_COLUMNS]
+    return float(score_habitability(*columns)[0])
+
+
+# Score bands used by the dashboard habitability filter: (low, high, low inclusive, high inclusive)
+SCORE_BANDS = {
+    "high": (0.8, None, False, True),
+    "medium": (0.5, 0.8, True, True),
+    "low": (None, 0.5, True, False)
+}
+
+def score_band_mask(scores, band: str) -> np.ndarray:
+    """
+    Mask of scores that fall in a score band.
+
+    Raises:
+        ValueError: If the band is unknown
+    """
+    if band not in SCORE_BANDS:
+        raise ValueError(f"Unknown score band: {band}")
+    low, high, low_inclusive, high_inclusive = SCORE_BANDS[band]
+    scores = np.asarray(scores, dtype=np.float64)
+    mask = np.ones(scores.shape, dtype=bool)
+    if low is not None:
+        mask &= scores >= low if low_inclusive else scores > low
+    if high is not None:
+        mask &= scores <= high if high_inclusive else scores < high
+    return mask
+
+
+# Criteria of the potentially habitable exoplanets listing: decent score, Earth-like size and temperature
+HABITABLE_MIN_SCORE = 0.5
+HABITABLE_RADIUS = (0.5, 2.0)  # Earth radii
+HABITABLE_TEMPERATURE = (200, 320)  # K
+
+def habitable_mask(scores, radius, temperature) -> np.ndarray:
+    """Mask of planets meeting the habitable listing criteria; unknown radius or temperature never do"""
+    scores = np.asarray(scores, dtype=np.float64)
+    radius = np.asarray(radius, dtype=np.float64)
+    temperature = np.asarray(temperature, dtype=np.float64)
+    return (
+        (scores >= HABITABLE_MIN_SCORE)
+        & (radius >= HABITABLE_RADIUS[0]) & (radius <= HABITABLE_RADIUS[1])
+        & (temperature >= HABITABLE_TEMPERATURE[0]) & (temperature <= HABITABLE_TEMPERATURE[1])
+    )
+
+
+# Columns that support range queries, as (catalog column, multiplier)
+RANGE_COLUMNS = {
+    "radius": ("pl_rade", 1.0),
+    "temperature": ("pl_eqt", 1.0),
+    "distance": ("st_dist", 3.26)  # parsecs to light years
+}
+
+
+class HabitabilityIndex:
+    """
+    Habitability scores for a whole catalog snapshot, held in sorted order.
+
+    Built once per catalog version. Planets are ranked by descending score
+    (ties broken by ascending equilibrium temperature), and each range column
+    keeps its values sorted, so top-K, score-band and range queries are binary
+    searches plus work proportional to the smallest matching slice.
+    """
+
+    def __init__(self, catalog, scores: Optional[np.ndarray] = None):
+        self.catalog = catalog
+        self.version = catalog.version
+        if scores is None:
+            scores = score_habitability(*(missing_as_absent(catalog.column(column)) for column in SCORE_COLUMNS))
+        self.scores = scores
+
+        # Rank order: score descending, then temperature ascending, then catalog order
+        self.by_score = np.lexsort((np.arange(len(catalog)), catalog.column("pl_eqt"), -self.scores))
+        self.rank = np.empty_like(self.by_score)
+        self.rank[self.by_score] = np.arange(len(self.by_score))
+        self._negated_scores = -self.scores[self.by_score]
+
+        # Sorted values per range column; NaNs sort to the end and are dropped
+        self._range_values = {}
+        self._range_rows = {}
+        self._range_sorted = {}
+        for name, (column, multiplier) in RANGE_COLUMNS.items():
+            values = catalog.column(column) * multiplier
+            order = np.argsort(values, kind="stable")[:int(np.count_nonzero(~np.isnan(values)))]
+            self._range_values[name] = values
+            self._range_rows[name] = order
+            self._range_sorted[name] = values[order]
+
+        logger.debug(f"Built habitability index for catalog {self.version} ({len(catalog)} planets)")
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def updated(self, catalog, changed_rows: np.ndarray) -> "HabitabilityIndex":
+        """
+        Index for a catalog merged from this index's catalog (see ``ExoplanetCatalog.merge``).
+
+        Only ``changed_rows`` are re-scored; every other score is reused. The
+        rank and range orders are rebuilt from the scores, which is a sort in
+        numpy rather than a pass through the scorer.
+        """
+        scores = np.empty(len(catalog), dtype=np.float64)
+        scores[:len(self.scores)] = self.scores
+        if len(changed_rows):
+            scores[changed_rows] = score_habitability(
+                *(missing_as_absent(catalog.column(column)[changed_rows]) for column in SCORE_COLUMNS)
+            )
+        logger.debug(f"Re-scored {len(changed_rows)} of {len(catalog)} planets for catalog {catalog.version}")
+        return HabitabilityIndex(catalog, scores=scores)
+
+    def _score_slice(self, low: Optional[float], high: Optional[float],
+                     low_inclusive: bool = True, high_inclusive: bool = True) -> slice:
+        """Slice of rank positions whose score lies within the given bounds"""
+        start, stop = 0, len(self._negated_scores)
+        if high is not None:
+            start = int(np.searchsorted(self._negated_scores, -high, side="left" if high_inclusive else "right"))
+        if low is not None:
+            stop = int(np.searchsorted(self._negated_scores, -low, side="right" if low_inclusive else "left"))
+        return slice(start, max(start, stop))
+
+    def _range_slice(self, name: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """Catalog rows whose value for a range column lies within [low, high]"""
+        sorted_values = self._range_sorted[name]
+        start = 0 if low is None else int(np.searchsorted(sorted_values, low, side="left"))
+        stop = len(sorted_values) if high is None else int(np.searchsorted(sorted_values, high, side="right"))
+        return self._range_rows[name][start:max(start, stop)]
+
+    def query(
+        self,
+        band: Optional[str] = None,
+        min_score: Optional[float] = None,
+        radius: Optional[Tuple[Optional[float], Optional[float]]] = None,
+        temperature: Optional[Tuple[Optional[float], Optional[float]]] = None,
+        distance: Optional[Tuple[Optional[float], Optional[float]]] = None
+    ) -> np.ndarray:
+        """
+        Return catalog row indices matching all filters, ordered by rank.
+
+        Args:
+            band: Score band ("high", "medium" or "low")
+            min_score: Minimum score, inclusive
+            radius: Inclusive (low, high) bounds in Earth radii; either side may be None
+            temperature: Inclusive (low, high) bounds in K
+            distance: Inclusive (low, high) bounds in light years
+
+        Raises:
+            ValueError: If the band is unknown
+        """
+        low, high, low_inclusive, high_inclusive = None, None, True, True
+        if band is not None:
+            if band not in SCORE_BANDS:
+                raise ValueError(f"Unknown score band: {band}")
+            low, high, low_inclusive, high_inclusive = SCORE_BANDS[band]
+        if min_score is not None and (low is None or min_score > low):
+            low, low_inclusive = min_score, True
+        score_slice = self._score_slice(low, high, low_inclusive, high_inclusive)
+
+        ranges = {
+            name: bounds for name, bounds in
+            (("radius", radius), ("temperature", temperature), ("distance", distance))
+            if bounds is not None and bounds != (None, None)
+        }
+        if not ranges:
+            return self.by_score[score_slice]
+
+        # Drive the query from the smallest candidate set, then filter by the rest
+        range_rows = {name: self._range_slice(name, *bounds) for name, bounds in ranges.items()}
+        driver = min(range_rows, key=lambda name: len(range_rows[name]))
+        if score_slice.stop - score_slice.start <= len(range_rows[driver]):
+            rows = self.by_score[score_slice]
+            remaining = list(ranges)
+        else:
+            rows = range_rows[driver]
+            rank = self.rank[rows]
+            rows = rows[(rank >= score_slice.start) & (rank < score_slice.stop)]
+            remaining = [name for name in ranges if name != driver]
+
+        for name in remaining:
+            low_bound, high_bound = ranges[name]
+            values = self._range_values[name][rows]
+            keep = ~np.isnan(values)
+            if low_bound is not None:
+                keep &= values >= low_bound
+            if high_bound is not None:
+                keep &= values <= high_bound
+            rows = rows[keep]
+
+        return rows[np.argsort(self.rank[rows], kind="stable")]
@@ -0,0 +1,248 @@
+import os
+import gc
+import sys
+import json
+import pickle
+import hashlib
+import logging
+import argparse
+import datetime
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from api.tree_inference import CompiledForest
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when the features, training data or hyperparameters change
+MODEL_VERSION = 1
+ARTIFACT_FORMAT = "astrosage-habitability-model"
+MODEL_ARTIFACT_PATH = os.getenv(
+    "HABITABILITY_MODEL_PATH", os.path.join("data", f"habitability_model_v{MODEL_VERSION}.pkl")
+)
+# Flattened trees used for serving; loading them does not import scikit-learn
+COMPILED_MODEL_PATH = os.getenv(
+    "HABITABILITY_COMPILED_MODEL_PATH", os.path.join("data", f"habitability_model_v{MODEL_VERSION}.npz")
+)
+
+# Training data based on known habitable zone characteristics
+# Features: [radius, temperature, distance]
+X_train = np.array([
+    [1.0, 288, 0],  # Earth-like
+    [1.2, 262, 500],  # Kepler-186f
+    [1.3, 278, 4.2],  # Proxima b
+    [1.1, 268, 101.5],  # TOI-700 d
+    [2.6, 265, 124],  # K2-18b
+    [0.92, 251, 39],  # TRAPPIST-1e
+    [3.0, 350, 200],  # Too hot
+    [0.3, 150, 1000],  # Too cold
+    [5.0, 280, 50],   # Too large
+])
+
+# Labels: 1 for potentially habitable, 0 for unlikely
+y_train = np.array([1, 1, 1, 1, 0, 1, 0, 0, 0])
+
+_model = None
+_compiled_model: Optional[CompiledForest] = None
+_model_lock = threading.Lock()
+
+
+def train_model():
+    """Fit the habitability RandomForest on the reference planets"""
+    from sklearn.ensemble import RandomForestClassifier
+
+    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    model.fit(X_train, y_train)
+    return model
+
+
+def save_model(model, path: str) -> Dict[str, Any]:
+    """
+    Write a model artifact: a one-line JSON header followed by the pickled model.
+
+    The header records the model version, the scikit-learn version it was
+    trained with and the SHA-256 of the payload, which ``load_model`` verifies.
+
+    Returns:
+        The artifact header
+    """
+    import sklearn
+
+    payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+    header = {
+        "format": ARTIFACT_FORMAT,
+        "model_version": MODEL_VERSION,
+        "sklearn_version": sklearn.__version__,
+        "sha256": hashlib.sha256(payload).hexdigest(),
+        "created_at": datetime.datetime.now().isoformat()
+    }
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return header
+
+
+def load_model(path: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Read and verify a model artifact written by ``save_model``.
+
+    Artifacts pickled by another scikit-learn version are refused, since
+    estimators are not guaranteed to unpickle correctly across versions.
+
+    Raises:
+        ValueError: If the artifact has the wrong format, model or scikit-learn version,
+            or its checksum does not match
+    """
+    import sklearn
+
+    with open(path, "rb") as f:
+        header = json.loads(f.readline().decode("utf-8"))
+        payload = f.read()
+
+    if header.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a habitability model artifact")
+    if header.get("model_version") != MODEL_VERSION:
+        raise ValueError(f"{path} holds model version {header.get('model_version')}, expected {MODEL_VERSION}")
+    if hashlib.sha256(payload).hexdigest() != header.get("sha256"):
+        raise ValueError(f"Checksum mismatch for model artifact {path}")
+    if header.get("sklearn_version") != sklearn.__version__:
+        raise ValueError(
+            f"{path} was trained with scikit-learn {header.get('sklearn_version')}, running {sklearn.__version__}"
+        )
+
+    return pickle.loads(payload), header
+
+
+def get_model():
+    """
+    Return the habitability model, loading the artifact on first use.
+
+    If no valid artifact exists (missing, corrupt, or from another model or
+    scikit-learn version) the model is trained in-process instead, so the API
+    keeps working before the offline train command has been run.
+    """
+    global _model
+    if _model is not None:
+        return _model
+
+    with _model_lock:
+        if _model is None:
+            try:
+                _model, header = load_model(MODEL_ARTIFACT_PATH)
+                logger.info(f"Loaded habitability model v{header['model_version']} from {MODEL_ARTIFACT_PATH}")
+            except (OSError, ValueError, EOFError, AttributeError, pickle.UnpicklingError) as e:
+                logger.warning(f"Habitability model artifact unavailable ({str(e)}), training in-process")
+                _model = train_model()
+    return _model
+
+
+def save_compiled_model(model, path: str) -> Dict[str, Any]:
+    """Flatten a fitted model's trees and write them as a checksummed .npz artifact"""
+    import sklearn
+
+    header = {
+        "format": ARTIFACT_FORMAT,
+        "model_version": MODEL_VERSION,
+        "sklearn_version": sklearn.__version__,
+        "created_at": datetime.datetime.now().isoformat()
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    CompiledForest.from_sklearn(model).save(tmp_path, header)
+    os.replace(tmp_path, path)
+    return header
+
+
+def load_compiled_model(path: str) -> Tuple[CompiledForest, Dict[str, Any]]:
+    """
+    Read and verify a compiled model artifact written by ``save_compiled_model``.
+
+    Raises:
+        ValueError: If the artifact has the wrong format or version, or its checksum does not match
+    """
+    forest, header = CompiledForest.load(path)
+    if header.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a habitability model artifact")
+    if header.get("model_version") != MODEL_VERSION:
+        raise ValueError(f"{path} holds model version {header.get('model_version')}, expected {MODEL_VERSION}")
+    return forest, header
+
+
+def get_inference_model() -> CompiledForest:
+    """
+    Return the compiled model used for serving, loading it on first use.
+
+    Falls back to compiling the scikit-learn model (see ``get_model``) when no
+    valid compiled artifact exists.
+    """
+    global _compiled_model
+    if _compiled_model is not None:
+        return _compiled_model
+
+    try:
+        forest, header = load_compiled_model(COMPILED_MODEL_PATH)
+        logger.info(f"Loaded compiled habitability model v{header['model_version']} from {COMPILED_MODEL_PATH}")
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Compiled habitability model unavailable ({str(e)}), compiling in-process")
+        forest = CompiledForest.from_sklearn(get_model())
+
+    with _model_lock:
+        if _compiled_model is None:
+            _compiled_model = forest
+    return _compiled_model
+
+
+def predict_habitability_proba(features) -> np.ndarray:
+    """
+    Probability of being habitable for many planets in one call.
+
+    Args:
+        features: Array-like of shape (n, 3) with [radius, temperature, distance] rows
+
+    Returns:
+        Array of n probabilities
+    """
+    features = np.asarray(features, dtype=np.float64).reshape(-1, 3)
+    if len(features) == 0:
+        return np.empty(0)
+    return get_inference_model().predict_proba(features)[:, 1]
+
+
+def preload_model() -> None:
+    """
+    Load the serving model now and move it out of the garbage collector's tracking.
+
+    Called from the gunicorn master (``on_starting`` in gunicorn.conf.py)
+    before workers fork, so they share the loaded model's pages copy-on-write.
+    """
+    get_inference_model()
+    gc.freeze()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the habitability model artifact")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    train_parser = subcommands.add_parser("train", help="Train the model and write the artifacts")
+    train_parser.add_argument("--output", default=MODEL_ARTIFACT_PATH, help="Artifact path")
+    train_parser.add_argument("--compiled-output", default=COMPILED_MODEL_PATH, help="Compiled artifact path")
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        model = train_model()
+        header = save_model(model, args.output)
+        logger.info(f"Wrote habitability model v{header['model_version']} to {args.output} (sha256 {header['sha256'][:12]})")
+        save_compiled_model(model, args.compiled_output)
+        logger.info(f"Wrote compiled habitability model to {args.compiled_output}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
@@ -0,0 +1,259 @@
+import os
+import re
+import hashlib
+import logging
+import datetime
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from api.cache import make_cache_key
+from api.response_encoding import CONTENT_CODINGS, compress, is_compressible, negotiate_coding
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Memory for remembered responses and their compressed variants
+RESPONSE_STORE_MAX_BYTES = int(os.getenv("RESPONSE_STORE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    HTTP caching policy of a route.
+
+    ``etag`` responses get a strong content ETag and are answered with 304
+    when the client already has them; streamed responses cannot be hashed
+    up front and only get ``Cache-Control``.
+    """
+    max_age: int = 0
+    stale_while_revalidate: int = 0
+    etag: bool = True
+    store: bool = True
+
+    @property
+    def cache_control(self) -> str:
+        if not self.store:
+            return "no-store"
+        directives = ["public", f"max-age={self.max_age}"]
+        if self.stale_while_revalidate:
+            directives.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        return ", ".join(directives)
+
+
+NO_STORE = CachePolicy(etag=False, store=False)
+
+# Policies by request path, first match wins. Catalog data changes at most once per sync,
+# and ETags let clients revalidate cheaply once max-age has passed
+CACHE_POLICIES: List[Tuple[Pattern[str], CachePolicy]] = [
+    (re.compile(r"/(events|metrics/[^/]+|exoplanets/predict)$"), NO_STORE),
+    (re.compile(r"/exoplanets/export$"), CachePolicy(max_age=3600, stale_while_revalidate=86400, etag=False)),
+    (re.compile(r"/(visualization|figure\.json|comparison\.png)$"), CachePolicy(max_age=3600, stale_while_revalidate=86400)),
+    (re.compile(r"/dashboard/stats$"), CachePolicy(max_age=60, stale_while_revalidate=600)),
+]
+DEFAULT_CACHE_POLICY = CachePolicy(max_age=300, stale_while_revalidate=3600)
+
+
+def cache_policy(path: str) -> CachePolicy:
+    """Caching policy of a request path"""
+    for pattern, policy in CACHE_POLICIES:
+        if pattern.search(path):
+            return policy
+    return DEFAULT_CACHE_POLICY
+
+
+def entity_tag(version: str, body: bytes) -> str:
+    """Strong ETag of a response body served from catalog ``version``"""
+    digest = hashlib.sha256(version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(body)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def coded_tag(etag: str, coding: Optional[str]) -> str:
+    """
+    ETag of a compressed representation.
+
+    Strong ETags must differ between content codings, so the coding is
+    appended inside the quotes, e.g. ``"abc-br"``.
+    """
+    return etag if coding is None else f'{etag[:-1]}-{coding}"'
+
+
+def _base_tag(candidate: str) -> str:
+    """Tag from an If-None-Match list without its weakness prefix and coding suffix"""
+    if candidate.startswith("W/"):
+        candidate = candidate[2:]
+    for coding in CONTENT_CODINGS:
+        if candidate.endswith(f'-{coding}"'):
+            return f'{candidate[:-len(coding) - 2]}"'
+    return candidate
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an ``If-None-Match`` header matches ``etag`` in any content coding.
+
+    Uses the weak comparison RFC 9110 prescribes for ``If-None-Match``, so a
+    proxy that weakened the tag (``W/"..."``) still gets a 304.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or _base_tag(etag) in [_base_tag(candidate) for candidate in candidates]
+
+
+@dataclass
+class CachedResponse:
+    """Status, headers and body of a response answered from ``ConditionalRequests``"""
+    status: int
+    headers: Dict[str, str]
+    body: bytes = b""
+
+
+class StoredResponse:
+    """A remembered response body, its ETag and the compressed variants sent so far"""
+
+    def __init__(self, etag: str, body: bytes, headers: Dict[str, str]):
+        self.etag = etag
+        self.body = body
+        self.headers = headers
+        self.variants: Dict[str, bytes] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(variant) for variant in self.variants.values())
+
+
+class ConditionalRequests:
+    """
+    Remembers the response served for each GET request on each catalog version.
+
+    A repeat request is answered before the route runs: with 304 when its
+    ``If-None-Match`` holds the ETag, otherwise with the stored body, so the
+    response is neither rebuilt nor serialized. Bodies are kept alongside
+    their compressed variants, so each is compressed once per coding. Memory
+    is bounded by ``max_bytes``, least recently used responses going first.
+
+    Keys include the date because some listings (recent discoveries) move
+    with it; the first request of a day rebuilds the response once.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_STORE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._responses: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.not_modified = 0
+        self.stored_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.compressions = 0
+        self.evictions = 0
+
+    @staticmethod
+    def request_key(version: str, path: str, query: str) -> str:
+        """Key of a GET request against a catalog version, independent of query parameter order"""
+        params = sorted(param for param in query.split("&") if param)
+        return make_cache_key("response", [version, datetime.date.today().isoformat(), path, params])
+
+    def cached(self, key: Optional[str], policy: CachePolicy, if_none_match: Optional[str],
+               accept_encoding: Optional[str]) -> Optional[CachedResponse]:
+        """The response to a request seen before on this catalog version, or None to run the route"""
+        if key is None:
+            return None
+        with self._lock:
+            stored = self._responses.get(key)
+            if stored is not None:
+                self._responses.move_to_end(key)
+        if stored is None:
+            return None
+
+        response = self._serve(key, stored, policy, if_none_match, accept_encoding)
+        if response.status == 304:
+            self.not_modified += 1
+        else:
+            self.stored_hits += 1
+        return response
+
+    def store(self, key: str, version: str, body: bytes, headers: Dict[str, str], policy: CachePolicy,
+              if_none_match: Optional[str], accept_encoding: Optional[str]) -> CachedResponse:
+        """
+        Remember a freshly built 200 response and encode it for the client.
+
+        Args:
+            key: ``request_key`` of the request
+            version: Catalog version the body was built from
+            body: Uncompressed body
+            headers: Content type and route headers (e.g. X-Total-Count) to send with the body
+
+        Returns:
+            The body in the negotiated coding, or a 304 if the client already has it
+        """
+        stored = StoredResponse(entity_tag(version, body), body, headers)
+        with self._lock:
+            previous = self._responses.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._responses[key] = stored
+            self._size += stored.size
+            self._evict()
+
+        response = self._serve(key, stored, policy, if_none_match, accept_encoding)
+        if response.status == 304:
+            self.revalidated += 1
+        else:
+            self.misses += 1
+        return response
+
+    def _serve(self, key: str, stored: StoredResponse, policy: CachePolicy, if_none_match: Optional[str],
+               accept_encoding: Optional[str]) -> CachedResponse:
+        compressible = is_compressible(stored.headers.get("Content-Type"), len(stored.body))
+        coding = negotiate_coding(accept_encoding) if compressible else None
+        headers = {"ETag": coded_tag(stored.etag, coding), "Cache-Control": policy.cache_control}
+        if compressible:
+            headers["Vary"] = "Accept-Encoding"
+        if etag_matches(if_none_match, stored.etag):
+            return CachedResponse(304, headers)
+
+        if coding is None:
+            return CachedResponse(200, {**stored.headers, **headers}, stored.body)
+        headers["Content-Encoding"] = coding
+        return CachedResponse(200, {**stored.headers, **headers}, self._variant(key, stored, coding))
+
+    def _variant(self, key: str, stored: StoredResponse, coding: str) -> bytes:
+        """Compressed body, compressing it on first use"""
+        variant = stored.variants.get(coding)
+        if variant is not None:
+            return variant
+        variant = compress(stored.body, coding)
+        self.compressions += 1
+        with self._lock:
+            if coding not in stored.variants:
+                stored.variants[coding] = variant
+                # The response may have been evicted or replaced meanwhile
+                if self._responses.get(key) is stored:
+                    self._size += len(variant)
+                    self._evict()
+        return variant
+
+    def _evict(self) -> None:
+        """Drop least recently used responses beyond ``max_bytes``; the caller holds the lock"""
+        while self._size > self.max_bytes and len(self._responses) > 1:
+            _, evicted = self._responses.popitem(last=False)
+            self._size -= evicted.size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Answers without running the route (304 or stored body), route runs and store size"""
+        return {
+            "size": len(self._responses),
+            "bytes": self._size,
+            "not_modified": self.not_modified,
+            "stored_hits": self.stored_hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "compressions": self.compressions,
+            "evictions": self.evictions
+        }
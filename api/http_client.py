@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import random
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from api.json_stream import aiter_json_array
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Transport defaults for upstream NASA services
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 60.0  # seconds
+PER_HOST_CONCURRENCY = 4
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # seconds, doubled on every attempt
+
+# Upstream statuses worth retrying
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class AsyncHTTPClient:
+    """
+    Shared asynchronous HTTP transport for the archive and TESS APIs.
+
+    Wraps a single pooled ``httpx.AsyncClient`` (keep-alive connections are
+    reused across requests), limits how many requests may be in flight to each
+    host, and retries transient failures with exponential backoff and jitter.
+    """
+
+    def __init__(
+        self,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        per_host_concurrency: int = PER_HOST_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+        retry_backoff: float = RETRY_BACKOFF,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.per_host_concurrency = per_host_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            ),
+            transport=transport
+        )
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_limits[host]
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """
+        Send a GET request, retrying connection errors, timeouts and retryable statuses.
+
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self._host_limit(url):
+                    response = await self._client.get(url, params=params)
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response
+                logger.warning(f"Retryable status {response.status_code} from {url}")
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Request to {url} failed: {str(e)}")
+
+            delay = self.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            attempt += 1
+            logger.debug(f"Retrying {url} in {delay:.2f}s (attempt {attempt} of {self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Send a GET request and decode the JSON body"""
+        response = await self.get(url, params=params)
+        return response.json()
+
+    async def iter_json_array(self, url: str, params: Optional[Dict[str, Any]] = None) -> AsyncIterator[Any]:
+        """
+        Send a GET request and yield the elements of the JSON array body as they download.
+
+        Failures before the first element are retried like ``get``; once
+        elements have been yielded the error is raised instead, so callers
+        never see a row twice.
+
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries
+            ValueError: If the body is not a complete JSON array
+        """
+        attempt = 0
+        yielded = False
+        while True:
+            try:
+                async with self._host_limit(url):
+                    async with self._client.stream("GET", url, params=params) as response:
+                        if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                            response.raise_for_status()
+                            async for element in aiter_json_array(response.aiter_text()):
+                                yielded = True
+                                yield element
+                            return
+                logger.warning(f"Retryable status {response.status_code} from {url}")
+            except httpx.TransportError as e:
+                if yielded or attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Request to {url} failed: {str(e)}")
+
+            delay = self.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            attempt += 1
+            logger.debug(f"Retrying {url} in {delay:.2f}s (attempt {attempt} of {self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        """Close all pooled connections"""
+        await self._client.aclose()
+
+
+_client: Optional[AsyncHTTPClient] = None
+
+
+def get_http_client() -> AsyncHTTPClient:
+    """Return the process-wide HTTP client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = AsyncHTTPClient()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the process-wide HTTP client; call from the application's shutdown hook"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
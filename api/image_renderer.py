@@ -0,0 +1,169 @@
+import io
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from api.cache import MemoryBackend
+from models.exoplanet import ExoplanetDetail
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when the rendered image changes so old cache entries are not reused
+RENDER_VERSION = 1
+
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(".cache", "images"))
+IMAGE_CACHE_MEMORY_ENTRIES = 256
+IMAGE_CACHE_DISK_ENTRIES = 5000
+
+
+def comparison_image_key(exoplanet: ExoplanetDetail) -> str:
+    """
+    Content address of an exoplanet's comparison image.
+
+    Derived only from the values drawn in the image, so it doubles as the ETag
+    and changes exactly when the image would.
+    """
+    payload = json.dumps({
+        "version": RENDER_VERSION,
+        "name": exoplanet.name,
+        "earth_radius": exoplanet.size_comparison["earth_radius"],
+        "earth_temperature": exoplanet.size_comparison["earth_temperature"],
+        "earth_distance": exoplanet.size_comparison["earth_distance"]
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def render_comparison_png(exoplanet: ExoplanetDetail) -> bytes:
+    """
+    Render the bar chart comparing an exoplanet to Earth as PNG bytes.
+
+    Uses the object-oriented Figure API with its own Agg canvas instead of
+    pyplot, so no global state is shared between concurrent renders.
+    """
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    # Bar chart comparing size, temperature, and distance to Earth
+    categories = ["Size (Earth Radii)", "Temperature (K)", "Distance (Light Years)"]
+    values = [
+        exoplanet.size_comparison["earth_radius"],
+        exoplanet.size_comparison["earth_temperature"],
+        exoplanet.size_comparison["earth_distance"]
+    ]
+
+    # Normalize values for better visualization
+    normalized_values = [
+        values[0],  # Earth radius (already a ratio)
+        values[1]/288,  # Temperature relative to Earth's average (288K)
+        min(1, 10/values[2])  # Distance (inversely related to habitability)
+    ]
+
+    # Earth comparison values (normalized)
+    earth_values = [1.0, 1.0, 1.0]
+
+    x = range(len(categories))
+    width = 0.35
+
+    ax.bar([i - width/2 for i in x], normalized_values, width, label=exoplanet.name)
+    ax.bar([i + width/2 for i in x], earth_values, width, label='Earth')
+
+    ax.set_ylabel('Normalized Value')
+    ax.set_title(f'Comparison of {exoplanet.name} to Earth')
+    ax.set_xticks(x)
+    ax.set_xticklabels(categories)
+    ax.legend()
+
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
+
+
+class ImageCache:
+    """
+    Two-tier cache for rendered PNGs keyed by content address.
+
+    Recently used images stay in a bounded in-memory LRU; every image is also
+    written to ``directory`` so other workers and restarts can reuse it. The
+    disk tier drops its oldest files once it holds more than ``disk_entries``.
+    """
+
+    def __init__(self, directory: str, memory_entries: int, disk_entries: int):
+        self.directory = directory
+        self.disk_entries = disk_entries
+        self.memory = MemoryBackend(max_entries=memory_entries)
+        self._lock = threading.Lock()
+        self._disk_count: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self.memory.get(key)
+        if entry is not None:
+            return entry[1]
+
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        with self._lock:
+            self.memory.set(key, 0.0, data, 0)
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self.memory.set(key, 0.0, data, 0)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except OSError as e:
+            logger.warning(f"Could not write image cache entry {key}: {str(e)}")
+
+    def _evict_disk(self) -> None:
+        with self._lock:
+            if self._disk_count is None:
+                self._disk_count = sum(1 for name in os.listdir(self.directory) if name.endswith(".png"))
+            else:
+                self._disk_count += 1
+            if self._disk_count <= self.disk_entries:
+                return
+
+            # Drop the oldest tenth in one pass rather than one file per write
+            paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".png")]
+            paths.sort(key=_mtime)
+            excess = len(paths) - self.disk_entries + self.disk_entries // 10
+            for path in paths[:max(excess, 0)]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._disk_count = len(paths) - max(excess, 0)
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+image_cache = ImageCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MEMORY_ENTRIES, IMAGE_CACHE_DISK_ENTRIES)
+
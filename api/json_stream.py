@@ -0,0 +1,106 @@
+import json
+import logging
+from typing import Any, AsyncIterable, AsyncIterator, Iterator, List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\n\r"
+
+# Characters a JSON number starts with and may continue with
+_NUMBER_START = "-0123456789"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+class JSONArrayDecoder:
+    """
+    Incremental decoder for a top-level JSON array, such as a TAP ``format=json`` response.
+
+    Text is fed in arbitrary chunks and complete elements are returned as soon
+    as they have arrived, so a large response is parsed while it downloads and
+    never held in memory as one string.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+        self._after_element = False
+
+    def _skip(self, pos: int) -> int:
+        while pos < len(self._buffer) and self._buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Add the next chunk of text and return the elements it completed.
+
+        Raises:
+            ValueError: If the text is not a JSON array
+        """
+        self._buffer += chunk
+        elements = []
+        pos = self._skip(0)
+
+        if not self._started and pos < len(self._buffer):
+            if self._buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            self._started = True
+            pos = self._skip(pos + 1)
+
+        while self._started and not self._finished and pos < len(self._buffer):
+            char = self._buffer[pos]
+            if char == "]":
+                self._finished = True
+                pos += 1
+                break
+            if self._after_element:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+                self._after_element = False
+                pos = self._skip(pos + 1)
+                continue
+            try:
+                element, end = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                break  # Element continues in the next chunk
+            if char in _NUMBER_START and all(c in _NUMBER_CHARS for c in self._buffer[end:]):
+                # The number may continue in the next chunk ("-0." + "5", "1.5e" + "3"), so only
+                # take it once a delimiter has arrived
+                break
+            elements.append(element)
+            self._after_element = True
+            pos = self._skip(end)
+
+        # Drop consumed text once per chunk rather than once per element
+        self._buffer = self._buffer[pos:]
+        return elements
+
+    def close(self) -> None:
+        """
+        Check that the whole array was received.
+
+        Raises:
+            ValueError: If the text ended before the closing bracket
+        """
+        if not self._finished:
+            raise ValueError("Truncated JSON array")
+
+
+def iter_json_array(chunks: Iterator[str]) -> Iterator[Any]:
+    """Elements of a JSON array split across text chunks"""
+    decoder = JSONArrayDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    decoder.close()
+
+
+async def aiter_json_array(chunks: AsyncIterable[str]) -> AsyncIterator[Any]:
+    """Elements of a JSON array split across text chunks from an async stream"""
+    decoder = JSONArrayDecoder()
+    async for chunk in chunks:
+        for element in decoder.feed(chunk):
+            yield element
+    decoder.close()
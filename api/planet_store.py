@@ -0,0 +1,180 @@
+import json
+import hashlib
+import datetime
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.aggregates import DiscoveryStats
+from api.discovery_index import DiscoveryIndex
+from api.habitability import habitable_mask, score_band_mask
+from api.search import NameIndex, compact_name
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SizeComparison:
+    """Planet characteristics relative to Earth"""
+    earth_radius: float
+    earth_temperature: float
+    earth_distance: float
+
+
+@dataclass(frozen=True)
+class PlanetRecord:
+    """One planet of the Flask app's dataset"""
+    name: str
+    size_comparison: SizeComparison
+    discovery_method: str
+    orbital_period: str
+    distance: float  # in light years
+    habitability_score: float
+    eq_temperature: float
+    discovery_year: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy, safe for callers to extend"""
+        return asdict(self)
+
+    def summary(self) -> Dict[str, Any]:
+        """Fields returned by the habitable exoplanets listing"""
+        return {
+            "name": self.name,
+            "habitability_score": self.habitability_score,
+            "distance": self.distance,
+            "earth_radius": self.size_comparison.earth_radius,
+            "eq_temperature": self.eq_temperature,
+            "discovery_method": self.discovery_method
+        }
+
+
+@dataclass(frozen=True)
+class DiscoveryRecord:
+    """A recent exoplanet discovery"""
+    name: str
+    discovery_date: str
+    discovery_method: str
+
+
+class PlanetStore:
+    """
+    Immutable planet dataset loaded once at startup.
+
+    Records are frozen dataclasses behind a name index (case, spacing and
+    alias tolerant), and the habitable listing and dashboard statistics are
+    precomputed, so routes never rebuild the dataset. ``version`` identifies
+    the dataset contents, e.g. for pagination cursors.
+    """
+
+    def __init__(self, planets: Tuple[PlanetRecord, ...], discoveries: Tuple[DiscoveryRecord, ...],
+                 version: str = ""):
+        self.planets = planets
+        self.discoveries = discoveries
+        self.version = version
+        self._ranked = tuple(sorted(planets, key=lambda p: p.habitability_score, reverse=True))
+        self.habitable = tuple(planet.summary() for planet in self._ranked)
+
+        # Name index and columns of the habitable listing for lookup, filtering and sorting
+        self._names = NameIndex([planet.name for planet in self._ranked])
+        self._scores = np.array([planet["habitability_score"] for planet in self.habitable])
+        self._distances = np.array([planet["distance"] for planet in self.habitable], dtype=np.float64)
+        self._methods = np.array([planet["discovery_method"] for planet in self.habitable])
+
+        # Dashboard statistics, counting as habitable the planets that meet the listing criteria
+        self.stats = DiscoveryStats.from_columns(
+            methods=[planet.discovery_method for planet in planets],
+            years=[planet.discovery_year for planet in planets],
+            habitable=habitable_mask(
+                [planet.habitability_score for planet in planets],
+                [planet.size_comparison.earth_radius for planet in planets],
+                [planet.eq_temperature for planet in planets]
+            ),
+            version=version
+        )
+
+        # Recent discoveries by date, for timeline windows
+        self._discovery_index = DiscoveryIndex.from_dates([discovery.discovery_date for discovery in discoveries])
+
+    def __len__(self) -> int:
+        return len(self.planets)
+
+    def discovered(self, since: Optional[datetime.date] = None,
+                   until: Optional[datetime.date] = None) -> List[DiscoveryRecord]:
+        """Recent discoveries dated within ``[since, until]``, newest first"""
+        positions = self._discovery_index.window(since, until)
+        return [self.discoveries[row] for row in self._discovery_index.rows[positions]]
+
+    def get(self, name: str) -> Optional[PlanetRecord]:
+        """Look up a planet by name or alias, ignoring case, spacing and hyphens"""
+        row = self._names.resolve(name)
+        return None if row is None else self._ranked[row]
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        """Planet names completing or resembling ``query``, best first"""
+        return [self._ranked[row].name for row in self._names.suggest(query, limit)]
+
+    def query_habitable(self, q: Optional[str] = None, method: Optional[str] = None,
+                        score_band: Optional[str] = None, sort: str = "score") -> Tuple[Dict[str, Any], ...]:
+        """
+        Filter and sort the habitable listing.
+
+        Args:
+            q: Substring of the planet name, case-insensitive
+            method: Exact discovery method
+            score_band: Score band ("high", "medium" or "low")
+            sort: One of ``api.search.LISTING_SORTS``
+
+        Raises:
+            ValueError: If the band or sort order is unknown
+        """
+        rows = self._names.search(q) if q else np.arange(len(self.habitable))
+        if method:
+            rows = rows[self._methods[rows] == method]
+        if score_band:
+            rows = rows[score_band_mask(self._scores[rows], score_band)]
+
+        descending = sort.startswith("-")
+        key = sort.lstrip("-")
+        if key == "score":
+            rows = rows[::-1] if descending else rows
+        elif key == "name":
+            rows = rows[np.argsort(self._names.name_rank[rows], kind="stable")]
+            rows = rows[::-1] if descending else rows
+        elif key == "distance":
+            # Negate rather than reverse so unknown distances stay last
+            distances = self._distances[rows]
+            rows = rows[np.argsort(-distances if descending else distances, kind="stable")]
+        else:
+            raise ValueError(f"Unknown sort order: {sort}")
+
+        return tuple(self.habitable[row] for row in rows)
+
+
+def _planet_from_dict(data: Dict[str, Any]) -> PlanetRecord:
+    return PlanetRecord(**{**data, "size_comparison": SizeComparison(**data["size_comparison"])})
+
+
+def load_planet_store(path: str) -> PlanetStore:
+    """
+    Load the planet dataset from a JSON file.
+
+    Raises:
+        ValueError: If two planets share a name, ignoring case, spacing and punctuation
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+
+    planets = tuple(_planet_from_dict(planet) for planet in data["planets"])
+    names = [compact_name(planet.name) for planet in planets]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate planet names in {path}")
+
+    discoveries = tuple(DiscoveryRecord(**discovery) for discovery in data["recent_discoveries"])
+
+    logger.debug(f"Loaded {len(planets)} planets from {path}")
+    return PlanetStore(planets, discoveries, version=hashlib.sha256(raw).hexdigest()[:16])
@@ -0,0 +1,214 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rendering defaults; the queue bounds jobs waiting for a free worker
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+RENDER_QUEUE_DEPTH = int(os.getenv("RENDER_QUEUE_DEPTH", "16"))
+RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", "30"))  # seconds
+RENDER_RETRY_AFTER = 5  # seconds suggested to clients when the pool is saturated
+
+# Upper bounds (seconds) of the render and queue wait histograms
+LATENCY_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+
+class RenderPoolSaturated(Exception):
+    """Raised when every worker is busy and the queue is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Render pool saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class RenderTimeout(Exception):
+    """Raised when a render job does not finish within its timeout"""
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed bucket bounds, as exported by Prometheus"""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "buckets": {str(bound): count for bound, count in zip(self.buckets, self.counts)}
+        }
+
+
+def _timed_call(fn: Callable, args: Tuple) -> Tuple[float, float, Any]:
+    """Run a job in a worker, returning wall-clock start and end times with its result"""
+    started = time.time()
+    result = fn(*args)
+    return started, time.time(), result
+
+
+class RenderPool:
+    """
+    Process pool that runs CPU-bound figure rendering off the event loop.
+
+    At most ``max_workers + max_queue`` jobs are accepted at once; further
+    submissions fail fast with ``RenderPoolSaturated`` instead of queueing
+    without bound. A job that exceeds its timeout is abandoned by the caller
+    with ``RenderTimeout``, but it keeps its slot until the worker finishes it,
+    so timed-out work still counts against capacity.
+
+    Queue wait (submission until a worker picks the job up) and render time
+    are recorded per job and reported by ``stats``.
+    """
+
+    def __init__(self, max_workers: int = RENDER_WORKERS, max_queue: int = RENDER_QUEUE_DEPTH,
+                 timeout: float = RENDER_TIMEOUT, retry_after: int = RENDER_RETRY_AFTER):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.render_time = LatencyHistogram(LATENCY_BUCKETS)
+        self.queue_wait = LatencyHistogram(LATENCY_BUCKETS)
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers do not inherit the server's threads, locks or sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _job_done(self, submitted: float, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed += 1
+                return
+            started, finished, _ = future.result()
+            self.queue_wait.observe(max(started - submitted, 0.0))
+            self.render_time.observe(finished - started)
+            self.completed += 1
+
+    async def submit(self, fn: Callable, *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run ``fn(*args)`` in a worker process and return its result.
+
+        ``fn`` and its arguments must be picklable, i.e. a module-level function
+        called with plain data or pydantic models.
+
+        Raises:
+            RenderPoolSaturated: If all workers are busy and the queue is full
+            RenderTimeout: If the job does not finish within the timeout
+            BrokenProcessPool: If a worker died; the pool is replaced for the next job
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise RenderPoolSaturated(self.retry_after)
+            self._pending += 1
+
+        submitted = time.time()
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_timed_call, fn, args)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next job
+            logger.error("Render pool is broken, restarting it")
+            self._reset_executor(executor)
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(lambda f: self._job_done(submitted, f))
+
+        try:
+            _, _, result = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout if timeout is not None else self.timeout
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            logger.warning(f"Render job {getattr(fn, '__name__', fn)} timed out")
+            raise RenderTimeout(f"Render job did not finish within {timeout or self.timeout}s")
+        except BrokenProcessPool:
+            # A worker died mid-job; every queued job fails with it, so replace the pool
+            logger.error("Render pool broke while running a job, restarting it")
+            self._reset_executor(executor)
+            raise
+        return result
+
+    def _reset_executor(self, broken: ProcessPoolExecutor) -> None:
+        # Concurrent jobs of the same pool all fail; only the first replaces it
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Render pool metrics: capacity, job counters and latency histograms"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self.max_queue,
+                "pending": self._pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "render_seconds": self.render_time.stats(),
+                "queue_wait_seconds": self.queue_wait.stats()
+            }
+
+    def shutdown(self) -> None:
+        """Stop the workers, dropping queued jobs"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool: Optional[RenderPool] = None
+
+
+def get_render_pool() -> RenderPool:
+    """Return the process-wide render pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        _pool = RenderPool()
+    return _pool
+
+
+def close_render_pool() -> None:
+    """Shut down the process-wide render pool; call from the application's shutdown hook"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
@@ -0,0 +1,149 @@
+import os
+import gzip
+import json
+import math
+import logging
+import importlib
+import importlib.util
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are sent uncompressed; the codec headers would outweigh the savings
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# Supported content codings in server preference order, with the module each needs.
+# Brotli compresses JSON best; zstd is close and faster; gzip is understood everywhere
+CONTENT_CODINGS = {
+    "br": "brotli",
+    "zstd": "zstandard",
+    "gzip": "gzip"
+}
+
+# Compression levels; compressed bodies of cacheable routes are kept, so most are compressed once
+COMPRESSION_LEVELS = {
+    "br": 6,
+    "zstd": 9,
+    "gzip": 6
+}
+
+# Media types worth compressing (images and Parquet are compressed already)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+_available_codings: Optional[List[str]] = None
+_json: Any = None
+
+
+def available_codings() -> List[str]:
+    """Content codings whose compressor is installed, in preference order"""
+    global _available_codings
+    if _available_codings is None:
+        _available_codings = [
+            coding for coding, module in CONTENT_CODINGS.items() if importlib.util.find_spec(module) is not None
+        ]
+    return _available_codings
+
+
+def negotiate_coding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content coding for an ``Accept-Encoding`` header, or None for identity.
+
+    Codings the client weights higher win; ties go to the server preference
+    order. ``*`` stands for every coding not listed, and ``q=0`` refuses one.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for coding in available_codings():
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def is_compressible(media_type: Optional[str], size: int) -> bool:
+    """Whether a body of this media type and size should be compressed"""
+    return bool(media_type) and media_type.startswith(COMPRESSIBLE_TYPES) and size >= COMPRESSION_MIN_BYTES
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    """
+    Compress a body with one of ``available_codings()``.
+
+    Raises:
+        ValueError: If the coding is unknown
+    """
+    if coding == "gzip":
+        # Fixed mtime so the same body always compresses to the same bytes
+        return gzip.compress(body, compresslevel=COMPRESSION_LEVELS["gzip"], mtime=0)
+    if coding == "br":
+        brotli = importlib.import_module("brotli")
+        return brotli.compress(body, quality=COMPRESSION_LEVELS["br"])
+    if coding == "zstd":
+        zstandard = importlib.import_module("zstandard")
+        return zstandard.ZstdCompressor(level=COMPRESSION_LEVELS["zstd"]).compress(body)
+    raise ValueError(f"Unknown content coding: {coding}")
+
+
+def _json_module():
+    """orjson if it is installed, else the standard library json module"""
+    global _json
+    if _json is None:
+        _json = importlib.import_module("orjson") if importlib.util.find_spec("orjson") is not None else json
+    return _json
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "tolist"):  # numpy arrays and scalars
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _replace_non_finite(value: Any) -> Any:
+    """Copy of a JSON value with NaN and infinities replaced by None, which orjson encodes as null"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_non_finite(item) for item in value]
+    return value
+
+
+def dumps(value: Any, default: Callable[[Any], Any] = _json_default) -> bytes:
+    """
+    Compact UTF-8 JSON, with orjson when it is installed.
+
+    orjson is several times faster than the standard library on the large
+    lists of listing, figure and export responses. Both encode NaN and
+    infinities as null, so the output is valid JSON either way.
+
+    Args:
+        value: Value to encode; numpy arrays and scalars are supported
+        default: Conversion of other unsupported objects, raising TypeError if none applies
+    """
+    encoder = _json_module()
+    if encoder is json:
+        try:
+            text = json.dumps(value, separators=(",", ":"), ensure_ascii=False, allow_nan=False, default=default)
+        except ValueError:
+            # Only values with NaN or infinities pay for the copy
+            text = json.dumps(
+                _replace_non_finite(value), separators=(",", ":"), ensure_ascii=False, allow_nan=False,
+                default=lambda item: _replace_non_finite(default(item))
+            )
+        return text.encode("utf-8")
+    return encoder.dumps(value, default=default, option=encoder.OPT_SERIALIZE_NUMPY | encoder.OPT_NON_STR_KEYS)
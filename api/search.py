@@ -0,0 +1,301 @@
+import re
+import json
+import base64
+import bisect
+import logging
+import unicodedata
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Length of the n-grams indexed for substring search; shorter queries scan all names
+NGRAM_SIZE = 3
+
+# Sort orders accepted by listing endpoints; a leading "-" reverses the order
+LISTING_SORTS = ["score", "-score", "name", "-name", "distance", "-distance"]
+
+# Minimum trigram (Jaccard) similarity of a typo-tolerant suggestion
+SUGGESTION_MIN_SIMILARITY = 0.3
+
+# IAU constellation abbreviations and the genitive forms used in star names
+CONSTELLATIONS = {
+    "and": "Andromedae", "ant": "Antliae", "aps": "Apodis", "aqr": "Aquarii", "aql": "Aquilae",
+    "ara": "Arae", "ari": "Arietis", "aur": "Aurigae", "boo": "Bootis", "cae": "Caeli",
+    "cam": "Camelopardalis", "cnc": "Cancri", "cvn": "Canum Venaticorum", "cma": "Canis Majoris",
+    "cmi": "Canis Minoris", "cap": "Capricorni", "car": "Carinae", "cas": "Cassiopeiae", "cen": "Centauri",
+    "cep": "Cephei", "cet": "Ceti", "cha": "Chamaeleontis", "cir": "Circini", "col": "Columbae",
+    "com": "Comae Berenices", "cra": "Coronae Australis", "crb": "Coronae Borealis", "crv": "Corvi",
+    "crt": "Crateris", "cru": "Crucis", "cyg": "Cygni", "del": "Delphini", "dor": "Doradus",
+    "dra": "Draconis", "equ": "Equulei", "eri": "Eridani", "for": "Fornacis", "gem": "Geminorum",
+    "gru": "Gruis", "her": "Herculis", "hor": "Horologii", "hya": "Hydrae", "hyi": "Hydri",
+    "ind": "Indi", "lac": "Lacertae", "leo": "Leonis", "lmi": "Leonis Minoris", "lep": "Leporis",
+    "lib": "Librae", "lup": "Lupi", "lyn": "Lyncis", "lyr": "Lyrae", "men": "Mensae",
+    "mic": "Microscopii", "mon": "Monocerotis", "mus": "Muscae", "nor": "Normae", "oct": "Octantis",
+    "oph": "Ophiuchi", "ori": "Orionis", "pav": "Pavonis", "peg": "Pegasi", "per": "Persei",
+    "phe": "Phoenicis", "pic": "Pictoris", "psc": "Piscium", "psa": "Piscis Austrini", "pup": "Puppis",
+    "pyx": "Pyxidis", "ret": "Reticuli", "sge": "Sagittae", "sgr": "Sagittarii", "sco": "Scorpii",
+    "scl": "Sculptoris", "sct": "Scuti", "ser": "Serpentis", "sex": "Sextantis", "tau": "Tauri",
+    "tel": "Telescopii", "tri": "Trianguli", "tra": "Trianguli Australis", "tuc": "Tucanae",
+    "uma": "Ursae Majoris", "umi": "Ursae Minoris", "vel": "Velorum", "vir": "Virginis",
+    "vol": "Volantis", "vul": "Vulpeculae"
+}
+# Genitive forms keyed by their first word, e.g. "canum" -> [(["canum", "venaticorum"], "cvn")]
+CONSTELLATION_GENITIVES: Dict[str, List] = {}
+for _abbreviation, _genitive in CONSTELLATIONS.items():
+    _words = _genitive.casefold().split()
+    CONSTELLATION_GENITIVES.setdefault(_words[0], []).append((_words, _abbreviation))
+
+# Catalog prefixes with more than one common spelling
+CATALOG_PREFIX_ALIASES = {"gj": "Gliese", "gliese": "GJ"}
+
+
+def normalize_name(name: str) -> str:
+    """Lookup key for a planet name: case-insensitive and trimmed"""
+    return name.strip().casefold()
+
+
+def compact_name(name: str) -> str:
+    """
+    Matching key for a planet name: case-folded letters and digits only.
+
+    Ignores case, accents, whitespace, hyphens and punctuation, so "trappist 1e",
+    "TRAPPIST-1e" and "Trappist1E" share a key.
+    """
+    name = unicodedata.normalize("NFKD", name).casefold()
+    return "".join(ch for ch in name if ch.isalnum())
+
+
+def name_aliases(name: str) -> List[str]:
+    """
+    Alternative spellings of a planet name, as compact keys.
+
+    Spells constellations both abbreviated and in full, drops them entirely
+    ("Proxima Cen b" is also "Proxima Centauri b" and "Proxima b"), and swaps
+    catalog prefixes such as GJ and Gliese.
+    """
+    tokens = [token for token in re.split(r"[\s_]+", name.strip()) if token]
+    variants = []
+
+    if tokens and tokens[0].casefold() in CATALOG_PREFIX_ALIASES:
+        variants.append([CATALOG_PREFIX_ALIASES[tokens[0].casefold()]] + tokens[1:])
+
+    # Constellations never start a name (e.g. "Tau Ceti"), so skip the first token
+    for i in range(1, len(tokens) - 1):
+        token = tokens[i].casefold()
+        if token in CONSTELLATIONS:
+            variants.append(tokens[:i] + [CONSTELLATIONS[token]] + tokens[i + 1:])
+            variants.append(tokens[:i] + tokens[i + 1:])
+        for words, abbreviation in CONSTELLATION_GENITIVES.get(token, []):
+            if [t.casefold() for t in tokens[i:i + len(words)]] == words and i + len(words) < len(tokens):
+                variants.append(tokens[:i] + [abbreviation] + tokens[i + len(words):])
+                variants.append(tokens[:i] + tokens[i + len(words):])
+
+    aliases = []
+    for variant in variants:
+        key = compact_name(" ".join(variant))
+        if key and key not in aliases:
+            aliases.append(key)
+    return aliases
+
+
+def _trigrams(key: str) -> set:
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Lookup, prefix, substring and typo-tolerant index over planet names.
+
+    Names are normalized with ``normalize_name`` (case-insensitive, trimmed).
+    Prefix queries are binary searches over the sorted names; substring
+    queries intersect the posting lists of the query's trigrams and verify the
+    few remaining candidates. Results are row positions in the order the names
+    were given. ``version`` records which data the index was built from.
+
+    ``resolve`` and ``suggest`` match on ``compact_name`` keys of every name
+    and its aliases (see ``name_aliases``), so spacing, hyphens and alternate
+    designations do not matter, and fall back to trigram similarity for typos.
+    An alias shared by several planets (``ambiguous_aliases``) never resolves
+    but suggests all of them.
+    """
+
+    def __init__(self, names: Sequence[str], version: str = ""):
+        self.version = version
+        self.keys = [normalize_name(name) for name in names]
+
+        order = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+        self._sorted_keys = [self.keys[row] for row in order]
+        self._sorted_rows = np.array(order, dtype=np.intp)
+        # Position of every row in name order, for sorting result sets by name
+        self.name_rank = np.empty(len(order), dtype=np.intp)
+        self.name_rank[self._sorted_rows] = np.arange(len(order))
+
+        postings: Dict[str, List[int]] = {}
+        for row, key in enumerate(self.keys):
+            for gram in {key[i:i + NGRAM_SIZE] for i in range(len(key) - NGRAM_SIZE + 1)}:
+                postings.setdefault(gram, []).append(row)
+        self._postings = {gram: np.array(rows, dtype=np.intp) for gram, rows in postings.items()}
+
+        # Compact keys of names and aliases; a name's own key wins over another planet's alias
+        entries: Dict[str, int] = {}
+        for row, name in enumerate(names):
+            entries.setdefault(compact_name(name), row)
+        alias_rows: Dict[str, List[int]] = {}
+        for row, name in enumerate(names):
+            for alias in name_aliases(name):
+                if alias not in entries:
+                    alias_rows.setdefault(alias, []).append(row)
+        # Aliases shared by several planets (e.g. "14b" for "14 Her b" and "14 And b") are
+        # ambiguous: they never resolve, but still suggest every planet they stand for
+        self.ambiguous_aliases = {alias: rows for alias, rows in alias_rows.items() if len(rows) > 1}
+        self._entry_rows = dict(entries)
+        self._entry_rows.update(
+            (alias, rows[0]) for alias, rows in alias_rows.items() if alias not in self.ambiguous_aliases
+        )
+
+        candidates = sorted(
+            list(entries.items()) + [(alias, row) for alias, rows in alias_rows.items() for row in rows]
+        )
+        self._entry_keys = [key for key, _ in candidates]
+        self._entry_sorted_rows = np.array([row for _, row in candidates], dtype=np.intp)
+
+        fuzzy_postings: Dict[str, List[int]] = {}
+        for position, key in enumerate(self._entry_keys):
+            for gram in _trigrams(key):
+                fuzzy_postings.setdefault(gram, []).append(position)
+        self._fuzzy_postings = {gram: np.array(rows, dtype=np.intp) for gram, rows in fuzzy_postings.items()}
+        self._entry_gram_counts = np.array([len(_trigrams(key)) for key in self._entry_keys], dtype=np.float64)
+
+        logger.debug(
+            f"Built name index over {len(self.keys)} names "
+            f"({len(self._entry_keys)} keys with aliases, {len(self.ambiguous_aliases)} ambiguous, "
+            f"{len(self._postings)} trigrams)"
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def prefix(self, prefix: str) -> np.ndarray:
+        """Rows whose normalized name starts with ``prefix``, in ascending row order"""
+        prefix = normalize_name(prefix)
+        start = bisect.bisect_left(self._sorted_keys, prefix)
+        stop = bisect.bisect_left(self._sorted_keys, prefix + "\U0010ffff")
+        return np.sort(self._sorted_rows[start:stop])
+
+    def search(self, query: str) -> np.ndarray:
+        """Rows whose normalized name contains ``query``, in ascending row order"""
+        query = normalize_name(query)
+        if not query:
+            return np.arange(len(self.keys), dtype=np.intp)
+
+        if len(query) < NGRAM_SIZE:
+            candidates = range(len(self.keys))
+        else:
+            grams = {query[i:i + NGRAM_SIZE] for i in range(len(query) - NGRAM_SIZE + 1)}
+            lists = sorted((self._postings.get(gram, np.empty(0, dtype=np.intp)) for gram in grams), key=len)
+            candidates = lists[0]
+            for rows in lists[1:]:
+                if len(candidates) == 0:
+                    break
+                candidates = np.intersect1d(candidates, rows, assume_unique=True)
+
+        # Trigram hits only guarantee the grams occur somewhere; confirm the substring
+        return np.array([row for row in candidates if query in self.keys[row]], dtype=np.intp)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """
+        Row of the planet a name refers to, or None.
+
+        Matches the compact key of the name, then of its aliases, so
+        "proxima-b", "Proxima Cen b" and "PROXIMA B" resolve to the same planet.
+        Aliases of more than one planet match none of them.
+        """
+        for key in [compact_name(name)] + name_aliases(name):
+            row = self._entry_rows.get(key)
+            if row is not None:
+                return row
+        return None
+
+    def similar(self, name: str, limit: int = 10) -> List[int]:
+        """Rows of the names most similar to ``name`` by trigram overlap, best first"""
+        key = compact_name(name)
+        if not key:
+            return []
+        grams = _trigrams(key)
+        lists = [self._fuzzy_postings[gram] for gram in grams if gram in self._fuzzy_postings]
+        if not lists:
+            return []
+
+        shared = np.bincount(np.concatenate(lists), minlength=len(self._entry_keys))
+        positions = np.flatnonzero(shared)
+        similarity = shared[positions] / (len(grams) + self._entry_gram_counts[positions] - shared[positions])
+        keep = similarity >= SUGGESTION_MIN_SIMILARITY
+        positions, similarity = positions[keep], similarity[keep]
+        ranked = positions[np.argsort(-similarity, kind="stable")]
+        return _unique(self._entry_sorted_rows[ranked], limit)
+
+    def suggest(self, query: str, limit: int = 10) -> List[int]:
+        """
+        Autocomplete rows for a partial or misspelled name, best first.
+
+        An exact match (including aliases) comes first, then names starting
+        with the query (shortest first), then typo-tolerant matches.
+        """
+        key = compact_name(query)
+        if not key:
+            return []
+
+        rows = []
+        exact = self.resolve(query)
+        if exact is not None:
+            rows.append(exact)
+
+        start = bisect.bisect_left(self._entry_keys, key)
+        stop = bisect.bisect_left(self._entry_keys, key + "\U0010ffff")
+        prefixed = sorted(range(start, stop), key=lambda position: len(self._entry_keys[position]))
+        rows.extend(int(row) for row in self._entry_sorted_rows[prefixed])
+
+        if len(set(rows)) < limit:
+            rows.extend(self.similar(query, limit))
+        return _unique(rows, limit)
+
+
+def _unique(rows, limit: int) -> List[int]:
+    """First ``limit`` distinct rows, keeping order"""
+    seen = []
+    for row in rows:
+        row = int(row)
+        if row not in seen:
+            seen.append(row)
+            if len(seen) == limit:
+                break
+    return seen
+
+
+def encode_cursor(offset: int, version: str) -> str:
+    """Opaque pagination cursor for the result at ``offset`` of a listing over data ``version``"""
+    payload = json.dumps({"offset": offset, "version": version}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, version: str) -> int:
+    """
+    Offset encoded in a cursor from ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another data version
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(payload["offset"])
+        cursor_version = payload["version"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Malformed cursor")
+    if cursor_version != version or offset < 0:
+        raise ValueError("Cursor has expired, restart the listing")
+    return offset
@@ -1,17 +1,11 @@
-import io
-import base64
 import logging
-import matplotlib
-import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from typing import List
 
 from models.exoplanet import ExoplanetDetail, HabitableExoplanet, TimelineExoplanet
-
-# Set matplotlib to use a non-interactive backend
-matplotlib.use('Agg')
+from api.image_renderer import comparison_image_key
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -19,7 +13,8 @@ logger = logging.getLogger(__name__)
 def generate_exoplanet_comparison_plot(exoplanet: ExoplanetDetail) -> str:
     """
     Generate an HTML page with both Matplotlib and Plotly visualizations comparing 
-    the exoplanet to Earth.
+    the exoplanet to Earth. The Matplotlib image is referenced by URL, see
+    ``api.image_renderer``.
     
     Args:
         exoplanet: Exoplanet details
@@ -29,48 +24,9 @@ def generate_exoplanet_comparison_plot(exoplanet: ExoplanetDetail) -> str:
     """
     logger.debug(f"Generating comparison plot for exoplanet: {exoplanet.name}")
     
-    # Create Matplotlib figure comparing to Earth
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Bar chart comparing size, temperature, and distance to Earth
-    categories = ["Size (Earth Radii)", "Temperature (K)", "Distance (Light Years)"]
-    values = [
-        exoplanet.size_comparison["earth_radius"],
-        exoplanet.size_comparison["earth_temperature"],
-        exoplanet.size_comparison["earth_distance"]
-    ]
-    
-    # Normalize values for better visualization
-    normalized_values = [
-        values[0],  # Earth radius (already a ratio)
-        values[1]/288,  # Temperature relative to Earth's average (288K)
-        min(1, 10/values[2])  # Distance (inversely related to habitability)
-    ]
-    
-    # Earth comparison values (normalized)
-    earth_values = [1.0, 1.0, 1.0]
-    
-    # Create bar chart
-    x = range(len(categories))
-    width = 0.35
-    
-    ax.bar([i - width/2 for i in x], normalized_values, width, label=exoplanet.name)
-    ax.bar([i + width/2 for i in x], earth_values, width, label='Earth')
-    
-    ax.set_ylabel('Normalized Value')
-    ax.set_title(f'Comparison of {exoplanet.name} to Earth')
-    ax.set_xticks(x)
-    ax.set_xticklabels(categories)
-    ax.legend()
-    
-    plt.tight_layout()
-    
-    # Save the Matplotlib figure to a base64 string
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode('utf-8')
-    plt.close(fig)
+    # The Matplotlib comparison image is served separately so browsers can cache it;
+    # the relative URL resolves next to this page and the key busts stale copies
+    image_url = f"comparison.png?v={comparison_image_key(exoplanet)}"
     
     # Create a Plotly radar chart for comparison
     plotly_fig = go.Figure()
@@ -154,7 +110,7 @@ def generate_exoplanet_comparison_plot(exoplanet: ExoplanetDetail) -> str:
                             <h3>Comparison to Earth</h3>
                         </div>
                         <div class="card-body d-flex justify-content-center">
-                            <img src="data:image/png;base64,{img_str}" class="img-fluid" alt="Exoplanet Comparison">
+                            <img src="{image_url}" class="img-fluid" alt="Exoplanet Comparison">
                         </div>
                     </div>
                 </div>
@@ -373,13 +329,13 @@ def generate_discovery_timeline_plot(exoplanets: List[TimelineExoplanet]) -> str
     dates = [planet.discovery_date for planet in exoplanets]
     methods = [planet.discovery_method for planet in exoplanets]
     
-    # Create a timeline visualization using Plotly
-    fig = px.timeline(
-        x_start=dates,
+    # Create a timeline visualization using Plotly; discoveries are points in time, not intervals
+    fig = px.scatter(
+        x=dates,
         y=names,
         color=methods,
         labels={
-            "x_start": "Discovery Date",
+            "x": "Discovery Date",
             "y": "Exoplanet",
             "color": "Discovery Method"
         },
@@ -387,9 +343,12 @@ def generate_discovery_timeline_plot(exoplanets: List[TimelineExoplanet]) -> str
         template="plotly_dark"
     )
     
+    fig.update_traces(marker={"size": 14})
     fig.update_layout(
         xaxis_title="Discovery Date",
+        xaxis_type="date",
         yaxis_title="Exoplanet",
+        yaxis_autorange="reversed",
         height=max(500, len(exoplanets) * 25)  # Adjust height based on number of planets
     )
     
@@ -0,0 +1,105 @@
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+from api.catalog import ExoplanetCatalog
+from api.export import LISTING_EXPORT_COLUMNS, export_records
+from api.figure_specs import habitability_figure_spec
+from api.habitability import HabitabilityIndex
+from api.response_encoding import available_codings, compress, dumps
+from models.exoplanet import HabitableExoplanet
+
+
+def synthetic_catalog(size: int, seed: int = 0) -> ExoplanetCatalog:
+    """Catalog of ``size`` random planets with the archive's share of missing values"""
+    rng = np.random.default_rng(seed)
+    methods = ["Transit", "Radial Velocity", "Microlensing", "Imaging", "Transit Timing Variations"]
+
+    def maybe(value: float, missing: float = 0.2):
+        return None if rng.random() < missing else round(float(value), 4)
+
+    return ExoplanetCatalog.from_records({
+        "pl_name": f"Synthetic-{i} b",
+        "pl_discmethod": methods[int(rng.integers(len(methods)))],
+        "pl_rade": maybe(rng.lognormal(0.7, 0.8)),
+        "pl_orbper": maybe(rng.lognormal(3, 1.5)),
+        "pl_eqt": maybe(rng.uniform(100, 2500)),
+        "pl_insol": maybe(rng.lognormal(2, 2)),
+        "pl_disc": int(rng.integers(1995, 2026)),
+        "st_dist": maybe(rng.lognormal(5, 1), missing=0.05)
+    } for i in range(size))
+
+
+def time_call(func, repeat: int) -> float:
+    """Best-of-``repeat`` wall time of one call, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare JSON serialization paths and response compression")
+    parser.add_argument("--planets", type=int, default=5000, help="Size of the synthetic catalog")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per measurement")
+    args = parser.parse_args(argv)
+
+    index = HabitabilityIndex(synthetic_catalog(args.planets))
+    rows = index.by_score
+    records = export_records(index.catalog, index.scores, rows, LISTING_EXPORT_COLUMNS)
+
+    def model_listing() -> bytes:
+        # The previous path: an archive dict and a Pydantic model per planet, dumped with the standard library
+        models = []
+        for row in rows:
+            planet = index.catalog.record(row)
+            models.append(HabitableExoplanet(
+                name=planet["pl_name"],
+                habitability_score=float(index.scores[row]),
+                distance=planet["st_dist"] * 3.26 if planet["st_dist"] else planet["st_dist"],
+                earth_radius=planet["pl_rade"],
+                eq_temperature=planet["pl_eqt"],
+                discovery_method=planet["pl_discmethod"]
+            ))
+        return json.dumps([model.model_dump() for model in models]).encode("utf-8")
+
+    def column_listing() -> bytes:
+        return dumps(export_records(index.catalog, index.scores, rows, LISTING_EXPORT_COLUMNS))
+
+    figure = habitability_figure_spec(
+        names=[record["name"] for record in records],
+        scores=[record["habitability_score"] for record in records],
+        distances=[record["distance"] for record in records],
+        radii=[record["earth_radius"] for record in records],
+        temperatures=[record["eq_temperature"] for record in records]
+    )
+
+    print(f"Serialization of {len(rows)} listing entries and their figure spec")
+    print(f"{'payload':>10} {'path':>22} {'ms':>10}")
+    for payload, path, func in (
+        ("listing", "models + json", model_listing),
+        ("listing", "columns + dumps", column_listing),
+        ("figure", "json", lambda: json.dumps(figure).encode("utf-8")),
+        ("figure", "dumps", lambda: dumps(figure)),
+    ):
+        print(f"{payload:>10} {path:>22} {time_call(func, args.repeat):>10.2f}")
+
+    print()
+    print("Bytes on the wire per content coding")
+    print(f"{'payload':>10} {'coding':>10} {'bytes':>10} {'ratio':>7} {'compress ms':>12}")
+    for payload, body in (("listing", column_listing()), ("figure", dumps(figure))):
+        print(f"{payload:>10} {'identity':>10} {len(body):>10} {1:>7.2f} {0:>12.2f}")
+        for coding in available_codings():
+            size = len(compress(body, coding))
+            compress_ms = time_call(lambda: compress(body, coding), args.repeat)
+            print(f"{payload:>10} {coding:>10} {size:>10} {len(body) / size:>7.2f} {compress_ms:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
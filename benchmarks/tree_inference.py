@@ -0,0 +1,53 @@
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from api.habitability_model import train_model
+from api.tree_inference import CompiledForest
+
+# Largest batch the prediction endpoint accepts (main.MAX_PREDICTION_ROWS); compiled inference must
+# not be slower than scikit-learn here
+MAX_BATCH = 10000
+
+
+def time_call(func, X, repeat: int) -> float:
+    """Best-of-``repeat`` wall time of one call, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(X)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare scikit-learn and compiled-tree habitability inference")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per batch size")
+    args = parser.parse_args(argv)
+
+    model = train_model()
+    forest = CompiledForest.from_sklearn(model)
+    rng = np.random.default_rng(0)
+
+    print(f"{'batch':>8} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>8}  identical")
+    failures = []
+    for batch in (1, 10, 100, 1000, MAX_BATCH):
+        X = rng.uniform([0.3, 150, 0], [5.0, 400, 1500], size=(batch, 3))
+        identical = np.array_equal(model.predict_proba(X), forest.predict_proba(X))
+        sklearn_ms = time_call(model.predict_proba, X, args.repeat)
+        compiled_ms = time_call(forest.predict_proba, X, args.repeat)
+        print(f"{batch:>8} {sklearn_ms:>12.3f} {compiled_ms:>12.3f} {sklearn_ms / compiled_ms:>7.1f}x  {identical}")
+        if not identical:
+            failures.append(f"probabilities differ from scikit-learn at {batch} rows")
+        if batch == MAX_BATCH and compiled_ms > sklearn_ms:
+            failures.append(f"compiled inference is slower than scikit-learn at {batch} rows")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+import os
+
+from api.habitability_model import preload_model
+
+# Gunicorn settings, read from the working directory: gunicorn main:app
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+
+# Import the app in the master, so workers share the planet store's pages copy-on-write
+preload_app = True
+
+
+def on_starting(server):
+    """Load the habitability model and freeze the heap in the master before workers fork"""
+    preload_model()
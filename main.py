@@ -1,20 +1,76 @@
 import os
 import logging
-import random
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+import functools
+from flask import Flask, Response, render_template, request, redirect, url_for, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+from api.comparison import comparison_deltas, dedupe_resolved, parse_names
+from api.discovery_index import resolve_window
+from api.events import format_event
+from api.export import EXPORT_FORMATS, LISTING_EXPORT_COLUMNS, parquet_available, record_batches, serialize_export
+from api.figure_specs import discovery_figure_spec, habitability_figure_spec
+from api.habitability_model import predict_habitability_proba
+from api.http_cache import ConditionalRequests, cache_policy
+from api.planet_store import load_planet_store
+from api.response_encoding import dumps
+from api.search import decode_cursor, encode_cursor
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+class FastJSONProvider(DefaultJSONProvider):
+    """``jsonify`` through the fast JSON encoder (orjson when installed), always compact"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj, default=self.default).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj, default=self.default), mimetype=self.mimetype)
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key")
 
-# Simple ML prediction function (placeholder - replace with a real model)
-def predict_habitability_ml(radius, temperature, distance):
-    # Simulate a basic ML model using random numbers for demonstration
-    score = random.uniform(0, 1)
+# Planet dataset shared by all routes, loaded once at startup
+PLANET_DATA_PATH = os.environ.get(
+    "PLANET_DATA_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "planets.json")
+)
+planet_store = load_planet_store(PLANET_DATA_PATH)
+
+# ETags served per API request
+conditional_requests = ConditionalRequests()
+
+# Maximum number of rows accepted by the batch prediction endpoint
+MAX_PREDICTION_ROWS = 10000
+
+# Page size limit of the habitable exoplanets listing
+MAX_LISTING_LIMIT = 500
+
+# Number of names returned by the suggestion endpoint and with not-found errors
+MAX_SUGGESTIONS = 10
+
+# Reconnection delay of dashboard event streams; the planet store never changes while running
+EVENT_STORE_RETRY_MS = 3600 * 1000
+
+def planet_not_found(name):
+    """404 response for an unknown planet, with the closest known names"""
+    return jsonify({
+        "error": f"Exoplanet '{name}' not found",
+        "suggestions": planet_store.suggest(name, limit=5)
+    }), 404
+
+def planets_not_found(names):
+    """404 response for unknown planets of a bulk request, with the closest known names of each"""
+    return jsonify({
+        "error": f"Exoplanets not found: {', '.join(names)}",
+        "suggestions": {name: planet_store.suggest(name, limit=5) for name in names}
+    }), 404
+
+def habitability_label(score):
+    """Map the model's habitability probability to a label bucket"""
     if score > 0.8:
         return "High potential"
     elif score > 0.5:
@@ -22,6 +78,55 @@ def predict_habitability_ml(radius, temperature, distance):
     else:
         return "Unlikely"
 
+def predict_habitability_ml(radius, temperature, distance):
+    """Predict habitability for one planet with the RandomForest model"""
+    return habitability_label(predict_habitability_proba([[radius, temperature, distance]])[0])
+
+def api_request_key():
+    """ETag key of the current API request, or None if it is not a cacheable API GET"""
+    if request.method not in ("GET", "HEAD") or not request.path.startswith("/api/"):
+        return None
+    return conditional_requests.request_key(
+        planet_store.version, request.path, request.query_string.decode("utf-8")
+    )
+
+# Response headers recomputed for every answer rather than stored with the body
+PER_ANSWER_HEADERS = {"content-length", "content-encoding", "etag", "cache-control", "vary"}
+
+def cached_response(answer):
+    """Flask response for an answer of ``conditional_requests``"""
+    return Response(answer.body, status=answer.status, headers=answer.headers)
+
+@app.before_request
+def answer_conditional_request():
+    """Answer a repeat API request from the stored response (304 or body) before the route runs"""
+    key = api_request_key()
+    if key is None or not cache_policy(request.path).etag:
+        return None
+    answer = conditional_requests.cached(
+        key, cache_policy(request.path), request.headers.get("If-None-Match"), request.headers.get("Accept-Encoding")
+    )
+    return cached_response(answer) if answer is not None else None
+
+@app.after_request
+def add_cache_headers(response):
+    """Set Cache-Control, a strong content ETag and the negotiated compression on successful API GET responses"""
+    key = api_request_key()
+    if key is None or response.status_code != 200:
+        return response
+
+    policy = cache_policy(request.path)
+    response.headers.setdefault("Cache-Control", policy.cache_control)
+    # Streamed bodies are not hashed
+    if policy.etag and "ETag" not in response.headers and not response.is_streamed:
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in PER_ANSWER_HEADERS}
+        answer = conditional_requests.store(
+            key, planet_store.version, response.get_data(), headers, policy,
+            request.headers.get("If-None-Match"), request.headers.get("Accept-Encoding")
+        )
+        return cached_response(answer)
+    return response
+
 @app.route("/")
 def index():
     """Render the home page with API documentation"""
@@ -52,286 +157,172 @@ def discovery_timeline_page():
     """Render page for exoplanet discovery timeline with visualizations"""
     return render_template("discovery_visualization.html")
 
+def exoplanet_details(planets):
+    """Detail dicts of several planets, with ML predictions from one model call"""
+    details = [planet.to_dict() for planet in planets]
+    probabilities = predict_habitability_proba([
+        [planet.size_comparison.earth_radius, planet.eq_temperature, planet.distance] for planet in planets
+    ]).tolist()
+    for exoplanet_info, probability in zip(details, probabilities):
+        exoplanet_info["ml_habitability_prediction"] = habitability_label(probability)
+    return details
+
+def resolve_names_param():
+    """
+    Resolve the comma-separated ``names`` query parameter to planets, in request order, each planet once.
+
+    Returns:
+        (planets, None) on success, or (None, error response)
+    """
+    try:
+        names = parse_names(request.args.get("names"))
+    except ValueError as e:
+        return None, (jsonify({"error": str(e)}), 400)
+
+    names, planets = dedupe_resolved(names, [planet_store.get(name) for name in names])
+    missing = [name for name, planet in zip(names, planets) if planet is None]
+    if missing:
+        return None, planets_not_found(missing)
+    return planets, None
+
 # API routes
 @app.route("/api/exoplanet/<name>")
 def get_exoplanet(name):
     """Get detailed information about a specific exoplanet"""
-    # This is a placeholder - you'll implement actual NASA API calls with real data
-
-    # Dictionary of known exoplanet data
-    exoplanet_data = {
-        "Kepler-186f": {
-            "name": "Kepler-186f",
-            "size_comparison": {"earth_radius": 1.2, "earth_temperature": 262, "earth_distance": 500},
-            "discovery_method": "Transit",
-            "orbital_period": "129.9 days",
-            "distance": 500,
-            "habitability_score": 0.95,
-            "eq_temperature": 262,
-            "discovery_year": 2014
-        },
-        "Teegarden's Star b": {
-            "name": "Teegarden's Star b",
-            "size_comparison": {"earth_radius": 1.05, "earth_temperature": 264, "earth_distance": 12.5},
-            "discovery_method": "Radial Velocity",
-            "orbital_period": "4.9 days",
-            "distance": 12.5,
-            "habitability_score": 0.93,
-            "eq_temperature": 264,
-            "discovery_year": 2019
-        },
-        "K2-18b": {
-            "name": "K2-18b",
-            "size_comparison": {"earth_radius": 2.6, "earth_temperature": 265, "earth_distance": 124},
-            "discovery_method": "Transit",
-            "orbital_period": "32.9 days",
-            "distance": 124,
-            "habitability_score": 0.71,
-            "eq_temperature": 265,
-            "discovery_year": 2015
-        },
-        "GJ 357 d": {
-            "name": "GJ 357 d",
-            "size_comparison": {"earth_radius": 1.75, "earth_temperature": 240, "earth_distance": 31},
-            "discovery_method": "Transit",
-            "orbital_period": "55.7 days",
-            "distance": 31,
-            "habitability_score": 0.82,
-            "eq_temperature": 240,
-            "discovery_year": 2019
-        },
-        "Proxima b": {
-            "name": "Proxima b",
-            "size_comparison": {"earth_radius": 1.3, "earth_temperature": 278, "earth_distance": 4.2},
-            "discovery_method": "Radial Velocity",
-            "orbital_period": "11.2 days",
-            "distance": 4.2,
-            "habitability_score": 0.89,
-            "eq_temperature": 278,
-            "discovery_year": 2016
-        },
-        "TOI-700 d": {
-            "name": "TOI-700 d",
-            "size_comparison": {"earth_radius": 1.1, "earth_temperature": 268, "earth_distance": 101.5},
-            "discovery_method": "Transit",
-            "orbital_period": "37.4 days",
-            "distance": 101.5,
-            "habitability_score": 0.86,
-            "eq_temperature": 268,
-            "discovery_year": 2020
-        },
-        "TRAPPIST-1e": {
-            "name": "TRAPPIST-1e",
-            "size_comparison": {"earth_radius": 0.92, "earth_temperature": 251, "earth_distance": 39},
-            "discovery_method": "Transit",
-            "orbital_period": "6.1 days",
-            "distance": 39,
-            "habitability_score": 0.78,
-            "eq_temperature": 251,
-            "discovery_year": 2017
-        },
-        "K2-18b": {
-            "name": "K2-18b",
-            "size_comparison": {"earth_radius": 2.6, "earth_temperature": 265, "earth_distance": 124},
-            "discovery_method": "Transit",
-            "orbital_period": "33 days",
-            "distance": 124,
-            "habitability_score": 0.71,
-            "eq_temperature": 265,
-            "discovery_year": 2015
-        }
-    }
-
-    # Get exoplanet data or use default if not found
-    exoplanet_info = exoplanet_data.get(name, {
-        "name": name,
-        "size_comparison": {"earth_radius": 1.63, "earth_temperature": 345, "earth_distance": 1400},
-        "discovery_method": "Transit",
-        "orbital_period": "384 days",
-        "distance": 1400,
-        "habitability_score": 0.76,
-        "eq_temperature": 288,
-        "discovery_year": 2015
-    })
+    # Resolve the name, tolerating case, spacing, hyphens and aliases
+    planet = planet_store.get(name)
+    if planet is None:
+        return planet_not_found(name)
 
-    # Get ML prediction
-    ml_prediction = predict_habitability_ml(
-        radius=exoplanet_info["size_comparison"]["earth_radius"],
-        temperature=exoplanet_info["eq_temperature"],
-        distance=exoplanet_info["distance"]
-    )
+    # Detail with the ML prediction
+    return jsonify(exoplanet_details([planet])[0])
 
-    exoplanet_info["ml_habitability_prediction"] = ml_prediction
+@app.route("/api/exoplanets")
+def get_exoplanets():
+    """Get detailed information about several exoplanets, given as ?names=a,b,c"""
+    planets, error = resolve_names_param()
+    if error:
+        return error
+    return jsonify(exoplanet_details(planets))
 
-    # Return data for the requested exoplanet, or a default if not found
-    return jsonify(exoplanet_info)
+@app.route("/api/exoplanets/compare")
+def compare_exoplanets():
+    """Compare exoplanets, given as ?names=a,b,c, with the first one"""
+    planets, error = resolve_names_param()
+    if error:
+        return error
+    if len(planets) < 2:
+        return jsonify({"error": "'names' must list at least two planets"}), 400
 
+    deltas = comparison_deltas(
+        [planet.name for planet in planets],
+        {
+            "earth_radius": [planet.size_comparison.earth_radius for planet in planets],
+            "eq_temperature": [planet.eq_temperature for planet in planets],
+            "distance": [planet.distance for planet in planets],
+            "habitability_score": [planet.habitability_score for planet in planets]
+        }
+    )
+    return jsonify({
+        "reference": planets[0].name,
+        "planets": exoplanet_details(planets),
+        "deltas": deltas
+    })
 
 @app.route("/api/exoplanet/<name>/visualization")
 def get_exoplanet_visualization(name):
     """Get visualization for a specific exoplanet"""
-    # Dictionary of known exoplanet data (same as in get_exoplanet function)
-    exoplanet_data = {
-        "Kepler-186f": {
-            "name": "Kepler-186f",
-            "size_comparison": {"earth_radius": 1.2, "earth_temperature": 262, "earth_distance": 500},
-            "discovery_method": "Transit",
-            "orbital_period": "129.9 days",
-            "distance": 500,
-            "habitability_score": 0.95,
-            "eq_temperature": 262,
-            "discovery_year": 2014
-        },
-        "Teegarden's Star b": {
-            "name": "Teegarden's Star b",
-            "size_comparison": {"earth_radius": 1.05, "earth_temperature": 264, "earth_distance": 12.5},
-            "discovery_method": "Radial Velocity",
-            "orbital_period": "4.9 days",
-            "distance": 12.5,
-            "habitability_score": 0.93,
-            "eq_temperature": 264,
-            "discovery_year": 2019
-        },
-        "K2-18b": {
-            "name": "K2-18b",
-            "size_comparison": {"earth_radius": 2.6, "earth_temperature": 265, "earth_distance": 124},
-            "discovery_method": "Transit",
-            "orbital_period": "32.9 days",
-            "distance": 124,
-            "habitability_score": 0.71,
-            "eq_temperature": 265,
-            "discovery_year": 2015
-        },
-        "GJ 357 d": {
-            "name": "GJ 357 d",
-            "size_comparison": {"earth_radius": 1.75, "earth_temperature": 240, "earth_distance": 31},
-            "discovery_method": "Transit",
-            "orbital_period": "55.7 days",
-            "distance": 31,
-            "habitability_score": 0.82,
-            "eq_temperature": 240,
-            "discovery_year": 2019
-        },
-        "Proxima b": {
-            "name": "Proxima b",
-            "size_comparison": {"earth_radius": 1.3, "earth_temperature": 278, "earth_distance": 4.2},
-            "discovery_method": "Radial Velocity",
-            "orbital_period": "11.2 days",
-            "distance": 4.2,
-            "habitability_score": 0.89,
-            "eq_temperature": 278,
-            "discovery_year": 2016
-        },
-        "TOI-700 d": {
-            "name": "TOI-700 d",
-            "size_comparison": {"earth_radius": 1.1, "earth_temperature": 268, "earth_distance": 101.5},
-            "discovery_method": "Transit",
-            "orbital_period": "37.4 days",
-            "distance": 101.5,
-            "habitability_score": 0.86,
-            "eq_temperature": 268,
-            "discovery_year": 2020
-        },
-        "TRAPPIST-1e": {
-            "name": "TRAPPIST-1e",
-            "size_comparison": {"earth_radius": 0.92, "earth_temperature": 251, "earth_distance": 39},
-            "discovery_method": "Transit",
-            "orbital_period": "6.1 days",
-            "distance": 39,
-            "habitability_score": 0.78,
-            "eq_temperature": 251,
-            "discovery_year": 2017
-        },
-        "K2-18b": {
-            "name": "K2-18b",
-            "size_comparison": {"earth_radius": 2.6, "earth_temperature": 265, "earth_distance": 124},
-            "discovery_method": "Transit",
-            "orbital_period": "33 days",
-            "distance": 124,
-            "habitability_score": 0.71,
-            "eq_temperature": 265,
-            "discovery_year": 2015
-        }
-    }
-
-    # Get exoplanet data or use default if not found
-    exoplanet = exoplanet_data.get(name, {
-        "name": name,
-        "size_comparison": {"earth_radius": 1.63, "earth_temperature": 345, "earth_distance": 1400},
-        "discovery_method": "Transit",
-        "orbital_period": "384 days",
-        "distance": 1400,
-        "habitability_score": 0.76,
-        "eq_temperature": 288,
-        "discovery_year": 2015
-    })
+    exoplanet = planet_store.get(name)
+    if exoplanet is None:
+        return planet_not_found(name)
 
     # Render the visualization template with the exoplanet data
     return render_template('exoplanet_visualization.html', exoplanet=exoplanet)
 
+@app.route("/api/exoplanets/suggest")
+def suggest_exoplanets():
+    """Autocomplete planet names for a partial or misspelled query"""
+    limit = request.args.get("limit", MAX_SUGGESTIONS, type=int)
+    if not 1 <= limit <= MAX_SUGGESTIONS:
+        return jsonify({"error": f"'limit' must be between 1 and {MAX_SUGGESTIONS}"}), 400
+    return jsonify(planet_store.suggest(request.args.get("q", ""), limit=limit))
+
 @app.route("/api/exoplanets/habitable")
 def get_habitable_exoplanets():
-    """Get a list of potentially habitable exoplanets"""
-    # This is a placeholder - you'll implement actual NASA API calls
-    exoplanets = [
-        {
-            "name": "Kepler-186f",
-            "habitability_score": 0.95,
-            "distance": 500,
-            "earth_radius": 1.2,
-            "eq_temperature": 262
-        },
-        {
-            "name": "Proxima b",
-            "habitability_score": 0.89,
-            "distance": 4.2,
-            "earth_radius": 1.3,
-            "eq_temperature": 278
-        },
-        {
-            "name": "TOI-700 d",
-            "habitability_score": 0.86,
-            "distance": 101.5,
-            "earth_radius": 1.1,
-            "eq_temperature": 268
-        },
-        {
-            "name": "TRAPPIST-1e",
-            "habitability_score": 0.78,
-            "distance": 39,
-            "earth_radius": 0.92,
-            "eq_temperature": 251
-        },
-        {
-            "name": "K2-18b",
-            "habitability_score": 0.71,
-            "distance": 124,
-            "earth_radius": 2.6,
-            "eq_temperature": 265
-        },
-        {
-            "name": "Kepler-442b",
-            "habitability_score": 0.84,
-            "distance": 1206,
-            "earth_radius": 1.3,
-            "eq_temperature": 233
-        },
-        {
-            "name": "Teegarden's Star b",
-            "habitability_score": 0.93,
-            "distance": 12.5,
-            "earth_radius": 1.05,
-            "eq_temperature": 298
-        },
+    """Get a list of potentially habitable exoplanets, optionally filtered, sorted and paginated"""
+    limit = request.args.get("limit", type=int)
+    if limit is not None and not 1 <= limit <= MAX_LISTING_LIMIT:
+        return jsonify({"error": f"'limit' must be between 1 and {MAX_LISTING_LIMIT}"}), 400
+
+    try:
+        offset = decode_cursor(request.args["cursor"], planet_store.version) if request.args.get("cursor") else 0
+        planets = planet_store.query_habitable(
+            q=request.args.get("q"),
+            method=request.args.get("method"),
+            score_band=request.args.get("score_band"),
+            sort=request.args.get("sort", "score")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    page = planets[offset:] if limit is None else planets[offset:offset + limit]
+    response = jsonify(page)
+    response.headers["X-Total-Count"] = str(len(planets))
+    if offset + len(page) < len(planets):
+        response.headers["X-Next-Cursor"] = encode_cursor(offset + len(page), planet_store.version)
+    return response
+
+@app.route("/api/exoplanets/export")
+def export_exoplanets():
+    """Stream the habitable exoplanets listing as NDJSON, CSV or Parquet, with the listing's filters"""
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"'format' must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    if export_format == "parquet" and not parquet_available():
+        return jsonify({"error": "Parquet export requires pyarrow"}), 501
+
+    try:
+        planets = planet_store.query_habitable(
+            q=request.args.get("q"),
+            method=request.args.get("method"),
+            score_band=request.args.get("score_band"),
+            sort=request.args.get("sort", "score")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    body = serialize_export(export_format, record_batches(planets), LISTING_EXPORT_COLUMNS)
+    response = Response(stream_with_context(body), mimetype=EXPORT_FORMATS[export_format])
+    response.headers["Content-Disposition"] = f'attachment; filename="exoplanets.{export_format}"'
+    response.headers["X-Total-Count"] = str(len(planets))
+    return response
+
+@app.route("/api/exoplanets/predict", methods=["POST"])
+def predict_habitability_batch():
+    """Predict habitability for many (radius, temperature, distance) rows in one model call"""
+    payload = request.get_json(silent=True) or {}
+    planets = payload.get("planets")
+    if not isinstance(planets, list) or len(planets) > MAX_PREDICTION_ROWS:
+        return jsonify({"error": f"'planets' must be a list of at most {MAX_PREDICTION_ROWS} rows"}), 400
+
+    try:
+        features = [[float(p["radius"]), float(p["temperature"]), float(p["distance"])] for p in planets]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Each planet needs numeric 'radius', 'temperature' and 'distance'"}), 400
+
+    probabilities = predict_habitability_proba(features).tolist()
+    predictions = [
         {
-            "name": "GJ 357 d",
-            "habitability_score": 0.82,
-            "distance": 31,
-            "earth_radius": 1.75,
-            "eq_temperature": 240
+            "name": planet.get("name"),
+            "radius": radius,
+            "temperature": temperature,
+            "distance": distance,
+            "probability": probability,
+            "ml_habitability_prediction": habitability_label(probability)
         }
+        for planet, (radius, temperature, distance), probability in zip(planets, features, probabilities)
     ]
-    return jsonify(exoplanets)
+    return jsonify({"count": len(predictions), "predictions": predictions})
 
 @app.route("/api/exoplanets/habitable/visualization")
 def get_habitable_exoplanets_visualization():
@@ -339,87 +330,98 @@ def get_habitable_exoplanets_visualization():
     # Render the habitable exoplanets visualization template
     return render_template('habitable_visualization.html')
 
+@functools.lru_cache(maxsize=1)
+def habitable_figure():
+    """Habitable exoplanets figure spec, built once since the planet store never changes"""
+    planets = planet_store.habitable
+    return habitability_figure_spec(
+        names=[planet["name"] for planet in planets],
+        scores=[planet["habitability_score"] for planet in planets],
+        distances=[planet["distance"] for planet in planets],
+        radii=[planet["earth_radius"] for planet in planets],
+        temperatures=[planet["eq_temperature"] for planet in planets]
+    )
+
+@app.route("/api/exoplanets/habitable/figure.json")
+def get_habitable_exoplanets_figure():
+    """Get the habitable exoplanets figures as Plotly JSON for client-side rendering"""
+    return jsonify(habitable_figure())
+
+def discoveries_in_window():
+    """
+    Recent discoveries within the ``window``/``since``/``until`` query parameters.
+
+    Without them the dataset's whole recent discoveries list is returned, as
+    it is a fixed snapshot rather than a window relative to today.
+
+    Returns:
+        (discoveries, None) on success, or (None, error response)
+    """
+    params = {name: request.args.get(name) for name in ("window", "since", "until")}
+    if not any(params.values()):
+        return planet_store.discoveries, None
+    try:
+        since, until = resolve_window(**params)
+    except ValueError as e:
+        return None, (jsonify({"error": str(e)}), 400)
+    return planet_store.discovered(since, until), None
+
+@app.route("/api/exoplanets/discovered")
 @app.route("/api/exoplanets/discovered/last-year")
 def get_recent_discoveries():
-    """Get exoplanets discovered in the last year"""
-    # This is a placeholder - you'll implement actual NASA API calls
-    discoveries = [
-        {
-            "name": "TOI-733 b",
-            "discovery_date": "2024-04-01",
-            "discovery_method": "Transit"
-        },
-        {
-            "name": "TOI-4600 c",
-            "discovery_date": "2024-03-28",
-            "discovery_method": "Transit"
-        },
-        {
-            "name": "HD 207897 b",
-            "discovery_date": "2024-03-15",
-            "discovery_method": "Radial Velocity"
-        },
-        {
-            "name": "GJ 806 b",
-            "discovery_date": "2024-02-22",
-            "discovery_method": "Radial Velocity"
-        },
-        {
-            "name": "HD 36384 b",
-            "discovery_date": "2024-02-14",
-            "discovery_method": "Radial Velocity"
-        },
-        {
-            "name": "WASP-193 b",
-            "discovery_date": "2024-01-30",
-            "discovery_method": "Transit"
-        },
-        {
-            "name": "HD 56414 b",
-            "discovery_date": "2024-01-12",
-            "discovery_method": "Transit"
-        },
-        {
-            "name": "K2-415 b",
-            "discovery_date": "2023-12-08",
-            "discovery_method": "Transit"
-        },
-        {
-            "name": "HD 63433 d",
-            "discovery_date": "2023-11-17",
-            "discovery_method": "Transit"
-        },
-        {
-            "name": "LP 791-18 d",
-            "discovery_date": "2023-10-24",
-            "discovery_method": "Transit"
-        }
-    ]
-    return jsonify(discoveries)
+    """Get recent exoplanet discoveries, optionally within a time window"""
+    discoveries, error = discoveries_in_window()
+    return error if error else jsonify(discoveries)
 
+@app.route("/api/exoplanets/discovered/visualization")
 @app.route("/api/exoplanets/discovered/last-year/visualization")
 def get_recent_discoveries_visualization():
     """Get visualization of recent exoplanet discoveries"""
     # Render the discovery timeline visualization template
     return render_template('discovery_visualization.html')
 
+def discoveries_figure_spec(discoveries):
+    """Discovery timeline figure spec of some recent discoveries"""
+    return discovery_figure_spec(
+        names=[discovery.name for discovery in discoveries],
+        dates=[discovery.discovery_date for discovery in discoveries],
+        methods=[discovery.discovery_method for discovery in discoveries]
+    )
+
+@functools.lru_cache(maxsize=1)
+def discoveries_figure():
+    """Discovery timeline figure spec of all recent discoveries, built once since the planet store never changes"""
+    return discoveries_figure_spec(planet_store.discoveries)
+
+@app.route("/api/exoplanets/discovered/figure.json")
+@app.route("/api/exoplanets/discovered/last-year/figure.json")
+def get_recent_discoveries_figure():
+    """Get the discovery timeline figures as Plotly JSON for client-side rendering"""
+    discoveries, error = discoveries_in_window()
+    if error:
+        return error
+    if discoveries is planet_store.discoveries:
+        return jsonify(discoveries_figure())
+    return jsonify(discoveries_figure_spec(discoveries))
+
 @app.route("/api/dashboard/stats")
 def get_dashboard_stats():
-    """Get statistics for the dashboard"""
-    stats = {
-        "total_exoplanets": 5000,  # This is a placeholder count
-        "habitable_count": 7,
-        "recent_discoveries": 10,
-        "discovery_methods": {
-            "Transit": 85,
-            "Radial Velocity": 45,
-            "Direct Imaging": 12,
-            "Gravitational Microlensing": 8,
-            "Timing Variations": 5,
-            "Astrometry": 3
-        }
-    }
-    return jsonify(stats)
+    """Get statistics for the dashboard, precomputed when the planet store is loaded"""
+    # Recent discoveries are the dataset's own list rather than discovery years
+    return jsonify({**planet_store.stats.as_dict(), "recent_discoveries": len(planet_store.discoveries)})
+
+@app.route("/api/events")
+def stream_events():
+    """
+    Server-Sent Events stream of dashboard updates.
+    
+    The planet store does not change while the app runs, so the stream sends
+    the statistics once and ends, asking EventSource clients to reconnect only
+    after an hour instead of holding a worker per open tab.
+    """
+    stats = {**planet_store.stats.as_dict(), "recent_discoveries": len(planet_store.discoveries)}
+    message = format_event("stats", stats, event_id=stats["catalog_version"], retry_ms=EVENT_STORE_RETRY_MS)
+    return Response(message, mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 if __name__ == "__main__":
     # Run the application
@@ -13,6 +13,20 @@ class ExoplanetDetail(BaseModel):
     discovery_year: Optional[int] = None
     ml_habitability_prediction: Optional[str] = None
 
+class ExoplanetDelta(BaseModel):
+    """Model representing how an exoplanet differs from the reference exoplanet of a comparison"""
+    name: str
+    earth_radius: Optional[float] = None
+    eq_temperature: Optional[float] = None
+    distance: Optional[float] = None  # in light years
+    habitability_score: Optional[float] = None
+
+class ExoplanetComparison(BaseModel):
+    """Model representing exoplanets compared with the first (reference) one"""
+    reference: str
+    planets: List[ExoplanetDetail]
+    deltas: List[ExoplanetDelta]
+
 class HabitableExoplanet(BaseModel):
     """Model representing a potentially habitable exoplanet"""
     name: str
@@ -20,9 +34,55 @@ class HabitableExoplanet(BaseModel):
     distance: Optional[float] = None  # in light years
     earth_radius: Optional[float] = None
     eq_temperature: Optional[float] = None
+    discovery_method: Optional[str] = None
 
 class TimelineExoplanet(BaseModel):
     """Model representing an exoplanet with discovery timeline information"""
     name: str
-    discovery_date: str
+    discovery_date: str  # YYYY-MM-DD, the first day of the month or year when only those are known
     discovery_method: str
+    discovery_date_precision: str = "day"  # "day", "month" or "year"
+
+class HabitableExoplanetPage(BaseModel):
+    """Model representing one page of habitable exoplanets ranked by habitability score"""
+    total: int
+    offset: int
+    limit: int
+    items: List[HabitableExoplanet]
+
+class HabitabilityFeatures(BaseModel):
+    """Model representing the features the habitability model is trained on"""
+    radius: float  # in Earth radii
+    temperature: float  # equilibrium temperature in K
+    distance: float  # in light years
+    name: Optional[str] = None
+
+class CatalogFilter(BaseModel):
+    """Model representing a filter over the exoplanet catalog"""
+    band: Optional[str] = Field(None, pattern="^(high|medium|low)$")
+    min_score: Optional[float] = Field(None, ge=0.0, le=1.0)
+    min_radius: Optional[float] = None
+    max_radius: Optional[float] = None
+    min_temperature: Optional[float] = None
+    max_temperature: Optional[float] = None
+    min_distance: Optional[float] = None
+    max_distance: Optional[float] = None
+
+class HabitabilityPredictionRequest(BaseModel):
+    """Model representing a batch habitability prediction request: explicit rows or a catalog filter"""
+    planets: Optional[List[HabitabilityFeatures]] = Field(None, max_length=10000)
+    filter: Optional[CatalogFilter] = None
+
+class HabitabilityPrediction(BaseModel):
+    """Model representing the ML habitability prediction for one planet"""
+    name: Optional[str] = None
+    radius: float
+    temperature: float
+    distance: float
+    probability: float = Field(..., ge=0.0, le=1.0)
+    ml_habitability_prediction: str
+
+class HabitabilityPredictionResponse(BaseModel):
+    """Model representing the result of a batch habitability prediction"""
+    count: int
+    predictions: List[HabitabilityPrediction]
@@ -219,21 +219,82 @@ function createStatsCard(title, value, icon, colorClass) {
     return card;
 }
 
+// Seconds between refreshes of the dashboard statistics when the event stream is unavailable
+const DASHBOARD_STATS_REFRESH_SECONDS = 60;
+
+/**
+ * Show dashboard statistics in the metric cards and discovery methods chart
+ */
+function renderDashboardStats(stats) {
+    const setText = (id, value) => {
+        const element = document.getElementById(id);
+        if (element) element.textContent = value.toLocaleString();
+    };
+    setText('total-planet-count', stats.total_exoplanets);
+    setText('habitable-count', stats.habitable_count);
+    setText('recent-discoveries', stats.recent_discoveries);
+
+    // Discovery methods chart, if the page has one
+    const methodsContainer = document.getElementById('discovery-methods-chart');
+    if (methodsContainer && typeof createDiscoveryMethodsChart === 'function') {
+        const methodsData = Object.entries(stats.discovery_methods)
+            .map(([method, count]) => ({ method, count }));
+        createDiscoveryMethodsChart(methodsData, methodsContainer);
+    }
+
+    // Update last refresh time
+    const lastRefresh = document.getElementById('last-refresh');
+    if (lastRefresh) lastRefresh.textContent = new Date().toLocaleTimeString();
+}
+
 /**
  * Update dashboard metrics with the latest data
- * This function will be called periodically to refresh dashboard data
  */
 function updateDashboardMetrics() {
-    // This would normally fetch fresh data from the API
-    // For the prototype, we'll simulate with static data
+    return fetch('/api/dashboard/stats')
+        .then(response => response.json())
+        .then(stats => {
+            renderDashboardStats(stats);
+            return stats;
+        })
+        .catch(error => {
+            console.error('Error fetching dashboard statistics:', error);
+        });
+}
 
-    document.getElementById('total-exoplanets').textContent = '5,000+';
-    document.getElementById('habitable-exoplanets').textContent = '7';
-    document.getElementById('recent-discoveries').textContent = '10';
+/**
+ * Keep the dashboard current from the server's event stream.
+ * The server pushes statistics only when the catalog changes, so open tabs
+ * add no load while it is unchanged. Falls back to polling when the browser
+ * has no EventSource or the stream is closed for good.
+ */
+function subscribeDashboardEvents(onDiscoveries) {
+    let pollTimer = null;
+    const startPolling = () => {
+        if (pollTimer === null) {
+            updateDashboardMetrics();
+            pollTimer = setInterval(updateDashboardMetrics, DASHBOARD_STATS_REFRESH_SECONDS * 1000);
+        }
+    };
 
-    // Update last refresh time
-    document.getElementById('last-refresh').textContent = 
-        new Date().toLocaleTimeString();
+    if (typeof EventSource === 'undefined') {
+        startPolling();
+        return;
+    }
+
+    const events = new EventSource('/api/events');
+    events.addEventListener('stats', event => {
+        renderDashboardStats(JSON.parse(event.data));
+    });
+    events.addEventListener('discoveries', event => {
+        onDiscoveries(JSON.parse(event.data));
+    });
+    events.onerror = () => {
+        // EventSource reconnects by itself unless the server refused the stream
+        if (events.readyState === EventSource.CLOSED) {
+            startPolling();
+        }
+    };
 }
 
 // Dashboard JavaScript
@@ -242,39 +303,53 @@ document.addEventListener('DOMContentLoaded', function() {
     const discoveryFilter = document.getElementById('discovery-method-filter');
     const habitabilityFilter = document.getElementById('habitability-filter');
 
-    function filterExoplanets() {
-        const searchTerm = searchInput.value.toLowerCase();
-        const discoveryMethod = discoveryFilter.value;
-        const habitabilityScore = habitabilityFilter.value;
-
-        fetch('/api/exoplanets/habitable')
-            .then(response => response.json())
-            .then(exoplanets => {
-                const filtered = exoplanets.filter(planet => {
-                    const matchesSearch = planet.name.toLowerCase().includes(searchTerm);
-                    const matchesMethod = !discoveryMethod || planet.discovery_method === discoveryMethod;
-
-                    let matchesHabitability = true;
-                    if (habitabilityScore === 'high') {
-                        matchesHabitability = planet.habitability_score > 0.8;
-                    } else if (habitabilityScore === 'medium') {
-                        matchesHabitability = planet.habitability_score >= 0.5 && planet.habitability_score <= 0.8;
-                    } else if (habitabilityScore === 'low') {
-                        matchesHabitability = planet.habitability_score < 0.5;
-                    }
-
-                    return matchesSearch && matchesMethod && matchesHabitability;
-                });
-
-                updateResults(filtered);
+    // Page size of the search results; more pages are loaded on demand
+    const RESULTS_PAGE_SIZE = 30;
+    let searchController = null;
+    let searchTimer = null;
+    let nextCursor = null;
+
+    function buildSearchParams() {
+        const params = new URLSearchParams({ limit: RESULTS_PAGE_SIZE });
+        const searchTerm = searchInput.value.trim();
+        if (searchTerm) params.set('q', searchTerm);
+        if (discoveryFilter.value) params.set('method', discoveryFilter.value);
+        if (habitabilityFilter.value) params.set('score_band', habitabilityFilter.value);
+        return params;
+    }
+
+    function filterExoplanets(append = false) {
+        // Cancel the previous request so only the latest filters are shown
+        if (searchController) searchController.abort();
+        searchController = new AbortController();
+
+        const params = buildSearchParams();
+        if (append && nextCursor) params.set('cursor', nextCursor);
+
+        fetch(`/api/exoplanets/habitable?${params}`, { signal: searchController.signal })
+            .then(response => {
+                nextCursor = response.headers.get('X-Next-Cursor');
+                return response.json();
+            })
+            .then(exoplanets => updateResults(exoplanets, append))
+            .catch(error => {
+                if (error.name !== 'AbortError') {
+                    console.error('Error searching exoplanets:', error);
+                }
             });
     }
 
-    function updateResults(planets) {
+    // Filter on the server, waiting for a pause in typing
+    function scheduleFilter() {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => filterExoplanets(), 200);
+    }
+
+    function updateResults(planets, append) {
         const container = document.getElementById('exoplanet-results');
         if (!container) return;
 
-        container.innerHTML = planets.map(planet => `
+        const cards = planets.map(planet => `
             <div class="col-md-4 mb-4">
                 <div class="card h-100">
                     <div class="card-body">
@@ -282,23 +357,47 @@ document.addEventListener('DOMContentLoaded', function() {
                         <p class="card-text">
                             Habitability Score: ${planet.habitability_score.toFixed(2)}
                         </p>
-                        <a href="/exoplanet/${planet.name}" class="btn btn-primary">View Details</a>
+                        <a href="/exoplanet/${encodeURIComponent(planet.name)}" class="btn btn-primary">View Details</a>
                     </div>
                 </div>
             </div>
         `).join('');
+
+        if (append) {
+            container.insertAdjacentHTML('beforeend', cards);
+        } else {
+            container.innerHTML = cards || '<div class="col-12 text-center text-muted">No matching exoplanets</div>';
+        }
+
+        const loadMoreButton = document.getElementById('load-more-button');
+        if (loadMoreButton) {
+            loadMoreButton.classList.toggle('d-none', !nextCursor);
+        }
     }
 
     // Add event listeners
-    searchInput.addEventListener('input', filterExoplanets);
-    discoveryFilter.addEventListener('change', filterExoplanets);
-    habitabilityFilter.addEventListener('change', filterExoplanets);
+    searchInput.addEventListener('input', scheduleFilter);
+    discoveryFilter.addEventListener('change', () => filterExoplanets());
+    habitabilityFilter.addEventListener('change', () => filterExoplanets());
+
+    const filterButton = document.getElementById('filter-button');
+    if (filterButton) {
+        filterButton.addEventListener('click', () => filterExoplanets());
+    }
+
+    const loadMoreButton = document.getElementById('load-more-button');
+    if (loadMoreButton) {
+        loadMoreButton.addEventListener('click', () => filterExoplanets(true));
+    }
 
     // Initial load
     filterExoplanets();
+
+    // Statistics arrive on connect and whenever the catalog changes; new planets refresh the results
+    subscribeDashboardEvents(() => filterExoplanets());
     
-    // Load exoplanet options for comparison tool
-    fetch('/api/exoplanets/habitable')
+    // Load exoplanet options for comparison tool, alphabetically
+    fetch('/api/exoplanets/habitable?sort=name&limit=500')
         .then(response => response.json())
         .then(exoplanets => {
             const select1 = document.getElementById('exoplanet1-select');
@@ -308,21 +407,10 @@ document.addEventListener('DOMContentLoaded', function() {
             select1.innerHTML = '<option value="">Select first exoplanet...</option>';
             select2.innerHTML = '<option value="">Select second exoplanet...</option>';
             
-            // Add hardcoded planets for now (since API might not return all)
-            const planets = [
-                "Kepler-186f",
-                "Teegarden's Star b",
-                "K2-18b",
-                "GJ 357 d",
-                "Proxima b",
-                "TRAPPIST-1e",
-                "TOI-700 d"
-            ];
-            
-            planets.forEach(planetName => {
+            exoplanets.forEach(planet => {
                 const option = document.createElement('option');
-                option.value = planetName;
-                option.textContent = planetName;
+                option.value = planet.name;
+                option.textContent = planet.name;
                 select1.appendChild(option.cloneNode(true));
                 select2.appendChild(option);
             });
@@ -342,15 +430,24 @@ document.addEventListener('DOMContentLoaded', function() {
                 alert('Please select two exoplanets to compare');
                 return;
             }
+            if (planet1Name === planet2Name) {
+                alert('Please select two different exoplanets');
+                return;
+            }
 
             const resultsDiv = document.getElementById('comparison-results');
             resultsDiv.innerHTML = '<div class="text-center"><div class="spinner-border text-info"></div></div>';
 
             try {
-                const [planet1Data, planet2Data] = await Promise.all([
-                    fetch(`/api/exoplanet/${encodeURIComponent(planet1Name)}`).then(r => r.json()),
-                    fetch(`/api/exoplanet/${encodeURIComponent(planet2Name)}`).then(r => r.json())
-                ]);
+                // Both planets and their differences in one request
+                const params = new URLSearchParams({ names: `${planet1Name},${planet2Name}` });
+                const response = await fetch(`/api/exoplanets/compare?${params}`);
+                if (!response.ok) throw new Error(`Comparison failed with status ${response.status}`);
+                const comparison = await response.json();
+                const [planet1Data, planet2Data] = comparison.planets;
+                const delta = comparison.deltas[0];
+                const formatDelta = (value, digits) =>
+                    value === null ? '—' : `${value > 0 ? '+' : ''}${value.toFixed(digits)}`;
 
                 const comparisonHtml = `
                     <div class="table-responsive">
@@ -360,6 +457,7 @@ document.addEventListener('DOMContentLoaded', function() {
                                     <th>Characteristic</th>
                                     <th>${planet1Data.name}</th>
                                     <th>${planet2Data.name}</th>
+                                    <th>Difference</th>
                                 </tr>
                             </thead>
                             <tbody>
@@ -367,26 +465,31 @@ document.addEventListener('DOMContentLoaded', function() {
                                     <td>Size (Earth Radii)</td>
                                     <td>${planet1Data.size_comparison.earth_radius}</td>
                                     <td>${planet2Data.size_comparison.earth_radius}</td>
+                                    <td>${formatDelta(delta.earth_radius, 2)}</td>
                                 </tr>
                                 <tr>
                                     <td>Temperature (K)</td>
                                     <td>${planet1Data.size_comparison.earth_temperature}</td>
                                     <td>${planet2Data.size_comparison.earth_temperature}</td>
+                                    <td>${formatDelta(delta.eq_temperature, 0)}</td>
                                 </tr>
                                 <tr>
                                     <td>Distance (Light Years)</td>
                                     <td>${planet1Data.distance || 'Unknown'}</td>
                                     <td>${planet2Data.distance || 'Unknown'}</td>
+                                    <td>${formatDelta(delta.distance, 1)}</td>
                                 </tr>
                                 <tr>
                                     <td>Habitability Score</td>
                                     <td>${planet1Data.habitability_score.toFixed(2)}</td>
                                     <td>${planet2Data.habitability_score.toFixed(2)}</td>
+                                    <td>${formatDelta(delta.habitability_score, 2)}</td>
                                 </tr>
                                 <tr>
                                     <td>Discovery Method</td>
                                     <td>${planet1Data.discovery_method}</td>
                                     <td>${planet2Data.discovery_method}</td>
+                                    <td></td>
                                 </tr>
                             </tbody>
                         </table>
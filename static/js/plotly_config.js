@@ -89,6 +89,70 @@ function createExoplanetTimeline(divId, data, layout) {
     );
 }
 
+// Typed-array dtypes used by figure.json endpoints (Plotly's base64 encoding)
+const typedArrayTypes = {
+    f8: Float64Array,
+    f4: Float32Array,
+    i4: Int32Array,
+    u4: Uint32Array,
+    i2: Int16Array,
+    u2: Uint16Array,
+    i1: Int8Array,
+    u1: Uint8Array
+};
+
+// Replace {dtype, bdata} objects with typed arrays, for Plotly.js builds without native support
+function decodeTypedArrays(value) {
+    if (Array.isArray(value)) {
+        return value.map(decodeTypedArrays);
+    }
+    if (value && typeof value === 'object') {
+        if (typeof value.bdata === 'string' && typedArrayTypes[value.dtype]) {
+            const binary = atob(value.bdata);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            return new typedArrayTypes[value.dtype](bytes.buffer);
+        }
+        const decoded = {};
+        Object.keys(value).forEach(key => {
+            decoded[key] = decodeTypedArrays(value[key]);
+        });
+        return decoded;
+    }
+    return value;
+}
+
+// Render one figure from a figure.json response with consistent styling
+function renderFigureSpec(divId, figure) {
+    Plotly.newPlot(
+        divId,
+        decodeTypedArrays(figure.data),
+        applyDarkTheme(figure.layout),
+        defaultPlotlyConfig
+    );
+}
+
+// Fetch a figure.json endpoint and render its figures into the given divs
+function loadFigures(url, divIds) {
+    return fetch(url)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`Figure request failed with status ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(spec => {
+            Object.keys(divIds).forEach(name => {
+                if (spec.figures[name]) {
+                    renderFigureSpec(divIds[name], spec.figures[name]);
+                }
+            });
+            return spec;
+        });
+}
+
 // Format habitability score with color coding
 function formatHabitabilityScore(score) {
     const formattedScore = score.toFixed(2);
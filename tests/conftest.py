@@ -0,0 +1,104 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+
+class StandInServer:
+    """
+    Local HTTP/1.1 server standing in for an upstream API.
+
+    ``respond(path, params)`` returns the status and body of each GET request
+    (by default an empty JSON array); responses queued in ``responses`` are
+    served first. Every request is recorded with the client's port, so tests
+    can tell whether connections were reused.
+    """
+
+    def __init__(self):
+        self.respond: Callable[[str, dict], Tuple[int, str]] = lambda path, params: (200, "[]")
+        self.responses: List[Tuple[int, str]] = []
+        self.requests: List[Tuple[str, dict, int]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                params = {name: values[0] for name, values in parse_qs(url.query).items()}
+                server.requests.append((url.path, params, self.client_address[1]))
+                status, body = server.responses.pop(0) if server.responses else server.respond(url.path, params)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    @staticmethod
+    def json(value) -> str:
+        return json.dumps(value)
+
+
+@pytest.fixture
+def stand_in_server():
+    server = StandInServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """
+    The FastAPI service module serving the bundled catalog fixture, with empty caches.
+
+    Yields a test client of an app that mounts the router under ``/api``.
+    """
+    import asyncio
+    import os
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import api.exoplanet_service as svc
+    import api.render_pool
+    from api.cache import ResponseCache
+    from api.http_cache import ConditionalRequests
+
+    monkeypatch.setattr(svc, "CATALOG_FIXTURE_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "ps_fixture.json"))
+    monkeypatch.setattr(svc, "cache", ResponseCache(ttl=0))
+    monkeypatch.setattr(svc, "figure_cache", ResponseCache(ttl=86400))
+    monkeypatch.setattr(svc, "conditional_requests", ConditionalRequests())
+    for name in ("_catalog", "_sync_state", "_habitability_index", "_name_index", "_discovery_stats",
+                 "_discovery_index", "_refresh_task"):
+        monkeypatch.setattr(svc, name, None)
+    monkeypatch.setattr(svc, "_catalog_lock", asyncio.Lock())
+    monkeypatch.setattr(api.render_pool, "_pool", None)
+
+    app = FastAPI()
+    app.include_router(svc.router, prefix="/api")
+    yield TestClient(app)
+    api.render_pool.close_render_pool()
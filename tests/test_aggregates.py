@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+
+from api.aggregates import DiscoveryStats
+from api.catalog import ExoplanetCatalog
+from api.catalog_sync import apply_delta
+from api.exoplanet_service import discovery_columns
+from api.habitability import HabitabilityIndex, habitable_mask
+from api.planet_store import load_planet_store
+
+RECORDS = [
+    {"pl_name": "Kepler-186 f", "pl_discmethod": "Transit", "pl_rade": 1.17, "pl_eqt": 262, "pl_orbper": 129.9,
+     "pl_insol": 0.29, "pl_disc": 2014, "st_dist": 178.5},
+    {"pl_name": "Proxima Cen b", "pl_discmethod": "Radial Velocity", "pl_rade": 1.07, "pl_eqt": 234,
+     "pl_orbper": 11.2, "pl_insol": 0.65, "pl_disc": 2016, "st_dist": 1.3},
+    {"pl_name": "51 Peg b", "pl_discmethod": "Radial Velocity", "pl_rade": None, "pl_eqt": 1284,
+     "pl_orbper": 4.23, "pl_insol": None, "pl_disc": 1995, "st_dist": 15.5},
+    {"pl_name": "OGLE-2005-BLG-390L b", "pl_discmethod": "Microlensing", "pl_rade": None, "pl_eqt": 50,
+     "pl_orbper": 3500, "pl_insol": None, "pl_disc": 2005, "st_dist": 6500},
+    {"pl_name": "Unconfirmed 1", "pl_discmethod": "", "pl_rade": 1.4, "pl_eqt": 280, "pl_orbper": None,
+     "pl_insol": None, "pl_disc": None, "st_dist": None},
+]
+
+DELTA = [
+    # Proxima Cen b re-measured out of the habitable range
+    dict(RECORDS[1], pl_rade=2.8, pl_eqt=330),
+    # The only microlensing planet gets its method corrected, so its count reaches zero
+    dict(RECORDS[3], pl_discmethod="Imaging", pl_disc=2006),
+    # Unchanged row fetched again
+    dict(RECORDS[0]),
+    {"pl_name": "TOI-700 d", "pl_discmethod": "Transit", "pl_rade": 1.19, "pl_eqt": 268, "pl_orbper": 37.4,
+     "pl_insol": 0.86, "pl_disc": 2020, "st_dist": 31.1},
+    {"pl_name": "Kepler-1649 c", "pl_discmethod": "Transit", "pl_rade": 1.06, "pl_eqt": 234, "pl_orbper": 19.5,
+     "pl_insol": 0.75, "pl_disc": 2020, "st_dist": 92.0},
+]
+
+
+def from_scratch(index):
+    return DiscoveryStats.from_columns(**discovery_columns(index, np.arange(len(index))), version=index.version)
+
+
+def assert_same_stats(stats, expected):
+    assert stats.total == expected.total
+    assert stats.habitable_count == expected.habitable_count
+    assert stats.discovery_methods == expected.discovery_methods
+    assert stats.discoveries_by_year == expected.discoveries_by_year
+    assert stats.as_dict() == expected.as_dict()
+
+
+def test_updated_equals_stats_of_the_merged_catalog():
+    catalog = ExoplanetCatalog.from_records(RECORDS)
+    index = HabitabilityIndex(catalog)
+    stats = from_scratch(index)
+
+    merged, merged_index, changed = apply_delta(catalog, index, DELTA)
+    updated = stats.updated(
+        removed=discovery_columns(index, changed[changed < len(catalog)]),
+        added=discovery_columns(merged_index, changed),
+        version=merged_index.version
+    )
+
+    expected = from_scratch(HabitabilityIndex(merged))
+    assert_same_stats(updated, expected)
+    assert "Microlensing" not in updated.discovery_methods
+    assert updated.discoveries_by_year[2020] == 2
+    assert updated.version == merged.version
+
+
+def test_updated_without_changes_keeps_the_stats():
+    catalog = ExoplanetCatalog.from_records(RECORDS)
+    stats = from_scratch(HabitabilityIndex(catalog))
+    empty = {"methods": [], "years": [], "habitable": []}
+
+    assert_same_stats(stats.updated(empty, empty, stats.version), stats)
+
+
+def test_from_columns_counts_unknown_values():
+    stats = DiscoveryStats.from_columns(["Transit", "", "Transit"], [2014, np.nan, 2020], [True, False, False])
+
+    assert stats.total == 3 and stats.habitable_count == 1
+    assert stats.discovery_methods == {"Transit": 2, "Unknown": 1}
+    assert stats.discoveries_by_year == {2014: 1, 2020: 1}
+
+
+def test_planet_store_counts_planets_meeting_the_habitable_criteria():
+    store = load_planet_store(os.path.join(os.path.dirname(__file__), "..", "data", "planets.json"))
+    expected = habitable_mask(
+        [planet.habitability_score for planet in store.planets],
+        [planet.size_comparison.earth_radius for planet in store.planets],
+        [planet.eq_temperature for planet in store.planets]
+    )
+
+    assert store.stats.habitable_count == int(np.count_nonzero(expected))
+    assert 0 < store.stats.habitable_count < len(store)
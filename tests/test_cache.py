@@ -0,0 +1,211 @@
+import os
+import sys
+import asyncio
+import subprocess
+
+import pytest
+
+from api.cache import CacheBackend, MemoryBackend, ResponseCache, SQLiteBackend, create_cache_backend
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_in_other_process(code: str) -> str:
+    """Run Python code in a fresh interpreter with the repository importable, returning its output"""
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=60, check=True)
+    return result.stdout.strip()
+
+
+class FakeClock:
+    """Stands in for ``time.time`` in api.cache"""
+
+    def __init__(self, monkeypatch, now: float = 1_000_000.0):
+        self.now = now
+        monkeypatch.setattr("api.cache.time.time", lambda: self.now)
+
+
+class CountingFetch:
+    """Fetch coroutine returning "value-<n>" for its n-th call, optionally waiting on an event first"""
+
+    def __init__(self, gate: asyncio.Event = None, error: Exception = None):
+        self.calls = 0
+        self.gate = gate
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return f"value-{self.calls}"
+
+
+def test_sqlite_backend_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(ttl=60, backend=SQLiteBackend(path))
+    cache.set("figure:a", {"data": [1, 2.5, None], "layout": "x"})
+
+    # Another worker sees the entry and stores one of its own
+    output = run_in_other_process(
+        "from api.cache import ResponseCache, SQLiteBackend\n"
+        f"cache = ResponseCache(ttl=60, backend=SQLiteBackend({path!r}))\n"
+        "print(cache.get('figure:a'))\n"
+        "cache.set('figure:b', '<html></html>')\n"
+    )
+    assert output == "{'data': [1, 2.5, None], 'layout': 'x'}"
+    assert cache.get("figure:b") == "<html></html>"
+    assert len(cache) == 2
+
+
+def test_sqlite_entries_expire(tmp_path, monkeypatch):
+    clock = FakeClock(monkeypatch)
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    cache = ResponseCache(ttl=10, stale_ttl=5, backend=backend)
+    cache.set("key", "value")
+
+    clock.now += 9.9
+    assert cache.get("key") == "value"
+    clock.now += 0.2
+    assert cache.get("key") is None  # stale: only get_or_fetch serves it
+    assert len(backend) == 1
+    clock.now += 5
+    assert cache.get("key") is None
+    assert len(backend) == 0  # dropped once past the stale window
+
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache = ResponseCache(backend=backend)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    assert backend.evictions == 1
+
+
+def test_create_cache_backend(tmp_path):
+    assert type(create_cache_backend("memory", max_entries=4)).__name__ == "MemoryBackend"
+    backend = create_cache_backend("sqlite", max_entries=4, path=str(tmp_path / "c.sqlite3"))
+    assert isinstance(backend, SQLiteBackend) and backend.max_entries == 4
+    with pytest.raises(ValueError):
+        create_cache_backend("redis", max_entries=4)
+
+
+def test_backends_implement_the_interface():
+    with pytest.raises(TypeError):
+        CacheBackend()
+    assert isinstance(MemoryBackend(), CacheBackend)
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    cache = ResponseCache(ttl=10)
+    cache.set("key", "value")
+    clock.now += 9.9
+    assert cache.get("key") == "value"
+    clock.now += 0.1
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_memory_backend_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 2
+
+
+def test_get_or_fetch_caches_until_the_ttl(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    cache = ResponseCache(ttl=10)
+    fetch = CountingFetch()
+
+    async def scenario():
+        assert await cache.get_or_fetch("key", fetch) == "value-1"
+        assert await cache.get_or_fetch("key", fetch) == "value-1"
+        clock.now += 11
+        assert await cache.get_or_fetch("key", fetch) == "value-2"
+
+    asyncio.run(scenario())
+    assert fetch.calls == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_stale_value_is_served_while_it_is_refreshed(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    cache = ResponseCache(ttl=10, stale_ttl=5)
+    fetch = CountingFetch()
+
+    async def scenario():
+        await cache.get_or_fetch("key", fetch)
+        clock.now += 12
+        gate = fetch.gate = asyncio.Event()
+        # Stale hits answer at once; only one background refresh starts
+        assert await cache.get_or_fetch("key", fetch) == "value-1"
+        assert await cache.get_or_fetch("key", fetch) == "value-1"
+        gate.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert await cache.get_or_fetch("key", fetch) == "value-2"
+
+    asyncio.run(scenario())
+    assert fetch.calls == 2
+    assert cache.stats()["stale_hits"] == 2 and cache.stats()["hits"] == 1
+
+
+def test_values_past_the_stale_window_are_fetched_again(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    cache = ResponseCache(ttl=10, stale_ttl=5)
+    fetch = CountingFetch()
+
+    async def scenario():
+        await cache.get_or_fetch("key", fetch)
+        clock.now += 15
+        return await cache.get_or_fetch("key", fetch)
+
+    assert asyncio.run(scenario()) == "value-2"
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = ResponseCache(ttl=10)
+
+    async def scenario():
+        fetch = CountingFetch(gate=asyncio.Event())
+        waiters = [asyncio.ensure_future(cache.get_or_fetch("key", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        fetch.gate.set()
+        return fetch, await asyncio.gather(*waiters)
+
+    fetch, values = asyncio.run(scenario())
+    assert fetch.calls == 1 and values == ["value-1"] * 5
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 4
+
+
+def test_fetch_errors_reach_every_waiter_and_are_not_cached():
+    cache = ResponseCache(ttl=10)
+
+    async def scenario():
+        failing = CountingFetch(gate=asyncio.Event(), error=RuntimeError("archive down"))
+        waiters = [asyncio.ensure_future(cache.get_or_fetch("key", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        failing.gate.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results) and failing.calls == 1
+        return await cache.get_or_fetch("key", CountingFetch())
+
+    assert asyncio.run(scenario()) == "value-1"
+
+
+def test_memory_backend_drops_expired_entries_when_storing(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    cache = ResponseCache(ttl=10, stale_ttl=5)
+    cache.set("large", list(range(1000)))
+    clock.now += 15
+    cache.set("other", 1)
+    assert len(cache) == 1 and cache.get("other") == 1
@@ -0,0 +1,83 @@
+import datetime
+
+import numpy as np
+
+from api.catalog import CATALOG_COLUMNS, CATALOG_QUERY, ExoplanetCatalog, projection_query
+
+RECORDS = [
+    {"pl_name": "Kepler-22 b", "pl_discmethod": "Transit", "disc_pubdate": "2011-12", "pl_rade": 2.38,
+     "pl_eqt": 262, "pl_orbper": 289.9, "pl_insol": 1.11, "pl_disc": 2011, "st_dist": 195.0},
+    {"pl_name": "Proxima Cen b", "pl_discmethod": "Radial Velocity", "pl_rade": None, "pl_eqt": 234,
+     "pl_disc": 2016, "st_dist": 1.3},
+]
+
+
+def test_from_records_keeps_the_first_row_per_planet():
+    catalog = ExoplanetCatalog.from_records(RECORDS + [dict(RECORDS[0], pl_rade=3.0), {"pl_name": None}])
+    assert len(catalog) == 2
+    assert catalog.record(0)["pl_rade"] == 2.38
+    assert catalog.index_of("Proxima Cen b") == 1
+    assert catalog.index_of("Kepler-23 b") is None
+
+
+def test_record_round_trips_missing_values():
+    catalog = ExoplanetCatalog.from_records(RECORDS)
+    record = catalog.record(1)
+    assert record["pl_rade"] is None and record["disc_pubdate"] is None and record["pl_insol"] is None
+    assert record["pl_disc"] == 2016 and isinstance(record["pl_disc"], int)
+    assert catalog.record(0) == {column: RECORDS[0].get(column) for column in CATALOG_COLUMNS}
+
+
+def test_save_and_load(tmp_path):
+    ingested_at = datetime.datetime(2024, 1, 10, 12, 30)
+    catalog = ExoplanetCatalog.from_records(RECORDS, ingested_at=ingested_at)
+    path = str(tmp_path / "snapshots" / "catalog.npz")
+    catalog.save(path)
+
+    loaded = ExoplanetCatalog.load(path)
+    assert loaded.version == catalog.version
+    assert loaded.ingested_at == ingested_at
+    assert loaded.records(range(2)) == catalog.records(range(2))
+    assert list(tmp_path.joinpath("snapshots").iterdir()) == [tmp_path / "snapshots" / "catalog.npz"]
+
+
+def test_load_fills_columns_missing_from_older_snapshots(tmp_path):
+    catalog = ExoplanetCatalog.from_records(RECORDS)
+    path = str(tmp_path / "catalog.npz")
+    columns = {column: values for column, values in catalog.columns.items() if column not in ("disc_pubdate", "st_dist")}
+    np.savez(path, __ingested_at__=np.array(catalog.ingested_at.isoformat()), **columns)
+
+    loaded = ExoplanetCatalog.load(path)
+    assert loaded.column("disc_pubdate").tolist() == ["", ""]
+    assert np.isnan(loaded.column("st_dist")).all()
+
+
+def test_merge_updates_changed_rows_and_appends_new_planets():
+    catalog = ExoplanetCatalog.from_records(RECORDS)
+    merged, changed = catalog.merge([
+        dict(RECORDS[0]),
+        dict(RECORDS[1], pl_rade=1.07, pl_discmethod="Transit, re-analysed"),
+        {"pl_name": "TOI-700 d", "pl_rade": 1.19},
+    ])
+
+    assert changed.tolist() == [1, 2]
+    assert merged.record(0) == catalog.record(0)
+    assert merged.record(1)["pl_rade"] == 1.07
+    assert merged.record(1)["pl_discmethod"] == "Transit, re-analysed"
+    assert merged.record(2)["pl_name"] == "TOI-700 d"
+    assert merged.index_of("TOI-700 d") == 2
+    assert merged.version != catalog.version
+    # The original catalog is not modified
+    assert catalog.record(1)["pl_rade"] is None and len(catalog) == 2
+
+
+def test_merge_without_changes_keeps_the_version():
+    catalog = ExoplanetCatalog.from_records(RECORDS)
+    merged, changed = catalog.merge(RECORDS)
+    assert len(changed) == 0 and merged.version == catalog.version
+
+
+def test_projection_query_aliases_archive_columns():
+    assert projection_query(["pl_name", "pl_disc"], where="pl_rade < 2") == \
+        "select pl_name, disc_year as pl_disc from pscomppars where pl_rade < 2"
+    assert "discoverymethod as pl_discmethod" in CATALOG_QUERY
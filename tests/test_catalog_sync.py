@@ -0,0 +1,172 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from api.catalog import ExoplanetCatalog
+from api.catalog_sync import SyncState, apply_delta, delta_query, latest_change
+from api.habitability import HabitabilityIndex
+
+RECORDS = [
+    {"pl_name": "Kepler-22 b", "pl_discmethod": "Transit", "pl_rade": 2.38, "pl_eqt": 262, "pl_orbper": 289.9,
+     "pl_insol": 1.11, "pl_disc": 2011, "st_dist": 195.0, "rowupdate": "2024-01-10"},
+    {"pl_name": "Proxima Cen b", "pl_discmethod": "Radial Velocity", "pl_rade": None, "pl_eqt": 234,
+     "pl_orbper": 11.2, "pl_insol": 0.65, "pl_disc": 2016, "st_dist": 1.3, "rowupdate": "2024-01-12"},
+    {"pl_name": "51 Peg b", "pl_discmethod": "Radial Velocity", "pl_rade": None, "pl_eqt": 1284,
+     "pl_orbper": 4.23, "pl_insol": None, "pl_disc": 1995, "st_dist": 15.5, "rowupdate": "2023-11-02"},
+]
+
+
+@pytest.fixture
+def catalog():
+    return ExoplanetCatalog.from_records(RECORDS)
+
+
+def test_apply_delta_updates_and_appends_rows(catalog):
+    index = HabitabilityIndex(catalog)
+    delta = [
+        dict(RECORDS[1], pl_rade=1.07),
+        dict(RECORDS[2]),  # fetched again without changes
+        {"pl_name": "TOI-700 d", "pl_discmethod": "Transit", "pl_rade": 1.19, "pl_eqt": 268, "pl_disc": 2020},
+    ]
+
+    merged, merged_index, changed = apply_delta(catalog, index, delta)
+
+    assert changed.tolist() == [1, 3]
+    assert merged.column("pl_name").tolist() == ["Kepler-22 b", "Proxima Cen b", "51 Peg b", "TOI-700 d"]
+    assert merged.record(1)["pl_rade"] == 1.07
+    assert merged.version != catalog.version
+    assert merged_index.version == merged.version
+    np.testing.assert_array_equal(merged_index.scores, HabitabilityIndex(merged).scores)
+    np.testing.assert_array_equal(merged_index.by_score, HabitabilityIndex(merged).by_score)
+    # The old snapshot is left alone
+    assert catalog.record(1)["pl_rade"] is None
+
+
+def test_apply_delta_without_changes_keeps_the_catalog(catalog):
+    index = HabitabilityIndex(catalog)
+    merged, merged_index, changed = apply_delta(catalog, index, RECORDS)
+    assert merged is catalog and merged_index is index and len(changed) == 0
+
+
+def test_apply_delta_rebuilds_an_index_of_another_version(catalog):
+    stale_index = HabitabilityIndex(ExoplanetCatalog.from_records(RECORDS[:1]))
+    merged, merged_index, _ = apply_delta(catalog, stale_index, [dict(RECORDS[0], pl_eqt=300)])
+    np.testing.assert_array_equal(merged_index.scores, HabitabilityIndex(merged).scores)
+
+
+def test_delta_query_selects_rows_changed_since_the_watermark():
+    query = delta_query("2024-01-10")
+    assert query.endswith("where rowupdate >= '2024-01-10' or releasedate >= '2024-01-10'")
+    with pytest.raises(ValueError):
+        delta_query("2024-01-10' or 1=1 --")
+
+
+def test_latest_change():
+    assert latest_change(RECORDS) == "2024-01-12"
+    assert latest_change([{"pl_name": "x"}]) is None
+
+
+def test_sync_state_round_trip(tmp_path):
+    path = str(tmp_path / "sync.json")
+    state = SyncState()
+    state.advance(RECORDS)
+    state.save(path)
+
+    loaded = SyncState.load(path)
+    assert loaded == state and loaded.watermark == "2024-01-12"
+    assert not loaded.is_due(3600)
+    loaded.synced_at -= datetime.timedelta(hours=2)
+    assert loaded.is_due(3600)
+
+
+def test_sync_state_watermark_never_moves_back():
+    state = SyncState(watermark="2024-02-01")
+    state.advance(RECORDS)
+    assert state.watermark == "2024-02-01"
+
+
+def test_unreadable_sync_state_starts_over(tmp_path):
+    path = tmp_path / "sync.json"
+    path.write_text('{"watermark": "yesterday"}')
+    assert SyncState.load(str(path)) == SyncState()
+    assert SyncState.load(str(tmp_path / "missing.json")) == SyncState()
+
+
+ARCHIVE_ROWS = [dict(record, releasedate="2023-05-01") for record in RECORDS]
+
+
+def sync_service(monkeypatch, tmp_path, archive_url):
+    """The FastAPI service module reset to an empty catalog that ingests from ``archive_url``"""
+    import asyncio
+    import api.http_client
+    import api.exoplanet_service as svc
+    from api.cache import ResponseCache
+
+    monkeypatch.setattr(svc, "CATALOG_FIXTURE_PATH", None)
+    monkeypatch.setattr(svc, "CATALOG_SNAPSHOT_PATH", str(tmp_path / "catalog.npz"))
+    monkeypatch.setattr(svc, "CATALOG_SYNC_STATE_PATH", str(tmp_path / "sync.json"))
+    monkeypatch.setattr(svc, "NASA_EXOPLANET_ARCHIVE_API", f"{archive_url}/TAP/sync")
+    monkeypatch.setattr(svc, "cache", ResponseCache(ttl=0))
+    for name in ("_catalog", "_sync_state", "_habitability_index", "_name_index", "_discovery_stats",
+                 "_discovery_index", "_refresh_task"):
+        monkeypatch.setattr(svc, name, None)
+    monkeypatch.setattr(svc, "_catalog_lock", asyncio.Lock())
+    monkeypatch.setattr(api.http_client, "_client", None)
+    return svc
+
+
+def test_sync_merges_archive_changes_and_advances_the_watermark(monkeypatch, tmp_path, stand_in_server):
+    import asyncio
+    import api.http_client
+
+    archive = {"rows": ARCHIVE_ROWS, "delta": []}
+
+    def respond(path, params):
+        delta = "rowupdate >=" in params["query"]
+        return 200, stand_in_server.json(archive["delta"] if delta else archive["rows"])
+
+    stand_in_server.respond = respond
+    svc = sync_service(monkeypatch, tmp_path, stand_in_server.url)
+
+    async def scenario():
+        try:
+            # Full ingest: the watermark starts at the latest change in the archive
+            catalog = await svc.get_catalog()
+            assert len(catalog) == 3 and svc.get_sync_state().watermark == "2024-01-12"
+
+            # One planet updated and one added upstream
+            archive["delta"] = [
+                dict(ARCHIVE_ROWS[1], pl_rade=1.07, rowupdate="2024-02-01"),
+                dict(ARCHIVE_ROWS[0]),
+                {"pl_name": "TOI-700 d", "pl_discmethod": "Transit", "pl_rade": 1.19, "pl_eqt": 268,
+                 "pl_disc": 2020, "rowupdate": "2024-02-03", "releasedate": "2024-02-03"},
+            ]
+            async with svc._catalog_lock:
+                await svc.refresh_catalog(force_sync=True)
+            merged = await svc.get_catalog()
+            assert stand_in_server.requests[-1][1]["query"].endswith(
+                "where rowupdate >= '2024-01-12' or releasedate >= '2024-01-12'"
+            )
+            assert merged.column("pl_name").tolist() == ["Kepler-22 b", "Proxima Cen b", "51 Peg b", "TOI-700 d"]
+            assert merged.record(1)["pl_rade"] == 1.07
+            np.testing.assert_array_equal(
+                (await svc.get_habitability_index()).scores, HabitabilityIndex(merged).scores
+            )
+            assert SyncState.load(str(tmp_path / "sync.json")).watermark == "2024-02-03"
+            assert ExoplanetCatalog.load(str(tmp_path / "catalog.npz")).version == merged.version
+
+            # Nothing changed since: the catalog and watermark stay, the sync time moves
+            archive["delta"] = []
+            synced_at = svc.get_sync_state().synced_at
+            async with svc._catalog_lock:
+                await svc.refresh_catalog(force_sync=True)
+            assert (await svc.get_catalog()) is merged
+            assert stand_in_server.requests[-1][1]["query"].endswith("rowupdate >= '2024-02-03' or releasedate >= '2024-02-03'")
+            state = SyncState.load(str(tmp_path / "sync.json"))
+            assert state.watermark == "2024-02-03" and state.synced_at > synced_at
+            assert len(stand_in_server.requests) == 3
+        finally:
+            await api.http_client.close_http_client()
+
+    asyncio.run(scenario())
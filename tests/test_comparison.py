@@ -0,0 +1,73 @@
+import pytest
+
+from api.comparison import MAX_BULK_NAMES, comparison_deltas, dedupe_resolved, parse_names
+
+
+def test_parse_names_drops_blanks_and_exact_repeats():
+    assert parse_names(" Kepler-186f, ,TOI-700 d,Kepler-186f,") == ["Kepler-186f", "TOI-700 d"]
+
+
+@pytest.mark.parametrize("names", [None, "", " , ,", ",".join(f"Planet {i}" for i in range(MAX_BULK_NAMES + 1))])
+def test_parse_names_rejects_empty_and_too_long_lists(names):
+    with pytest.raises(ValueError):
+        parse_names(names)
+
+
+def test_parse_names_accepts_the_limit():
+    assert len(parse_names(",".join(f"Planet {i}" for i in range(MAX_BULK_NAMES)))) == MAX_BULK_NAMES
+
+
+def test_dedupe_resolved_keeps_the_first_spelling_of_each_planet():
+    names = ["kepler-186 f", "Nowhere b", "Kepler-186f", "TOI-700 d", "Nowhere c", "KEPLER-186F"]
+    rows = [0, None, 0, 5, None, 0]
+
+    assert dedupe_resolved(names, rows) == (["kepler-186 f", "Nowhere b", "TOI-700 d", "Nowhere c"], [0, None, 5, None])
+
+
+def test_comparison_deltas():
+    deltas = comparison_deltas(["a", "b"], {
+        "earth_radius": [1.0, 1.5], "eq_temperature": [250, None], "distance": [10.0, 4.2],
+        "habitability_score": [0.9, 0.6]
+    })
+    assert deltas == [{"name": "b", "earth_radius": 0.5, "eq_temperature": None, "distance": -5.8,
+                       "habitability_score": -0.3}]
+
+
+def test_bulk_lookup_returns_each_planet_once(service):
+    response = service.get("/api/exoplanets", params={"names": "kepler-186 f,Kepler-186f,proxima b,KEPLER186F"})
+
+    assert response.status_code == 200
+    assert [planet["name"] for planet in response.json()] == ["Kepler-186f", "Proxima b"]
+
+
+def test_bulk_lookup_reports_only_unknown_names(service):
+    response = service.get("/api/exoplanets", params={"names": "Kepler-186f,Keplr-442b,kepler-186 f,Nowhere b"})
+
+    assert response.status_code == 404
+    detail = response.json()["detail"]
+    assert detail["error"] == "Exoplanets not found: Keplr-442b, Nowhere b"
+    assert "Kepler-442b" in detail["suggestions"]["Keplr-442b"]
+
+
+def test_compare_needs_two_distinct_planets(service):
+    assert service.get("/api/exoplanets/compare", params={"names": "Kepler-186f,kepler-186 f"}).status_code == 400
+
+    response = service.get("/api/exoplanets/compare", params={"names": "Kepler-186f,kepler-186 f,TOI-700 d"})
+    assert response.status_code == 200
+    assert [delta["name"] for delta in response.json()["deltas"]] == ["TOI-700 d"]
+
+
+def test_bulk_lookup_limits_the_number_of_names(service):
+    names = ",".join(f"Planet {i}" for i in range(MAX_BULK_NAMES + 1))
+    assert service.get("/api/exoplanets", params={"names": names}).status_code == 400
+
+
+def test_flask_bulk_lookup_returns_each_planet_once():
+    import main
+
+    client = main.app.test_client()
+    response = client.get("/api/exoplanets", query_string={"names": "kepler-186 f,Kepler-186f,proxima b"})
+    assert [planet["name"] for planet in response.get_json()] == ["Kepler-186f", "Proxima b"]
+
+    response = client.get("/api/exoplanets/compare", query_string={"names": "Kepler-186f,KEPLER-186F"})
+    assert response.status_code == 400
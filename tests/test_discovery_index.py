@@ -0,0 +1,107 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from api.discovery_index import DiscoveryIndex, discovery_period, resolve_window
+
+DATES = ["2024-03-15", "2024-02", "", None, "2023-12-31", "2025-00", "2024-06-01", None]
+YEARS = [2024, 2024, 2024, 2019, np.nan, 2025, 2024, np.nan]
+
+
+@pytest.fixture
+def index():
+    return DiscoveryIndex.from_dates(DATES, YEARS)
+
+
+def window_rows(index, since=None, until=None):
+    return index.rows[index.window(since, until)].tolist()
+
+
+def brute_force_rows(since=None, until=None):
+    """Rows whose discovery period overlaps ``[since, until]``, newest first"""
+    matches = []
+    for row, (date, year) in enumerate(zip(DATES, YEARS)):
+        period = discovery_period(date, year)
+        if period is None:
+            continue
+        first, last, _ = period
+        if (since is None or last >= since) and (until is None or first <= until):
+            matches.append((first, row))
+    return [row for _, row in sorted(matches, key=lambda match: match[0], reverse=True)]
+
+
+def test_discovery_period_precision():
+    assert discovery_period("2024-03-15") == (datetime.date(2024, 3, 15), datetime.date(2024, 3, 15), "day")
+    assert discovery_period("2024-02") == (datetime.date(2024, 2, 1), datetime.date(2024, 2, 29), "month")
+    assert discovery_period("2024") == (datetime.date(2024, 1, 1), datetime.date(2024, 12, 31), "year")
+    assert discovery_period("2025-00", 2025) == (datetime.date(2025, 1, 1), datetime.date(2025, 12, 31), "year")
+    assert discovery_period("", 2019.0)[2] == "year"
+    assert discovery_period(None, np.nan) is None
+
+
+def test_open_window_holds_every_dated_planet_newest_first(index):
+    assert len(index) == 7
+    assert window_rows(index) == brute_force_rows()
+    assert index.dates[index.window()].tolist() == sorted(index.dates.tolist(), reverse=True)
+
+
+@pytest.mark.parametrize("since, until", [
+    (datetime.date(2024, 6, 1), None),
+    (datetime.date(2024, 12, 31), None),
+    (datetime.date(2025, 1, 1), None),
+    (None, datetime.date(2023, 12, 31)),
+    (None, datetime.date(2024, 1, 1)),
+    (datetime.date(2024, 2, 29), datetime.date(2024, 3, 1)),
+    (datetime.date(2024, 3, 16), datetime.date(2024, 5, 31)),
+    (datetime.date(2020, 1, 1), datetime.date(2020, 12, 31)),
+])
+def test_window_matches_overlapping_periods(index, since, until):
+    assert window_rows(index, since, until) == brute_force_rows(since, until)
+
+
+def test_year_precision_planets_overlap_windows_within_their_year(index):
+    # Row 2 is only known to be from 2024
+    assert 2 in window_rows(index, datetime.date(2024, 11, 1))
+    assert 2 in window_rows(index, None, datetime.date(2024, 1, 1))
+    assert 2 not in window_rows(index, datetime.date(2025, 1, 1))
+    assert 2 not in window_rows(index, None, datetime.date(2023, 12, 31))
+    # Row 1 is from February 2024
+    assert 1 in window_rows(index, datetime.date(2024, 2, 29), datetime.date(2024, 2, 29))
+    assert 1 not in window_rows(index, datetime.date(2024, 3, 1))
+
+
+def test_resolve_window():
+    today = datetime.date(2026, 5, 10)
+    assert resolve_window("all", today=today) == (None, None)
+    assert resolve_window("last-year", today=today) == (datetime.date(2025, 1, 1), None)
+    assert resolve_window("30d", today=today) == (datetime.date(2026, 4, 10), None)
+    assert resolve_window("all", since="2024-01-01", today=today) == (datetime.date(2024, 1, 1), None)
+    assert resolve_window(until="2024-01-01", today=today) == (None, datetime.date(2024, 1, 1))
+    for window, since, until in [("0d", None, None), ("week", None, None), (None, "2024-02-01", "2024-01-01")]:
+        with pytest.raises(ValueError):
+            resolve_window(window, since, until, today=today)
+
+
+@pytest.mark.parametrize("window", ["all", "last-year", "3650d"])
+def test_discovery_visualization_renders_every_window(service, window):
+    discoveries = service.get("/api/exoplanets/discovered", params={"window": window}).json()
+    response = service.get("/api/exoplanets/discovered/visualization", params={"window": window})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    if discoveries:
+        assert "timeline-chart" in response.text
+        assert all(planet["name"] in response.text for planet in discoveries)
+
+
+def test_discovery_visualization_of_year_precision_planets(service):
+    discoveries = service.get("/api/exoplanets/discovered", params={"window": "all"}).json()
+    assert discoveries and any(planet["discovery_date_precision"] == "year" for planet in discoveries)
+
+    response = service.get("/api/exoplanets/discovered/visualization", params={"window": "all"})
+    figure = service.get("/api/exoplanets/discovered/figure.json", params={"window": "all"})
+
+    assert response.status_code == 200 and "timeline-chart" in response.text
+    assert figure.status_code == 200
+    assert sum(len(trace["x"]) for trace in figure.json()["figures"]["timeline"]["data"]) == len(discoveries)
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+
+from api.events import EVENT_RETRY_MS, EventBroadcaster, TooManySubscribers, format_event
+
+
+def test_format_event():
+    assert format_event("stats", {"total": 3}, event_id="v1", retry_ms=1000) == \
+        b'retry: 1000\nid: v1\nevent: stats\ndata: {"total": 3}\n\n'
+    assert format_event("discoveries", []) == b"event: discoveries\ndata: []\n\n"
+
+
+def test_publish_reaches_every_subscriber():
+    async def scenario():
+        broadcaster = EventBroadcaster()
+        subscriptions = [broadcaster.subscribe() for _ in range(3)]
+        delivered = broadcaster.publish("stats", {"total": 3}, event_id="v2")
+        return delivered, [subscription.queue.get_nowait() for subscription in subscriptions]
+
+    delivered, messages = asyncio.run(scenario())
+    assert delivered == 3
+    assert messages == [format_event("stats", {"total": 3}, event_id="v2")] * 3
+    # Encoded once and shared
+    assert len({id(message) for message in messages}) == 1
+
+
+def test_queues_are_bounded_and_slow_subscribers_are_evicted():
+    async def scenario():
+        broadcaster = EventBroadcaster(buffer_size=2)
+        slow = broadcaster.subscribe()
+        fast = broadcaster.subscribe()
+        received = []
+        for total in range(5):
+            broadcaster.publish("stats", {"total": total})
+            received.append(fast.queue.get_nowait())  # the fast subscriber keeps up
+        return broadcaster, slow, fast, received
+
+    broadcaster, slow, fast, received = asyncio.run(scenario())
+    assert slow.evicted and not fast.evicted
+    # The backlog is dropped and the stream is told to end
+    assert slow.queue.qsize() == 1 and slow.queue.get_nowait() is None
+    assert [json.loads(message.split(b"data: ")[1]) for message in received] == [{"total": total} for total in range(5)]
+    assert len(broadcaster) == 1
+    assert broadcaster.stats() == {"subscribers": 1, "published": 5, "evicted": 1}
+
+
+def test_evicted_stream_ends_while_others_keep_receiving():
+    async def scenario():
+        broadcaster = EventBroadcaster(buffer_size=1)
+        slow = broadcaster.subscribe()
+        fast = broadcaster.subscribe()
+        slow_stream = broadcaster.stream(slow)
+        fast_stream = broadcaster.stream(fast, [b"initial\n\n"])
+        assert await slow_stream.__anext__() == f"retry: {EVENT_RETRY_MS}\n\n".encode("utf-8")
+        assert await fast_stream.__anext__() == f"retry: {EVENT_RETRY_MS}\n\n".encode("utf-8")
+        assert await fast_stream.__anext__() == b"initial\n\n"
+
+        broadcaster.publish("stats", {"total": 1})
+        first = await fast_stream.__anext__()
+        broadcaster.publish("stats", {"total": 2})  # the slow subscriber still has the first event queued
+        second = await fast_stream.__anext__()
+
+        slow_rest = [message async for message in slow_stream]
+        broadcaster.publish("stats", {"total": 3})
+        third = await fast_stream.__anext__()
+        await fast_stream.aclose()
+        return broadcaster, slow_rest, [first, second, third]
+
+    broadcaster, slow_rest, fast_messages = asyncio.run(scenario())
+    assert slow_rest == []
+    assert fast_messages == [format_event("stats", {"total": total}) for total in (1, 2, 3)]
+    # Both streams unsubscribed when they ended
+    assert len(broadcaster) == 0
+
+
+def test_idle_stream_sends_keepalive_comments():
+    async def scenario():
+        broadcaster = EventBroadcaster(keepalive_interval=0.01)
+        stream = broadcaster.stream(broadcaster.subscribe())
+        messages = [await stream.__anext__() for _ in range(3)]
+        broadcaster.publish("stats", {"total": 1})
+        messages.append(await stream.__anext__())
+        await stream.aclose()
+        return messages
+
+    messages = asyncio.run(scenario())
+    assert messages[1:3] == [b": keepalive\n\n"] * 2
+    assert messages[3] == format_event("stats", {"total": 1})
+
+
+def test_subscribers_beyond_the_limit_are_rejected():
+    async def scenario():
+        broadcaster = EventBroadcaster(max_subscribers=2)
+        first = broadcaster.subscribe()
+        broadcaster.subscribe()
+        with pytest.raises(TooManySubscribers):
+            broadcaster.subscribe()
+        broadcaster.unsubscribe(first)
+        broadcaster.subscribe()
+        return len(broadcaster)
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_events_route_answers_503_past_the_subscriber_limit(service, monkeypatch):
+    import api.exoplanet_service as svc
+
+    monkeypatch.setattr(svc, "event_broadcaster", EventBroadcaster(max_subscribers=0))
+    response = service.get("/api/events")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(svc.EVENT_RETRY_MS // 1000)
@@ -0,0 +1,41 @@
+import json
+import os
+
+import api.exoplanet_service as svc
+from api.catalog import ExoplanetCatalog
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "ps_fixture.json")
+
+NEW_PLANET = {"pl_name": "Kepler-1649 c", "pl_discmethod": "Transit", "pl_rade": 1.06, "pl_eqt": 234,
+              "pl_orbper": 19.5, "pl_insol": 0.75, "pl_disc": 2020, "st_dist": 92.0}
+
+
+def figure_names(response):
+    return response.json()["figures"]["scatter"]["data"][0]["hovertext"]
+
+
+def test_figure_is_built_from_the_catalog_its_key_names(service, monkeypatch):
+    assert service.get("/api/dashboard/stats").status_code == 200  # loads the catalog
+    old_catalog = svc._catalog
+    with open(FIXTURE_PATH) as f:
+        new_catalog = ExoplanetCatalog.from_records(json.load(f) + [NEW_PLANET])
+
+    # A refresh completes after the figure was keyed on the old catalog, before it is built
+    list_habitable_exoplanets = svc.list_habitable_exoplanets
+    built_from = []
+
+    def refresh_then_list(catalog):
+        svc._catalog = new_catalog
+        built_from.append(catalog)
+        return list_habitable_exoplanets(catalog)
+
+    monkeypatch.setattr(svc, "list_habitable_exoplanets", refresh_then_list)
+    first = service.get("/api/exoplanets/habitable/figure.json")
+    # Neither the figure nor the response of the first request is kept under the new version
+    second = service.get("/api/exoplanets/habitable/figure.json")
+
+    assert built_from == [old_catalog, new_catalog]
+    assert figure_names(first) == [planet.name for planet in list_habitable_exoplanets(old_catalog)]
+    assert "Kepler-1649 c" not in figure_names(first)
+    assert "Kepler-1649 c" in figure_names(second)
+    assert svc.figure_cache.stats()["misses"] == 2
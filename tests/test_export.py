@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from api.catalog import ExoplanetCatalog
+from api.export import (
+    CATALOG_EXPORT_COLUMNS, LISTING_EXPORT_COLUMNS, catalog_export_batches, export_records, record_batches,
+    serialize_export
+)
+
+RECORDS = [
+    {"pl_name": "Kepler-186 f", "pl_discmethod": "Transit", "pl_rade": 1.17, "pl_eqt": 188, "pl_orbper": 129.9,
+     "pl_insol": 0.29, "pl_disc": 2014, "st_dist": 178.5},
+    {"pl_name": "Proxima Cen b", "pl_discmethod": "Radial Velocity", "pl_rade": None, "pl_eqt": 234,
+     "pl_orbper": 11.2, "pl_insol": 0.65, "pl_disc": 2016, "st_dist": 1.3},
+    {"pl_name": "Unconfirmed 1", "pl_discmethod": None, "pl_rade": 1.9, "pl_eqt": None, "pl_orbper": None,
+     "pl_insol": None, "pl_disc": None, "st_dist": None},
+    {"pl_name": "TOI-700 d", "pl_discmethod": "Transit", "pl_rade": 1.19, "pl_eqt": 268, "pl_orbper": 37.4,
+     "pl_insol": 0.86, "pl_disc": 2020, "st_dist": 31.1},
+    {"pl_name": "51 Peg b", "pl_discmethod": "Radial Velocity", "pl_rade": None, "pl_eqt": 1284,
+     "pl_orbper": 4.23, "pl_insol": None, "pl_disc": 1995, "st_dist": 15.5},
+]
+
+
+@pytest.fixture
+def catalog():
+    return ExoplanetCatalog.from_records(RECORDS)
+
+
+@pytest.fixture
+def scores():
+    return np.array([0.8, 0.6, np.nan, 0.9, 0.0])
+
+
+def export(export_format, catalog, scores, rows, batch_size=2, columns=CATALOG_EXPORT_COLUMNS):
+    batches = catalog_export_batches(catalog, scores, np.asarray(rows), batch_size=batch_size)
+    return list(serialize_export(export_format, batches, columns))
+
+
+@pytest.mark.filterwarnings("error")
+def test_export_records_with_missing_values(catalog, scores):
+    records = export_records(catalog, scores, np.array([2, 0]))
+
+    assert records[0] == {
+        "name": "Unconfirmed 1", "habitability_score": None, "distance": None, "earth_radius": 1.9,
+        "eq_temperature": None, "orbital_period": None, "insolation": None, "discovery_method": None,
+        "discovery_year": None
+    }
+    assert records[1]["discovery_year"] == 2014 and isinstance(records[1]["discovery_year"], int)
+    assert records[1]["distance"] == pytest.approx(178.5 * 3.26)
+
+
+def test_export_records_listing_columns(catalog, scores):
+    records = export_records(catalog, scores, np.array([1]), LISTING_EXPORT_COLUMNS)
+    assert list(records[0]) == list(LISTING_EXPORT_COLUMNS)
+    assert records[0]["earth_radius"] is None
+
+
+def test_batches_follow_the_row_order(catalog, scores):
+    batches = list(catalog_export_batches(catalog, scores, np.array([4, 3, 2, 1, 0]), batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [record["name"] for batch in batches for record in batch] == [record["pl_name"] for record in RECORDS[::-1]]
+    assert [len(batch) for batch in record_batches(range(5), batch_size=2)] == [2, 2, 1]
+
+
+def test_ndjson_export(catalog, scores):
+    chunks = export("ndjson", catalog, scores, [0, 1, 2, 3, 4])
+
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row["name"] for row in rows] == [record["pl_name"] for record in RECORDS]
+    assert rows[2]["habitability_score"] is None and rows[2]["discovery_year"] is None
+    assert rows[1]["earth_radius"] is None and rows[1]["discovery_year"] == 2016
+
+
+def test_csv_export(catalog, scores):
+    chunks = export("csv", catalog, scores, [0, 1, 2, 3, 4])
+
+    assert len(chunks) == 3
+    text = b"".join(chunks).decode("utf-8")
+    assert text.count("name,habitability_score") == 1
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [row["name"] for row in rows] == [record["pl_name"] for record in RECORDS]
+    assert rows[2]["discovery_year"] == "" and rows[2]["discovery_method"] == ""
+    assert rows[0]["discovery_year"] == "2014"
+
+
+def test_parquet_export(catalog, scores):
+    chunks = export("parquet", catalog, scores, [0, 1, 2, 3, 4])
+
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.schema.field("discovery_year").type == pa.int64()
+    assert table.column("name").to_pylist() == [record["pl_name"] for record in RECORDS]
+    assert table.column("discovery_year").to_pylist() == [2014, 2016, None, 2020, 1995]
+    assert table.column("earth_radius").to_pylist()[1] is None
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv", "parquet"])
+def test_empty_export(catalog, scores, export_format):
+    chunks = export(export_format, catalog, scores, np.array([], dtype=np.intp))
+    body = b"".join(chunks)
+    if export_format == "csv":
+        assert body.decode("utf-8").startswith("name,")
+    elif export_format == "parquet":
+        assert pq.ParquetFile(io.BytesIO(body)).metadata.num_rows == 0
+    else:
+        assert body == b""
+
+
+def test_unknown_export_format(catalog, scores):
+    with pytest.raises(ValueError):
+        export("xlsx", catalog, scores, [0])
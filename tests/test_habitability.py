@@ -0,0 +1,214 @@
+import math
+
+import numpy as np
+import pytest
+
+from api.catalog import ExoplanetCatalog
+from api.catalog_sync import apply_delta
+from api.habitability import (
+    SCORE_COLUMNS, HabitabilityIndex, missing_as_absent, score_band_mask, score_habitability, score_planet
+)
+
+
+def scalar_habitability_score(planet_data):
+    """The per-planet scorer the vectorized one replaced, kept verbatim as the reference"""
+    score = 0.5
+
+    earth_radii = planet_data.get("pl_rade", None)
+    if earth_radii:
+        if 0.8 <= earth_radii <= 1.5:
+            score += 0.15
+        elif 0.5 <= earth_radii <= 2.0:
+            score += 0.05
+        else:
+            score -= 0.1
+
+    eq_temp = planet_data.get("pl_eqt", None)
+    if eq_temp:
+        temp_diff = abs(eq_temp - 255)
+        if temp_diff < 30:
+            score += 0.15
+        elif temp_diff < 50:
+            score += 0.05
+        elif temp_diff > 100:
+            score -= 0.1
+
+    orbit_period = planet_data.get("pl_orbper", None)
+    if orbit_period:
+        period_ratio = abs(orbit_period - 365) / 365
+        if period_ratio < 0.2:
+            score += 0.1
+        elif period_ratio < 0.5:
+            score += 0.05
+
+    insol = planet_data.get("pl_insol", None)
+    if insol:
+        insol_diff = abs(insol - 1)
+        if insol_diff < 0.2:
+            score += 0.1
+        elif insol_diff < 0.5:
+            score += 0.05
+        elif insol_diff > 2:
+            score -= 0.05
+
+    return max(0, min(1, score))
+
+
+NAN = math.nan
+
+PLANETS = [
+    {},
+    {"pl_rade": NAN},
+    {"pl_rade": NAN, "pl_eqt": 255},
+    {"pl_rade": None, "pl_eqt": 255},
+    {"pl_rade": 0, "pl_eqt": 255},
+    {"pl_rade": 1.0, "pl_eqt": NAN, "pl_orbper": NAN, "pl_insol": NAN},
+    {"pl_rade": 1.0, "pl_eqt": None, "pl_orbper": None, "pl_insol": None},
+    {"pl_rade": 1.0, "pl_eqt": 0, "pl_orbper": 0, "pl_insol": 0},
+    {"pl_rade": NAN, "pl_eqt": NAN, "pl_orbper": NAN, "pl_insol": NAN},
+    {"pl_rade": 0.6, "pl_eqt": 300, "pl_orbper": 200, "pl_insol": 1.3},
+    {"pl_rade": 11.2, "pl_eqt": 1500, "pl_orbper": 3.5, "pl_insol": 400},
+    {"pl_rade": 1.2, "pl_eqt": 260, "pl_orbper": 380, "pl_insol": 0.9},
+    {"pl_rade": 2.0, "pl_eqt": 155, "pl_orbper": 547.5, "pl_insol": 3.0},
+]
+
+
+@pytest.mark.parametrize("planet", PLANETS)
+def test_score_planet_matches_scalar_score(planet):
+    assert score_planet(planet) == scalar_habitability_score(planet)
+
+
+def test_index_treats_missing_catalog_values_as_absent():
+    # The catalog stores None as NaN; the scalar path saw None again through ``record``
+    records = [
+        {"pl_name": f"Planet {i}", **{key: value for key, value in planet.items() if not _is_nan(value)}}
+        for i, planet in enumerate(PLANETS)
+    ]
+    catalog = ExoplanetCatalog.from_records(records)
+    index = HabitabilityIndex(catalog)
+
+    expected = [scalar_habitability_score(catalog.record(row)) for row in range(len(catalog))]
+    np.testing.assert_array_equal(index.scores, expected)
+
+    changed = np.arange(len(catalog))
+    np.testing.assert_array_equal(index.updated(catalog, changed).scores, expected)
+
+
+def _is_nan(value):
+    return isinstance(value, float) and math.isnan(value)
+
+
+def random_catalog(size=400, seed=7):
+    """Catalog with coarse values, so scores tie often, and about a tenth of each column missing"""
+    rng = np.random.default_rng(seed)
+    columns = {
+        "pl_rade": rng.choice([0.4, 0.6, 0.9, 1.0, 1.2, 1.6, 2.0, 3.5, 11.0], size),
+        "pl_eqt": rng.choice([150, 230, 255, 270, 300, 400, 1200], size).astype(np.float64),
+        "pl_orbper": rng.choice([3.5, 50, 200, 365, 400, 900], size),
+        "pl_insol": rng.choice([0.1, 0.9, 1.0, 1.3, 2.0, 5.0], size),
+        "st_dist": rng.uniform(1, 1000, size).round(1),
+    }
+    for values in columns.values():
+        values[rng.random(size) < 0.1] = np.nan
+    records = [
+        {"pl_name": f"Planet {row}", **{column: float(values[row]) for column, values in columns.items()}}
+        for row in range(size)
+    ]
+    for record in records:
+        for column in list(record):
+            if _is_nan(record[column]):
+                record[column] = None
+    return ExoplanetCatalog.from_records(records)
+
+
+def brute_force_query(catalog, band=None, min_score=None, radius=None, temperature=None, distance=None):
+    """Rows matching the filters by masks over freshly computed scores, in rank order"""
+    scores = score_habitability(*(missing_as_absent(catalog.column(column)) for column in SCORE_COLUMNS))
+    mask = np.ones(len(catalog), dtype=bool)
+    if band is not None:
+        mask &= score_band_mask(scores, band)
+    if min_score is not None:
+        mask &= scores >= min_score
+    for values, bounds in ((catalog.column("pl_rade"), radius), (catalog.column("pl_eqt"), temperature),
+                           (catalog.column("st_dist") * 3.26, distance)):
+        if bounds is None or bounds == (None, None):
+            continue
+        low, high = bounds
+        mask &= ~np.isnan(values)  # planets with an unknown value never match a range
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    rank_order = np.lexsort((np.arange(len(catalog)), catalog.column("pl_eqt"), -scores))
+    return rank_order[mask[rank_order]]
+
+
+QUERIES = [
+    {},
+    {"band": "high"},
+    {"band": "medium"},
+    {"band": "low"},
+    {"min_score": 0.7},
+    {"band": "medium", "min_score": 0.6},
+    {"band": "high", "min_score": 0.5},  # looser than the band
+    {"min_score": 1.01},
+    # A narrow range drives the query and is filtered by score rank
+    {"band": "low", "radius": (3.5, 3.5)},
+    {"radius": (0.9, 1.2), "temperature": (250, 260)},
+    {"distance": (100, 120), "min_score": 0.5},
+    # A narrow score slice drives the query and is filtered by every range
+    {"min_score": 0.95, "radius": (0.5, 2.0), "distance": (None, 3000)},
+    {"band": "high", "temperature": (None, 300), "radius": (None, None)},
+    # Open and empty bounds
+    {"radius": (None, 1.0)},
+    {"temperature": (300, None), "distance": (None, 500)},
+    {"radius": (2.0, 1.0)},
+]
+
+
+@pytest.mark.parametrize("filters", QUERIES)
+def test_query_matches_brute_force_masks(filters):
+    catalog = random_catalog()
+    rows = HabitabilityIndex(catalog).query(**filters)
+
+    np.testing.assert_array_equal(rows, brute_force_query(catalog, **filters))
+
+
+def test_query_excludes_unknown_range_values():
+    catalog = random_catalog()
+    rows = HabitabilityIndex(catalog).query(radius=(None, None), temperature=(0, None), distance=(0, None))
+
+    assert len(rows) > 0
+    assert not np.isnan(catalog.column("pl_eqt")[rows]).any()
+    assert not np.isnan(catalog.column("st_dist")[rows]).any()
+
+
+def test_query_ranks_by_score_then_temperature():
+    catalog = random_catalog()
+    index = HabitabilityIndex(catalog)
+    rows = index.query(band="medium")
+
+    keys = list(zip(-index.scores[rows], catalog.column("pl_eqt")[rows], rows))
+    assert keys == sorted(keys, key=lambda key: (key[0], np.inf if np.isnan(key[1]) else key[1], key[2]))
+
+
+def test_query_rejects_unknown_bands():
+    with pytest.raises(ValueError):
+        HabitabilityIndex(random_catalog(size=10)).query(band="extreme")
+
+
+def test_updated_index_equals_a_full_rebuild():
+    catalog = random_catalog()
+    index = HabitabilityIndex(catalog)
+    changes = random_catalog(size=60, seed=11)
+    delta = [dict(changes.record(i), pl_name=f"Planet {row}") for i, row in enumerate(range(0, 600, 10))]
+
+    merged, merged_index, changed = apply_delta(catalog, index, delta)
+    rebuilt = HabitabilityIndex(merged)
+
+    # 40 planets updated, 20 added
+    assert len(merged) == 420 and len(changed) > 20
+    np.testing.assert_array_equal(merged_index.scores, rebuilt.scores)
+    np.testing.assert_array_equal(merged_index.by_score, rebuilt.by_score)
+    for filters in QUERIES:
+        np.testing.assert_array_equal(merged_index.query(**filters), rebuilt.query(**filters))
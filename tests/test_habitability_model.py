@@ -0,0 +1,89 @@
+import hashlib
+import json
+
+import numpy as np
+import pytest
+import sklearn
+
+import api.habitability_model as habitability_model
+from api.habitability_model import X_train, load_model, save_model
+
+
+@pytest.fixture(scope="module")
+def model():
+    return habitability_model.train_model()
+
+
+def rewrite_header(path, **changes):
+    with open(path, "rb") as f:
+        header = json.loads(f.readline().decode("utf-8"))
+        payload = f.read()
+    with open(path, "wb") as f:
+        f.write(json.dumps(dict(header, **changes)).encode("utf-8") + b"\n")
+        f.write(payload)
+
+
+def test_artifact_round_trip(model, tmp_path):
+    path = str(tmp_path / "model.pkl")
+
+    header = save_model(model, path)
+    loaded, loaded_header = load_model(path)
+
+    assert loaded_header == header
+    np.testing.assert_array_equal(loaded.predict_proba(X_train), model.predict_proba(X_train))
+
+
+def test_checksum_mismatch_is_refused(model, tmp_path):
+    path = str(tmp_path / "model.pkl")
+    save_model(model, path)
+    rewrite_header(path, sha256=hashlib.sha256(b"another model").hexdigest())
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        load_model(path)
+
+
+@pytest.mark.parametrize("changes, message", [
+    ({"model_version": habitability_model.MODEL_VERSION + 1}, "holds model version"),
+    ({"sklearn_version": "0.0.1"}, "trained with scikit-learn 0.0.1"),
+    ({"format": "pickle"}, "not a habitability model artifact"),
+])
+def test_version_mismatch_is_refused(model, tmp_path, changes, message):
+    path = str(tmp_path / "model.pkl")
+    save_model(model, path)
+    rewrite_header(path, **changes)
+
+    with pytest.raises(ValueError, match=message):
+        load_model(path)
+
+
+@pytest.mark.parametrize("payload", [
+    b"not a pickle", b"\x80\x05", b"\x80\x05\x95", b"capi.habitability_model\nRemovedEstimator\n.",
+])
+def test_get_model_retrains_when_the_payload_does_not_unpickle(monkeypatch, tmp_path, payload):
+    path = tmp_path / "model.pkl"
+    header = {
+        "format": habitability_model.ARTIFACT_FORMAT,
+        "model_version": habitability_model.MODEL_VERSION,
+        "sklearn_version": sklearn.__version__,
+        "sha256": hashlib.sha256(payload).hexdigest(),
+    }
+    path.write_bytes(json.dumps(header).encode("utf-8") + b"\n" + payload)
+    monkeypatch.setattr(habitability_model, "MODEL_ARTIFACT_PATH", str(path))
+    monkeypatch.setattr(habitability_model, "_model", None)
+
+    model = habitability_model.get_model()
+
+    assert model.predict(X_train).tolist() == habitability_model.y_train.tolist()
+
+
+def test_get_model_retrains_on_a_version_mismatch(model, monkeypatch, tmp_path):
+    path = str(tmp_path / "model.pkl")
+    save_model(model, path)
+    rewrite_header(path, sklearn_version="0.0.1")
+    monkeypatch.setattr(habitability_model, "MODEL_ARTIFACT_PATH", path)
+    monkeypatch.setattr(habitability_model, "_model", None)
+    trained = []
+    monkeypatch.setattr(habitability_model, "train_model", lambda: trained.append(model) or model)
+
+    assert habitability_model.get_model() is model
+    assert len(trained) == 1
@@ -0,0 +1,121 @@
+import datetime
+import types
+
+import pytest
+
+import api.http_cache
+from api.http_cache import (
+    DEFAULT_CACHE_POLICY, NO_STORE, CachePolicy, ConditionalRequests, cache_policy, coded_tag, entity_tag,
+    etag_matches
+)
+
+ETAG = entity_tag("v1", b'{"total": 19}')
+
+
+@pytest.mark.parametrize("if_none_match", [
+    ETAG,
+    f"W/{ETAG}",
+    coded_tag(ETAG, "gzip"),
+    f"W/{coded_tag(ETAG, 'br')}",
+    coded_tag(ETAG, "zstd"),
+    f'"other", {coded_tag(ETAG, "gzip")}',
+    "*",
+])
+def test_etag_matches_weak_and_coded_tags(if_none_match):
+    assert etag_matches(if_none_match, ETAG)
+    assert etag_matches(if_none_match, coded_tag(ETAG, "br"))
+
+
+@pytest.mark.parametrize("if_none_match", [
+    None,
+    "",
+    entity_tag("v2", b'{"total": 19}'),
+    coded_tag(entity_tag("v1", b'{"total": 20}'), "gzip"),
+    f'{ETAG[:-1]}-deflate"',
+])
+def test_etag_mismatch(if_none_match):
+    assert not etag_matches(if_none_match, ETAG)
+
+
+def test_coded_tag_differs_per_coding():
+    tags = {coded_tag(ETAG, coding) for coding in (None, "gzip", "br", "zstd")}
+    assert len(tags) == 4
+    assert coded_tag(ETAG, None) == ETAG
+    assert coded_tag(ETAG, "br") == f'{ETAG[:-1]}-br"'
+
+
+class FakeDate(datetime.date):
+    today_value = datetime.date(2026, 3, 1)
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+def test_request_key_changes_with_the_catalog_version_and_the_day(monkeypatch):
+    monkeypatch.setattr(api.http_cache, "datetime", types.SimpleNamespace(date=FakeDate))
+    key = ConditionalRequests.request_key("v1", "/api/exoplanets", "limit=5&offset=10")
+
+    assert ConditionalRequests.request_key("v1", "/api/exoplanets", "offset=10&limit=5") == key
+    assert ConditionalRequests.request_key("v2", "/api/exoplanets", "limit=5&offset=10") != key
+    assert ConditionalRequests.request_key("v1", "/api/exoplanets", "limit=5&offset=20") != key
+    monkeypatch.setattr(FakeDate, "today_value", datetime.date(2026, 3, 2))
+    assert ConditionalRequests.request_key("v1", "/api/exoplanets", "limit=5&offset=10") != key
+
+
+def test_stored_response_is_not_served_for_another_version():
+    requests = ConditionalRequests()
+    key = requests.request_key("v1", "/api/dashboard/stats", "")
+    requests.store(key, "v1", b'{"total": 19}', {"Content-Type": "application/json"}, DEFAULT_CACHE_POLICY, None, None)
+
+    assert requests.cached(key, DEFAULT_CACHE_POLICY, None, None).body == b'{"total": 19}'
+    assert requests.cached(requests.request_key("v2", "/api/dashboard/stats", ""), DEFAULT_CACHE_POLICY, None, None) is None
+
+
+def test_stored_response_answers_304_to_its_coded_etag():
+    requests = ConditionalRequests()
+    body = b'{"rows": "' + b"x" * 4096 + b'"}'
+    key = requests.request_key("v1", "/api/exoplanets", "")
+    first = requests.store(key, "v1", body, {"Content-Type": "application/json"}, DEFAULT_CACHE_POLICY, None, "gzip")
+
+    assert first.headers["Content-Encoding"] == "gzip"
+    repeat = requests.cached(key, DEFAULT_CACHE_POLICY, f"W/{first.headers['ETag']}", "gzip")
+    assert repeat.status == 304 and repeat.body == b""
+    assert requests.stats()["not_modified"] == 1
+
+
+@pytest.mark.parametrize("path", ["/api/events", "/api/metrics/render", "/api/exoplanets/predict"])
+def test_no_store_routes(path):
+    assert cache_policy(path) is NO_STORE
+    assert NO_STORE.cache_control == "no-store"
+
+
+def test_route_policies():
+    assert cache_policy("/api/exoplanets/habitable/figure.json").max_age == 3600
+    assert cache_policy("/api/dashboard/stats").cache_control == "public, max-age=60, stale-while-revalidate=600"
+    assert not cache_policy("/api/exoplanets/export").etag
+    assert cache_policy("/api/exoplanets") is DEFAULT_CACHE_POLICY
+    assert CachePolicy(max_age=10).cache_control == "public, max-age=10"
+
+
+def test_service_answers_conditional_requests(service):
+    response = service.get("/api/dashboard/stats")
+    etag = response.headers["etag"]
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=60, stale-while-revalidate=600"
+    assert service.get("/api/dashboard/stats", headers={"If-None-Match": etag}).status_code == 304
+    assert service.get("/api/dashboard/stats", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert service.get("/api/dashboard/stats").json() == response.json()
+
+
+def test_service_does_not_store_no_store_routes(service):
+    import api.exoplanet_service as svc
+
+    service.get("/api/dashboard/stats")
+    stored = svc.conditional_requests.stats()["size"]
+    response = service.get("/api/metrics/render")
+
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
+    assert svc.conditional_requests.stats()["size"] == stored
@@ -0,0 +1,87 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api.http_client import AsyncHTTPClient
+
+
+def run(client_test):
+    """Run ``client_test(client)`` with a fresh client inside its own event loop"""
+    async def scenario():
+        client = AsyncHTTPClient(retry_backoff=0.001, max_retries=2)
+        try:
+            return await client_test(client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(scenario())
+
+
+def test_retries_retryable_statuses_with_backoff(stand_in_server):
+    stand_in_server.responses = [(503, "{}"), (502, "{}")]
+    stand_in_server.respond = lambda path, params: (200, stand_in_server.json({"rows": 2}))
+
+    async def client_test(client):
+        return await client.get_json(f"{stand_in_server.url}/api", params={"table": "ps"})
+
+    assert run(client_test) == {"rows": 2}
+    assert [request[:2] for request in stand_in_server.requests] == [("/api", {"table": "ps"})] * 3
+
+
+def test_gives_up_after_the_last_retry(stand_in_server):
+    stand_in_server.respond = lambda path, params: (503, "{}")
+
+    async def client_test(client):
+        await client.get(f"{stand_in_server.url}/api")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(client_test)
+    assert len(stand_in_server.requests) == 3
+
+
+def test_does_not_retry_client_errors(stand_in_server):
+    stand_in_server.respond = lambda path, params: (404, "{}")
+
+    async def client_test(client):
+        await client.get(f"{stand_in_server.url}/api")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(client_test)
+    assert len(stand_in_server.requests) == 1
+
+
+def test_reuses_keep_alive_connections(stand_in_server):
+    async def client_test(client):
+        for _ in range(5):
+            await client.get_json(f"{stand_in_server.url}/api")
+
+    run(client_test)
+    assert len({port for _, _, port in stand_in_server.requests}) == 1
+
+
+def test_iter_json_array_retries_before_the_first_element(stand_in_server):
+    stand_in_server.responses = [(500, "{}")]
+    stand_in_server.respond = lambda path, params: (200, stand_in_server.json([{"pl_name": "a"}, {"pl_name": "b"}]))
+
+    async def client_test(client):
+        return [row async for row in client.iter_json_array(f"{stand_in_server.url}/TAP/sync")]
+
+    assert run(client_test) == [{"pl_name": "a"}, {"pl_name": "b"}]
+    assert len(stand_in_server.requests) == 2
+
+
+def test_service_shutdown_closes_the_shared_client(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import api.http_client
+    import api.exoplanet_service as svc
+
+    monkeypatch.setattr(svc, "CATALOG_FIXTURE_PATH", "fixture")  # no scheduled sync
+    app = FastAPI()
+    app.include_router(svc.router, prefix="/api")
+    with TestClient(app):
+        client = api.http_client.get_http_client()
+    assert api.http_client._client is None
+    assert client._client.is_closed
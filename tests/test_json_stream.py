@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from api.json_stream import JSONArrayDecoder, iter_json_array
+
+DOCUMENTS = [
+    '[-0.5]',
+    '[1.5e3]',
+    '[1.5E-3, -12, 0, 7e+2]',
+    ' [ {"pl_name": "Kepler-22 b", "pl_rade": 2.38, "pl_eqt": null}, {"pl_name": "a, ]b", "pl_rade": -0.25} ] ',
+    '[true, false, null, "x", [1, [2.0]], {}]',
+    '[]',
+]
+
+
+def decode(chunks):
+    decoder = JSONArrayDecoder()
+    elements = []
+    for chunk in chunks:
+        elements.extend(decoder.feed(chunk))
+    decoder.close()
+    return elements
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_every_split_point(document):
+    expected = json.loads(document)
+    for split in range(len(document) + 1):
+        assert decode([document[:split], document[split:]]) == expected, split
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_one_character_at_a_time(document):
+    assert list(iter_json_array(iter(document))) == json.loads(document)
+
+
+def test_numbers_wait_for_a_delimiter():
+    decoder = JSONArrayDecoder()
+    assert decoder.feed("[-0.") == []
+    assert decoder.feed("5") == []
+    assert decoder.feed(", 1.5e") == [-0.5]
+    assert decoder.feed("3]") == [1500.0]
+    decoder.close()
+
+
+@pytest.mark.parametrize("document", ['{"a": 1}', '[1 2]', '[1.x]'])
+def test_invalid_arrays(document):
+    with pytest.raises(ValueError):
+        decode([document])
+
+
+@pytest.mark.parametrize("document", ['[', '[1, 2', '[{"a": 1}'])
+def test_truncated_arrays(document):
+    with pytest.raises(ValueError, match="Truncated"):
+        decode([document])
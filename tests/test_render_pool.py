@@ -0,0 +1,82 @@
+import asyncio
+import os
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import api.render_pool
+import api.exoplanet_service as svc
+from api.render_pool import RenderPool, RenderPoolSaturated
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A one-worker pool without a queue, installed as the process-wide render pool"""
+    pool = RenderPool(max_workers=1, max_queue=0, timeout=10, retry_after=7)
+    monkeypatch.setattr(api.render_pool, "_pool", pool)
+    yield pool
+    pool.shutdown()
+
+
+def test_saturated_pool_answers_503_with_retry_after(pool):
+    async def scenario():
+        busy = asyncio.ensure_future(svc.render(time.sleep, 1))
+        await asyncio.sleep(0)  # let the first job take the only slot
+        with pytest.raises(HTTPException) as excinfo:
+            await svc.render(os.getpid)
+        await busy
+        return excinfo.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "7"}
+    assert pool.stats()["rejected"] == 1 and pool.stats()["completed"] == 1
+
+
+def test_submit_rejects_beyond_workers_and_queue():
+    pool = RenderPool(max_workers=1, max_queue=1)
+    pool._pending = 2
+    with pytest.raises(RenderPoolSaturated) as excinfo:
+        asyncio.run(pool.submit(os.getpid))
+    assert excinfo.value.retry_after == pool.retry_after
+
+
+def test_render_timeout_answers_504(pool):
+    pool.timeout = 0.5
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(svc.render(time.sleep, 5))
+
+    assert excinfo.value.status_code == 504
+    assert pool.stats()["timeouts"] == 1
+    # The abandoned job still holds its worker
+    assert pool.stats()["pending"] == 1
+
+
+def test_pool_recovers_after_a_worker_dies(pool):
+    async def scenario():
+        first_worker = await svc.render(os.getpid)
+        with pytest.raises(HTTPException) as excinfo:
+            await svc.render(os._exit, 1)
+        return first_worker, excinfo.value, await svc.render(os.getpid)
+
+    first_worker, error, next_worker = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "7"}
+    assert next_worker != first_worker
+    assert pool.stats()["failed"] == 1
+
+
+def test_service_shutdown_closes_the_render_pool(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(svc, "CATALOG_FIXTURE_PATH", "fixture")  # no scheduled sync
+    app = FastAPI()
+    app.include_router(svc.router, prefix="/api")
+    with TestClient(app):
+        pool = api.render_pool.get_render_pool()
+        pool._get_executor()
+    assert api.render_pool._pool is None
+    assert pool._executor is None
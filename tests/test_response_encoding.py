@@ -0,0 +1,104 @@
+import gzip
+import json
+
+import brotli
+import numpy as np
+import orjson
+import pytest
+import zstandard
+
+import api.response_encoding as response_encoding
+from api.response_encoding import COMPRESSION_MIN_BYTES, compress, dumps, is_compressible, negotiate_coding
+
+
+@pytest.fixture
+def all_codings(monkeypatch):
+    monkeypatch.setattr(response_encoding, "_available_codings", ["br", "zstd", "gzip"])
+
+
+@pytest.mark.parametrize("accept_encoding, coding", [
+    ("gzip, deflate, br, zstd", "br"),
+    ("gzip, zstd", "zstd"),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("br;q=0.5, gzip;q=0.8", "gzip"),
+    ("br;q=1.0, zstd;q=1.0, gzip;q=1.0", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("*;q=0.1, zstd;q=0.5", "zstd"),
+    ("br;q=0, *", "zstd"),
+    ("br;q=invalid, gzip;q=0.2", "gzip"),
+])
+def test_negotiate_coding(all_codings, accept_encoding, coding):
+    assert negotiate_coding(accept_encoding) == coding
+
+
+@pytest.mark.parametrize("accept_encoding", [None, "", "identity", "deflate", "br;q=0, zstd;q=0, gzip;q=0", "*;q=0"])
+def test_negotiate_coding_falls_back_to_identity(all_codings, accept_encoding):
+    assert negotiate_coding(accept_encoding) is None
+
+
+def test_negotiate_coding_skips_codings_that_are_not_installed(monkeypatch):
+    monkeypatch.setattr(response_encoding, "_available_codings", ["gzip"])
+    assert negotiate_coding("br, zstd") is None
+    assert negotiate_coding("br, gzip;q=0.1") == "gzip"
+
+
+def test_compression_threshold():
+    assert not is_compressible("application/json", COMPRESSION_MIN_BYTES - 1)
+    assert is_compressible("application/json", COMPRESSION_MIN_BYTES)
+    assert is_compressible("text/csv; charset=utf-8", COMPRESSION_MIN_BYTES)
+    assert not is_compressible("image/png", COMPRESSION_MIN_BYTES * 10)
+    assert not is_compressible(None, COMPRESSION_MIN_BYTES * 10)
+
+
+@pytest.mark.parametrize("coding, decompress", [
+    ("gzip", gzip.decompress),
+    ("br", brotli.decompress),
+    ("zstd", lambda body: zstandard.ZstdDecompressor().decompress(body)),
+])
+def test_compress_round_trip(coding, decompress):
+    body = json.dumps([{"pl_name": f"Planet {i}", "pl_rade": i / 10} for i in range(200)]).encode("utf-8")
+    assert decompress(compress(body, coding)) == body
+    assert compress(body, coding) == compress(body, coding)
+
+
+def test_compress_unknown_coding():
+    with pytest.raises(ValueError):
+        compress(b"{}", "deflate")
+
+
+@pytest.fixture(params=[json, orjson], ids=["stdlib", "orjson"])
+def encoder(request, monkeypatch):
+    monkeypatch.setattr(response_encoding, "_json", request.param)
+    return request.param
+
+
+def test_dumps_is_compact_utf8(encoder):
+    assert dumps({"pl_name": "Kepler-186 f", "host": "Gliese 581 — g", 1: [1, 2.5]}) == \
+        '{"pl_name":"Kepler-186 f","host":"Gliese 581 — g","1":[1,2.5]}'.encode("utf-8")
+
+
+def test_dumps_encodes_non_finite_floats_as_null(encoder):
+    value = {
+        "pl_rade": float("nan"),
+        "pl_eqt": np.float64("inf"),
+        "rows": [{"st_dist": -np.inf}, (1.5, float("nan"))],
+        "scores": np.array([0.5, np.nan]),
+    }
+
+    encoded = dumps(value)
+
+    assert json.loads(encoded) == {
+        "pl_rade": None, "pl_eqt": None, "rows": [{"st_dist": None}, [1.5, None]], "scores": [0.5, None]
+    }
+    assert b"NaN" not in encoded and b"Infinity" not in encoded
+
+
+def test_dumps_numpy_values(encoder):
+    assert json.loads(dumps({"counts": np.arange(3), "total": np.int64(3)})) == {"counts": [0, 1, 2], "total": 3}
+
+
+def test_dumps_rejects_unsupported_objects(encoder):
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
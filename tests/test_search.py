@@ -0,0 +1,68 @@
+import pytest
+
+from api.search import NameIndex, decode_cursor, encode_cursor
+
+NAMES = ["Proxima Cen b", "TRAPPIST-1 e", "GJ 667 C c", "14 Her b", "14 And b", "Kepler-22 b"]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return NameIndex(NAMES, version="v1")
+
+
+@pytest.mark.parametrize("name, row", [
+    ("Proxima Cen b", 0),
+    ("proxima-b", 0),
+    ("PROXIMA B", 0),
+    ("Proxima Centauri b", 0),
+    ("trappist 1e", 1),
+    ("Trappist1E", 1),
+    ("Gliese 667 C c", 2),
+    ("14 Herculis b", 3),
+    ("14 Andromedae b", 4),
+    ("kepler 22b", 5),
+])
+def test_resolve_matches_names_and_aliases(index, name, row):
+    assert index.resolve(name) == row
+
+
+@pytest.mark.parametrize("name", ["Kepler-23 b", "", "Proxima Cen c"])
+def test_resolve_unknown_names(index, name):
+    assert index.resolve(name) is None
+
+
+def test_colliding_aliases_are_ambiguous(index):
+    # "14 Her b" and "14 And b" both drop their constellation to "14b"
+    assert index.ambiguous_aliases == {"14b": [3, 4]}
+    assert index.resolve("14 b") is None
+    assert set(index.suggest("14 b")) == {3, 4}
+
+
+def test_suggest_puts_the_exact_match_first(index):
+    assert index.suggest("14 Her b")[0] == 3
+    assert index.suggest("Kepler-22 b", limit=1) == [5]
+
+
+def test_suggest_tolerates_typos(index):
+    assert index.suggest("Trapist-1 e")[0] == 1
+
+
+def test_prefix_and_search(index):
+    assert index.prefix("14 ").tolist() == [3, 4]
+    assert index.search("her").tolist() == [3]
+
+
+@pytest.mark.parametrize("offset", [0, 1, 50, 10 ** 6])
+def test_cursor_round_trip(offset):
+    assert decode_cursor(encode_cursor(offset, "v1"), "v1") == offset
+
+
+def test_cursor_from_another_version_expires():
+    with pytest.raises(ValueError, match="expired"):
+        decode_cursor(encode_cursor(10, "v1"), "v2")
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", encode_cursor(-1, "v1")])
+def test_malformed_cursors(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "v1")